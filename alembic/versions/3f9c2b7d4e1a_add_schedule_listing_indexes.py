@@ -0,0 +1,28 @@
+"""add schedule listing indexes
+
+Revision ID: 3f9c2b7d4e1a
+Revises: 85052c4c3419
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2b7d4e1a'
+down_revision: Union[str, None] = '85052c4c3419'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_schedules_user_id_start_time', 'schedules', ['user_id', 'start_time'], unique=False)
+    op.create_index('ix_schedules_status_start_time', 'schedules', ['status', 'start_time'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_schedules_status_start_time', table_name='schedules')
+    op.drop_index('ix_schedules_user_id_start_time', table_name='schedules')
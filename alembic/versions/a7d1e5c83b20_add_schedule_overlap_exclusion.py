@@ -0,0 +1,82 @@
+"""add schedule overlap exclusion
+
+Revision ID: a7d1e5c83b20
+Revises: 3f9c2b7d4e1a
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d1e5c83b20'
+down_revision: Union[str, None] = '3f9c2b7d4e1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def cancel_overlapping_schedules() -> None:
+    """Cancel active schedules that overlap an earlier one of the same user
+
+    Exclusion constraints cannot be added NOT VALID, so existing overlaps
+    would make the upgrade fail. Per user, the earliest schedule is kept and
+    any later one starting before the kept ones end is cancelled.
+    """
+    if context.is_offline_mode():
+        logger.warning(
+            "Offline mode: cancel overlapping active schedules before running "
+            "the generated SQL, or adding the constraint will fail"
+        )
+        return
+
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT id, user_id, start_time, end_time FROM schedules "
+            "WHERE status <> 'CANCELLED' ORDER BY user_id, start_time, id"
+        )
+    )
+
+    overlapping = []
+    current_user_id, kept_until = None, None
+    for schedule_id, user_id, start_time, end_time in rows:
+        if user_id == current_user_id and start_time < kept_until:
+            overlapping.append(schedule_id)
+            continue
+        if user_id != current_user_id:
+            current_user_id, kept_until = user_id, end_time
+        else:
+            kept_until = max(kept_until, end_time)
+
+    if not overlapping:
+        return
+
+    logger.warning(
+        f"Cancelling {len(overlapping)} overlapping schedules: "
+        f"{', '.join(str(schedule_id) for schedule_id in overlapping)}"
+    )
+    op.get_bind().execute(
+        sa.text("UPDATE schedules SET status = 'CANCELLED' WHERE id = ANY(:ids)"),
+        {"ids": overlapping},
+    )
+
+
+def upgrade() -> None:
+    cancel_overlapping_schedules()
+
+    # Enum columns store member names, so cancelled rows hold 'CANCELLED'
+    op.execute(
+        "ALTER TABLE schedules ADD CONSTRAINT ex_schedules_user_id_time_range "
+        "EXCLUDE USING gist (int4range(user_id, user_id, '[]') WITH =, "
+        "tstzrange(start_time, end_time) WITH &&) "
+        "WHERE (status <> 'CANCELLED')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ex_schedules_user_id_time_range', 'schedules')
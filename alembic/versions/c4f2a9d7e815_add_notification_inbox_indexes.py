@@ -0,0 +1,28 @@
+"""add notification inbox indexes
+
+Revision ID: c4f2a9d7e815
+Revises: a7d1e5c83b20
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f2a9d7e815'
+down_revision: Union[str, None] = 'a7d1e5c83b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_notifications_user_id_created_at', 'notifications', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_notifications_user_id_unread', 'notifications', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, postgresql_where=sa.text('is_read = false'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_id_unread', table_name='notifications', postgresql_where=sa.text('is_read = false'))
+    op.drop_index('ix_notifications_user_id_created_at', table_name='notifications')
@@ -0,0 +1,44 @@
+"""add schedule materialized_until
+
+Revision ID: e5a7c9b1d3f6
+Revises: d81b5e3f9a42
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9b1d3f6'
+down_revision: Union[str, None] = 'd81b5e3f9a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('schedules', sa.Column(
+        'materialized_until', sa.DateTime(timezone=True), nullable=True,
+        comment='Set on series parents: occurrences up to here have been written'
+    ))
+    # Existing series have been written up to their latest occurrence
+    op.execute("""
+        UPDATE schedules AS parent
+        SET materialized_until = series.last_start
+        FROM (
+            SELECT coalesce(parent_schedule_id, id) AS series_id,
+                   max(start_time) AS last_start
+            FROM schedules
+            WHERE is_repeating
+            GROUP BY coalesce(parent_schedule_id, id)
+        ) AS series
+        WHERE parent.id = series.series_id
+          AND parent.is_repeating
+          AND parent.parent_schedule_id IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('schedules', 'materialized_until')
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from app.models import User
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+# Columns left out of cached snapshots; loaded on access if ever needed
+_EXCLUDED_COLUMNS = {"hashed_password"}
+
+
+class AuthCache:
+    """Bounded TTL/LRU cache of verified access tokens and their user
+
+    A hit skips both the JWT decode and the user lookup. Entries never
+    outlive the token's own expiry, and are dropped when the token is
+    blacklisted or the user is updated.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        # token -> (expires_at, user_id, snapshot), least recent first
+        self._entries: OrderedDict = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        # Sync dependencies run in the threadpool, so guard shared state
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    self._remove(token)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, token: str, expires: Optional[int], user: User) -> None:
+        """Cache a verified token until the earlier of the TTL and its `exp`"""
+        ttl = self.ttl
+        if expires is not None:
+            ttl = min(ttl, expires - datetime.now(timezone.utc).timestamp())
+        if ttl <= 0:
+            return
+
+        snapshot = {
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(User).column_attrs
+            if attr.key not in _EXCLUDED_COLUMNS
+        }
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, user.id, snapshot)
+            self._tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    @staticmethod
+    def attach(db: Session, snapshot: Dict[str, Any]) -> User:
+        """Rebuild the user in the request's session without a SELECT"""
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._remove(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token of a user, e.g. after their record changes"""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[1])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[1]]
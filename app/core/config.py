@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -16,9 +16,59 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_SIZE: int = 10000
+
+    # Password Hashing Settings
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Hashes running or queued at once
+    PASSWORD_HASH_WAIT_SECONDS: float = 5.0
 
     BACKEND_CORS_ORIGINS: List[str]
 
+    # Schedule Settings
+    SCHEDULE_RECURRENCE_HORIZON_WEEKS: int = 8
+    SCHEDULE_RECURRENCE_EXTEND_INTERVAL_SECONDS: float = 3600.0
+
+    # Event Bus Settings
+    EVENT_BUS_WORKERS: int = 4
+    EVENT_BUS_QUEUE_SIZE: int = 1000
+    EVENT_BUS_DRAIN_TIMEOUT_SECONDS: float = 10.0
+
+    # Notification Settings
+    NOTIFICATION_FANOUT_CHUNK_SIZE: int = 100
+    NOTIFICATION_DISPATCH_INTERVAL_SECONDS: float = 5.0
+    NOTIFICATION_DISPATCH_BATCH_SIZE: int = 100
+    NOTIFICATION_DISPATCH_GRACE_SECONDS: int = 30
+    NOTIFICATION_MAX_RETRIES: int = 5
+    NOTIFICATION_ACK_FLUSH_INTERVAL_MS: int = 250
+    NOTIFICATION_ACK_BATCH_SIZE: int = 500
+    NOTIFICATION_COUNT_CACHE_TTL_SECONDS: float = 60.0
+    NOTIFICATION_COUNT_CACHE_MAX_USERS: int = 10000
+    # Days a read notification stays in the inbox, by type; unlisted types are kept
+    NOTIFICATION_RETENTION_DAYS: Dict[str, int] = {
+        "SCHEDULE_CHANGE": 90,
+        "SHIFT_TRADE": 90,
+        "ANNOUNCEMENT": 180,
+        "LEAVE_REQUEST": 365,
+        "SYSTEM": 30,
+    }
+    NOTIFICATION_RETENTION_INTERVAL_SECONDS: float = 3600.0
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000
+    NOTIFICATION_COALESCE_WINDOW_SECONDS: float = 5.0
+    NOTIFICATION_COALESCE_MAX_CHANGES: int = 50
+
+    # WebSocket Settings
+    WS_TRANSPORT: str = "memory"  # "memory" (single process) or "postgres"
+    WS_TRANSPORT_MAX_RECONNECT_SECONDS: float = 30.0
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_OVERFLOW_POLICY: str = "drop_oldest"  # "drop_oldest", "coalesce", "disconnect"
+    WS_REGISTRY_SHARDS: int = 16
+    WS_SWEEP_CONCURRENCY: int = 256
+    WS_REPLAY_PAGE_SIZE: int = 50
+    WS_REPLAY_DRAIN_TIMEOUT_SECONDS: float = 10.0
+    WS_MAX_DEVICES_PER_USER: int = 10  # Oldest device is closed beyond this
+
     @field_validator("DATABASE_URL", mode="before")
     def validate_database_url(cls, v: Optional[str]) -> Any:
         if not v:
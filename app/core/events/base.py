@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -11,4 +11,4 @@ class BaseEventType(str, Enum):
 class Event:
     type: BaseEventType
     data: dict
-    timestamp: datetime = datetime.now(timezone.utc)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Optional
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.events import Event, EventType
 
@@ -11,26 +13,85 @@ logger = logging.getLogger(__name__)
 class EventBus:
     def __init__(self):
         self._handlers: Dict[EventType, List[Callable]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
 
     def subscribe(self, event_type: EventType, handler: Callable):
         if event_type not in self._handlers:
             self._handlers[event_type] = []
         self._handlers[event_type].append(handler)
 
+    async def start(
+        self,
+        workers: int = settings.EVENT_BUS_WORKERS,
+        queue_size: int = settings.EVENT_BUS_QUEUE_SIZE,
+    ) -> None:
+        """Switch to queued dispatch drained by a pool of worker tasks"""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(self._queue)) for _ in range(workers)
+        ]
+        logger.info(f"Event bus started with {workers} workers")
+
+    async def stop(
+        self, timeout: float = settings.EVENT_BUS_DRAIN_TIMEOUT_SECONDS
+    ) -> None:
+        """Drain queued events, then stop the workers"""
+        if not self._workers:
+            return
+
+        # Events published from now on are dispatched inline
+        queue, self._queue = self._queue, None
+        try:
+            await asyncio.wait_for(queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Event bus stopped with {queue.qsize()} undelivered events")
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Event bus stopped")
+
     async def publish(self, event: Event):
         logger.info(f"Publishing event: {event.type}")
-        if event.type in self._handlers:
+        handlers = self._handlers.get(event.type)
+        if not handlers:
+            logger.warning(f"No handlers found for event type: {event.type}")
+            return
+
+        if self._queue is not None:
+            # Waits while the queue is full, pushing back on producers
+            await self._queue.put((event, handlers))
+        else:
+            await self._dispatch(event, handlers)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            event, handlers = await queue.get()
+            try:
+                await self._dispatch(event, handlers)
+            finally:
+                queue.task_done()
+
+    async def _dispatch(self, event: Event, handlers: List[Callable]) -> None:
+        for handler in handlers:
+            logger.info(
+                f"Executing handler: {handler.__name__} for event: {event.type}"
+            )
+            # A fresh session per handler so one failure can't poison the next
             db = next(get_db())
             try:
-                for handler in self._handlers[event.type]:
-                    logger.info(
-                        f"Executing handler: {handler.__name__} for event: {event.type}"
-                    )
-                    await handler(event, db)
+                await handler(event, db)
+            except Exception as e:
+                logger.error(
+                    f"Handler {handler.__name__} failed for event {event.type}: {str(e)}"
+                )
             finally:
                 db.close()
-        else:
-            logger.warning(f"No handlers found for event type: {event.type}")
 
 
 event_bus = EventBus()
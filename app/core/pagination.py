@@ -0,0 +1,38 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Query, Session
+
+# Server-side cap for client supplied page sizes
+MAX_PAGE_LIMIT = 200
+
+
+def encode_cursor(position: datetime, id: int) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque cursor"""
+    raw = json.dumps({"t": position.isoformat(), "id": id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor created by encode_cursor"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def estimate_count(db: Session, query: Query) -> int:
+    """Row count estimated by the planner, without running the query"""
+    compiled = query.statement.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -1,6 +1,8 @@
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from app.models import User
 from fastapi import Depends, HTTPException, status
@@ -9,15 +11,26 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
+from .auth_cache import AuthCache
 from .config import settings
 from .database import get_db
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow; it runs on its own small pool, never the event loop
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+# Caps work admitted to the pool so a login burst cannot queue without bound
+password_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
 # OAuth2 schema setup
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Verified access tokens and their user, to skip decode and lookup per request
+auth_cache = AuthCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_SIZE)
+
 # Password policy pattern
 PASSWORD_PATTERN = re.compile(
     r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*#?&])[A-Za-z\d@$!%*#?&]{8,}$"
@@ -32,6 +45,36 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_password_task(func: Callable[..., Any], *args: Any) -> Any:
+    try:
+        await asyncio.wait_for(
+            password_semaphore.acquire(), settings.PASSWORD_HASH_WAIT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            password_executor, func, *args
+        )
+    finally:
+        password_semaphore.release()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool"""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing pool"""
+    return await _run_password_task(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -59,6 +102,13 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    if is_token_blacklisted(token):
+        raise credentials_exception
+
+    snapshot = auth_cache.get(token)
+    if snapshot is not None:
+        return auth_cache.attach(db, snapshot)
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -79,6 +129,7 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
 
+    auth_cache.put(token, payload.get("exp"), user)
     return user
 
 
@@ -109,6 +160,9 @@ async def get_user_from_token(token: str, db: Session) -> Optional[User]:
     """
     Validate token and return user
     """
+    if is_token_blacklisted(token):
+        return None
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -129,6 +183,7 @@ token_blacklist = set()
 
 def blacklist_token(token: str) -> None:
     token_blacklist.add(token)
+    auth_cache.invalidate_token(token)
 
 
 def is_token_blacklisted(token: str) -> bool:
@@ -1,10 +1,11 @@
 from datetime import datetime
 
+from app.models.leave_request import LeaveRequest, LeaveStatus
 from app.models.notification import Notification
 from app.models.schedule import Schedule
 from app.models.schedule_enums import ScheduleStatus
 from app.models.user import User
-from sqlalchemy import and_
+from sqlalchemy import and_, distinct, func
 from sqlalchemy.orm import Session
 
 
@@ -44,33 +45,25 @@ class AdminDashboardService:
             db.query(Schedule).filter(Schedule.status == ScheduleStatus.PENDING).count()
         )
 
-        # Schedule conflicts
-        conflicts = (
-            db.query(Schedule)
+        # Overlapping shifts are rejected by the exclusion constraint, so
+        # conflicts are upcoming shifts falling in an approved leave
+        conflict_count = (
+            db.query(func.count(distinct(Schedule.id)))
+            .join(
+                LeaveRequest,
+                and_(
+                    LeaveRequest.employee_id == Schedule.user_id,
+                    LeaveRequest.status == LeaveStatus.APPROVED,
+                    LeaveRequest.start_date < Schedule.end_time,
+                    LeaveRequest.end_date > Schedule.start_time,
+                ),
+            )
             .filter(
-                Schedule.status != ScheduleStatus.CANCELLED, Schedule.start_time >= now
+                Schedule.status != ScheduleStatus.CANCELLED, Schedule.end_time >= now
             )
-            .all()
+            .scalar()
         )
 
-        conflict_count = 0
-        for schedule in conflicts:
-            overlapping = (
-                db.query(Schedule)
-                .filter(
-                    Schedule.id != schedule.id,
-                    Schedule.user_id == schedule.user_id,
-                    Schedule.status != ScheduleStatus.CANCELLED,
-                    and_(
-                        Schedule.start_time < schedule.end_time,
-                        Schedule.end_time > schedule.start_time,
-                    ),
-                )
-                .first()
-            )
-            if overlapping:
-                conflict_count += 1
-
         return {
             "employees": {
                 "total": total_employees,
@@ -123,7 +123,19 @@ class AnnouncementService:
             await event_bus.publish(
                 Event(
                     type=NotificationEventType.ANNOUNCEMENT_CREATED,
-                    data={"announcement": announcement, "author": announcement.author},
+                    data={
+                        "announcement": {
+                            "id": announcement.id,
+                            "title": announcement.title,
+                            "content": announcement.content,
+                            "priority": announcement.priority,
+                            "author": {
+                                "id": announcement.author.id,
+                                "name": announcement.author.full_name,
+                                "position": announcement.author.position,
+                            },
+                        }
+                    },
                 )
             )
             logger.info(f"Successfully published announcement event: {announcement.id}")
@@ -22,7 +22,7 @@ router = APIRouter(tags=["Auth"])
 @router.post("/register", response_model=UserResponse)
 async def register(user_data: UserCreateSchema, db: Session = Depends(get_db)):
     """Register a new user"""
-    return AuthService.create_user(db, user_data)
+    return await AuthService.create_user(db, user_data)
 
 
 @router.post("/login", response_model=TokenSchema)
@@ -31,7 +31,7 @@ async def login(
     db: Session = Depends(get_db),
 ):
     """Authenticate user and return tokens"""
-    user = AuthService.authenticate_user(
+    user = await AuthService.authenticate_user(
         db, LoginSchema(email=form_data.username, password=form_data.password)
     )
     tokens = AuthService.create_user_tokens(user)
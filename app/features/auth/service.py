@@ -4,8 +4,8 @@ from typing import Optional
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
 )
 from app.models.user import User
 from fastapi import HTTPException, status
@@ -18,7 +18,7 @@ class AuthService:
     """Service for handling authentication related operations"""
 
     @staticmethod
-    def create_user(db: Session, user_data: UserCreateSchema) -> User:
+    async def create_user(db: Session, user_data: UserCreateSchema) -> User:
         """Create a new user"""
         # Check if email already exists
         if db.query(User).filter(User.email == user_data.email).first():
@@ -31,7 +31,7 @@ class AuthService:
         db_user = User(
             email=user_data.email,
             full_name=user_data.full_name,
-            hashed_password=get_password_hash(user_data.password),
+            hashed_password=await get_password_hash_async(user_data.password),
             role=user_data.role,
         )
 
@@ -47,7 +47,7 @@ class AuthService:
             )
 
     @staticmethod
-    def authenticate_user(db: Session, login_data: LoginSchema) -> User:
+    async def authenticate_user(db: Session, login_data: LoginSchema) -> User:
         """Authenticate a user"""
         user = db.query(User).filter(User.email == login_data.email).first()
 
@@ -57,7 +57,7 @@ class AuthService:
                 detail="Incorrect email or password",
             )
 
-        if not verify_password(login_data.password, user.hashed_password):
+        if not await verify_password_async(login_data.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
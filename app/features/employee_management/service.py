@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional
 
-from app.core.security import get_password_hash
+from app.core.security import auth_cache, get_password_hash_async
 from app.features.employee_management.schemas import (
     DepartmentCreate,
     EmployeeCreate,
@@ -26,7 +26,7 @@ class EmployeeManagementService:
         user = User(
             email=data.email,
             full_name=data.full_name,
-            hashed_password=get_password_hash(data.password),
+            hashed_password=await get_password_hash_async(data.password),
             department=data.department,
             position=data.position,
             comment=data.comment,
@@ -76,6 +76,8 @@ class EmployeeManagementService:
 
         db.commit()
         db.refresh(user)
+        # Cached sessions must not keep serving the old role or status
+        auth_cache.invalidate_user(user.id)
         return user
 
     # Department and position route
@@ -1,3 +1,7 @@
+from .acks import AckAggregator, ack_aggregator
+from .coalescer import ScheduleChangeCoalescer, schedule_change_coalescer
+from .dispatcher import NotificationDispatcher, notification_dispatcher
+from .retention import NotificationRetention, notification_retention
 from .router import router
 from .service import NotificationService
 from .ws.router import router as ws_router
@@ -8,5 +12,13 @@ __all__ = [
     "ws_router",
     "ConnectionManager",
     "notification_manager",
+    "AckAggregator",
+    "ack_aggregator",
+    "NotificationDispatcher",
+    "notification_dispatcher",
+    "NotificationRetention",
+    "notification_retention",
+    "ScheduleChangeCoalescer",
+    "schedule_change_coalescer",
     "NotificationService",
 ]
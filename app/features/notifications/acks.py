@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.notification import Notification, NotificationStatus
+from sqlalchemy import tuple_
+
+logger = logging.getLogger(__name__)
+
+
+class AckAggregator:
+    """Buffers delivery acks and writes them back as SENT in batched UPDATEs"""
+
+    def __init__(
+        self,
+        flush_interval: float = settings.NOTIFICATION_ACK_FLUSH_INTERVAL_MS / 1000,
+        max_pending: int = settings.NOTIFICATION_ACK_BATCH_SIZE,
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # (user_id, notification_id) pairs
+        self._acked: Set[Tuple[int, int]] = set()
+        self._flush_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._acked)
+
+    async def start(self) -> None:
+        """Start the periodic flush loop"""
+        self._task = asyncio.create_task(self._run())
+        logger.info("Ack aggregator started")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write back whatever is still buffered"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        logger.info("Ack aggregator stopped")
+
+    async def record(self, deliveries: Iterable[Tuple[int, int]]) -> None:
+        """Record (user_id, notification_id) pairs as delivered"""
+        self._acked.update(deliveries)
+        await self._flush_if_due()
+
+    async def _flush_if_due(self) -> None:
+        # Without the loop running (e.g. tests) acks are written straight away
+        if self._task is None:
+            await self.flush()
+        elif self.pending >= self.max_pending:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        """Write buffered acks back in one UPDATE, returning the rows changed"""
+        acked = self._acked
+        if not acked:
+            return 0
+        self._acked = set()
+
+        db = next(get_db())
+        try:
+            updated = (
+                db.query(Notification)
+                .filter(
+                    Notification.status.in_(
+                        [NotificationStatus.PENDING, NotificationStatus.FAILED]
+                    ),
+                    # Scoping by user keeps a client from acking someone else's rows
+                    tuple_(Notification.user_id, Notification.id).in_(sorted(acked)),
+                )
+                .update(
+                    {
+                        Notification.status: NotificationStatus.SENT,
+                        Notification.sent_at: datetime.now(timezone.utc),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return updated
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to flush notification acks: {str(e)}")
+            # Keep the acks for the next flush
+            self._acked |= acked
+            return 0
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+
+ack_aggregator = AckAggregator()
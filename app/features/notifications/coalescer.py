@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.events import Event, event_bus
+from app.features.notifications.events.types import NotificationEventType
+from app.models.notification import Notification, NotificationPriority, NotificationType
+
+logger = logging.getLogger(__name__)
+
+_PRIORITY_RANK = {
+    NotificationPriority.LOW: 0,
+    NotificationPriority.NORMAL: 1,
+    NotificationPriority.HIGH: 2,
+}
+
+# Keys describing a schedule's state before the first buffered change
+_ORIGINAL_KEYS = ("original", "old_status")
+
+
+class ScheduleChangeCoalescer:
+    """Buffers SCHEDULE_CHANGE notifications per user and sends them as a digest
+
+    Changes arriving within `window` seconds of a user's first buffered change
+    become one notification; several changes to the same schedule collapse
+    into a single diff from its original to its latest state.
+
+    Every change is committed as its own row when it arrives, held back from
+    the dispatcher for the window, so only delivery is coalesced. If the
+    process dies before flushing, the rows are delivered one by one.
+    """
+
+    def __init__(
+        self,
+        window: float = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS,
+        max_changes: int = settings.NOTIFICATION_COALESCE_MAX_CHANGES,
+    ):
+        self.window = window
+        self.max_changes = max_changes
+        # user_id -> schedule_id -> change, in arrival order
+        self._buffers: Dict[int, "OrderedDict[Any, Dict[str, Any]]"] = {}
+        # user_id -> ids of the rows written for the buffered changes
+        self._row_ids: Dict[int, List[int]] = {}
+        self._timers: Dict[int, asyncio.Task] = {}
+        self._running = False
+
+    async def start(self) -> None:
+        self._running = True
+        logger.info("Schedule change coalescer started")
+
+    async def stop(self) -> None:
+        """Flush every buffered change before shutting down"""
+        self._running = False
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers = {}
+        for user_id in list(self._buffers):
+            await self.flush(user_id)
+        logger.info("Schedule change coalescer stopped")
+
+    async def add(
+        self,
+        user_id: int,
+        title: str,
+        message: str,
+        priority: NotificationPriority,
+        data: Dict[str, Any],
+    ) -> None:
+        """Write a schedule change for the user and buffer its delivery"""
+        change = {
+            "title": title,
+            "message": message,
+            "priority": priority,
+            "data": data,
+        }
+        notification_id = self._write(user_id, change)
+        if notification_id is None:
+            return
+        self._row_ids.setdefault(user_id, []).append(notification_id)
+
+        buffer = self._buffers.setdefault(user_id, OrderedDict())
+        key = data.get("schedule_id") or object()
+        previous = buffer.get(key)
+        if previous is not None:
+            merged = {**previous["data"], **data}
+            for original_key in _ORIGINAL_KEYS:
+                if original_key in previous["data"]:
+                    merged[original_key] = previous["data"][original_key]
+            change["data"] = merged
+            change["priority"] = max(
+                previous["priority"], priority, key=_PRIORITY_RANK.get
+            )
+        buffer[key] = change
+
+        # Without the coalescer running (e.g. tests) changes go out immediately
+        if not self._running or len(buffer) >= self.max_changes:
+            await self.flush(user_id)
+        elif user_id not in self._timers:
+            self._timers[user_id] = asyncio.create_task(self._flush_later(user_id))
+
+    def _write(self, user_id: int, change: Dict[str, Any]) -> Optional[int]:
+        """Commit one change as its own notification, held back for the window"""
+        db = next(get_db())
+        try:
+            notification = Notification(
+                user_id=user_id,
+                type=NotificationType.SCHEDULE_CHANGE,
+                # The dispatcher only picks it up if it is never flushed
+                next_retry=datetime.now(timezone.utc)
+                + timedelta(
+                    seconds=self.window + settings.NOTIFICATION_DISPATCH_GRACE_SECONDS
+                ),
+                **change,
+            )
+            db.add(notification)
+            db.commit()
+            return notification.id
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to write schedule change for user {user_id}: {e}")
+            return None
+        finally:
+            db.close()
+
+    async def flush(self, user_id: int) -> Optional[Notification]:
+        """Replace the user's buffered rows with one digest and publish it"""
+        timer = self._timers.pop(user_id, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+        changes = list(self._buffers.pop(user_id, {}).values())
+        row_ids = self._row_ids.pop(user_id, [])
+        if not changes:
+            return None
+
+        db = next(get_db())
+        try:
+            rows = (
+                db.query(Notification)
+                .filter(Notification.id.in_(row_ids))
+                .order_by(Notification.id)
+                .all()
+            )
+            if len(rows) == 1:
+                notification = rows[0]
+                notification.next_retry = None
+            else:
+                notification = Notification(
+                    user_id=user_id,
+                    type=NotificationType.SCHEDULE_CHANGE,
+                    **self._merge(changes),
+                )
+                db.add(notification)
+                for row in rows:
+                    db.delete(row)
+            db.commit()
+            payload = notification.to_dict()
+        except Exception as e:
+            db.rollback()
+            # The written rows stay PENDING for the dispatcher
+            logger.error(f"Failed to coalesce schedule changes for user {user_id}: {e}")
+            return None
+        finally:
+            db.close()
+
+        await event_bus.publish(
+            Event(
+                type=NotificationEventType.SCHEDULE_UPDATED,
+                data={"user_id": user_id, "notification": payload},
+            )
+        )
+        return notification
+
+    @staticmethod
+    def _merge(changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(changes) == 1:
+            return changes[0]
+
+        return {
+            "title": f"{len(changes)} schedule changes",
+            "message": f"{len(changes)} of your schedules have changed",
+            "priority": max(
+                (change["priority"] for change in changes), key=_PRIORITY_RANK.get
+            ),
+            "data": {
+                "count": len(changes),
+                "changes": [
+                    {"title": change["title"], **change["data"]} for change in changes
+                ],
+            },
+        }
+
+    async def _flush_later(self, user_id: int) -> None:
+        await asyncio.sleep(self.window)
+        try:
+            await self.flush(user_id)
+        except Exception as e:
+            logger.error(f"Failed to flush schedule changes for user {user_id}: {e}")
+
+
+schedule_change_coalescer = ScheduleChangeCoalescer()
@@ -0,0 +1,135 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.models.notification import Notification, NotificationType
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# (total, unread) per notification type value
+TypeCounts = Dict[Optional[str], Tuple[int, int]]
+
+_PENDING_KEY = "notification_count_changes"
+
+
+class NotificationCountCache:
+    """Per-user notification counts by type, kept current by incremental updates
+
+    Counts are loaded with one query on a miss and then adjusted as
+    notifications are created or read, so most reads make no query at all.
+    The TTL bounds how stale a worker gets when another process writes.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.NOTIFICATION_COUNT_CACHE_TTL_SECONDS,
+        max_users: int = settings.NOTIFICATION_COUNT_CACHE_MAX_USERS,
+    ):
+        self.ttl = ttl
+        self.max_users = max_users
+        # user_id -> (expires_at, {type: [total, unread]}), least recent first
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[TypeCounts]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, counts = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return {ntype: (total, unread) for ntype, (total, unread) in counts.items()}
+
+    def set(self, user_id: int, counts: TypeCounts) -> None:
+        self._entries[user_id] = (
+            time.monotonic() + self.ttl,
+            {ntype: [total, unread] for ntype, (total, unread) in counts.items()},
+        )
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def apply(
+        self, user_id: int, ntype: Optional[str], total: int, unread: int
+    ) -> None:
+        """Adjust a cached user's counts; uncached users load fresh on next read"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        counts = entry[1].setdefault(ntype, [0, 0])
+        counts[0] = max(0, counts[0] + total)
+        counts[1] = max(0, counts[1] + unread)
+
+    def mark_all_read(self, user_id: int) -> None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            for counts in entry[1].values():
+                counts[1] = 0
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+
+notification_counts = NotificationCountCache()
+
+
+def record_created(
+    session: Session, ntype: NotificationType, user_ids: Iterable[int]
+) -> None:
+    """Count unread notifications inserted outside the unit of work, e.g. bulk INSERTs
+
+    Applied when the session commits, like the changes the flush hook collects.
+    """
+    session.info.setdefault(_PENDING_KEY, []).extend(
+        (user_id, ntype.value, 1, 1) for user_id in user_ids
+    )
+
+
+def _type_value(notification: Notification) -> Optional[str]:
+    return notification.type.value if notification.type else None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_count_changes(session: Session, flush_context) -> None:
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Notification):
+            changes.append((obj.user_id, _type_value(obj), 1, 0 if obj.is_read else 1))
+    for obj in session.deleted:
+        if isinstance(obj, Notification):
+            changes.append(
+                (obj.user_id, _type_value(obj), -1, 0 if obj.is_read else -1)
+            )
+    for obj in session.dirty:
+        if not isinstance(obj, Notification):
+            continue
+        history = inspect(obj).attrs.is_read.history
+        if not history.added:
+            continue
+        if not history.deleted:
+            # Previous state unknown; reload this user's counts on next read
+            changes.append((obj.user_id, None, None, None))
+        elif bool(history.added[0]) != bool(history.deleted[0]):
+            changes.append((obj.user_id, _type_value(obj), 0, -1 if obj.is_read else 1))
+
+    if changes:
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_count_changes(session: Session) -> None:
+    for user_id, ntype, total, unread in session.info.pop(_PENDING_KEY, []):
+        if total is None:
+            notification_counts.invalidate(user_id)
+        else:
+            notification_counts.apply(user_id, ntype, total, unread)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_count_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
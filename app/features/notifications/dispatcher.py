@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.features.notifications.ws_manager import (
+    ConnectionManager,
+    notification_manager,
+)
+from app.models.notification import Notification, NotificationStatus
+from sqlalchemy import Integer, any_, bindparam, or_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """Background delivery of PENDING notifications with retry and backoff"""
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        interval: float = settings.NOTIFICATION_DISPATCH_INTERVAL_SECONDS,
+        batch_size: int = settings.NOTIFICATION_DISPATCH_BATCH_SIZE,
+        grace_period: int = settings.NOTIFICATION_DISPATCH_GRACE_SECONDS,
+        max_retries: int = settings.NOTIFICATION_MAX_RETRIES,
+    ):
+        self.manager = manager
+        self.interval = interval
+        self.batch_size = batch_size
+        self.grace_period = grace_period
+        self.max_retries = max_retries
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the dispatch loop"""
+        self._task = asyncio.create_task(self._run())
+        logger.info("Notification dispatcher started")
+
+    async def stop(self) -> None:
+        """Stop the dispatch loop"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        logger.info("Notification dispatcher stopped")
+
+    async def dispatch_due(self, db: Session) -> int:
+        """Claim one batch of due notifications and try to deliver them"""
+        # Only users connected to this worker can be delivered to from here
+        user_ids = list(self.manager.active_connections.keys())
+        if not user_ids:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        notifications = (
+            db.query(Notification)
+            .filter(
+                Notification.status == NotificationStatus.PENDING,
+                # One array parameter instead of an IN list as long as the
+                # connected users, so the statement stays the same every tick
+                Notification.user_id
+                == any_(bindparam("user_ids", user_ids, type_=ARRAY(Integer))),
+                Notification.retry_count < self.max_retries,
+                or_(Notification.next_retry.is_(None), Notification.next_retry <= now),
+                # Leave fresh rows to the request-path handlers
+                Notification.created_at <= now - timedelta(seconds=self.grace_period),
+            )
+            .order_by(Notification.id)
+            .limit(self.batch_size)
+            # Rows claimed by another worker are skipped, not waited on
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not notifications:
+            db.commit()
+            return 0
+
+        results = await asyncio.gather(
+            *(
+                self.manager.send_notification(
+                    notification.user_id, notification.to_dict()
+                )
+                for notification in notifications
+            ),
+            return_exceptions=True,
+        )
+
+        for notification, sent in zip(notifications, results):
+            if sent is True:
+                # Queued; the socket writer marks it sent. Until then it is
+                # left alone rather than queued again on the next pass.
+                notification.next_retry = now + timedelta(seconds=self.grace_period)
+                continue
+
+            notification.update_retry_info(
+                str(sent) if isinstance(sent, Exception) else "Delivery failed"
+            )
+            if notification.retry_count >= self.max_retries:
+                notification.mark_as_failed("Max retries exceeded")
+
+        db.commit()
+        return len(notifications)
+
+    async def _run(self) -> None:
+        while True:
+            db = next(get_db())
+            try:
+                await self.dispatch_due(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Notification dispatch failed: {str(e)}")
+            finally:
+                db.close()
+
+            await asyncio.sleep(self.interval)
+
+
+notification_dispatcher = NotificationDispatcher(notification_manager)
@@ -1,7 +1,9 @@
 import logging
-from datetime import datetime, timezone
+from typing import List, Tuple
 
+from app.core.config import settings
 from app.core.events.base import Event
+from app.features.notifications.counters import record_created
 from app.features.notifications.ws_manager import notification_manager
 from app.models.notification import (
     Notification,
@@ -11,6 +13,7 @@ from app.models.notification import (
 )
 from app.models.user import User
 from fastapi import HTTPException, logger
+from sqlalchemy import func, insert, literal, select
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -19,39 +22,21 @@ logger = logging.getLogger(__name__)
 async def handle_schedule_update_notification(event: Event, db: Session) -> None:
     """Handle Schedule Update Notification"""
     try:
-        schedule = event.data.get("schedule")
-        notification = event.data.get("notification")
-
-        # Check if notification already exists in event data
-        if not notification:
-            notification_data = {
-                "user_id": schedule("user_id"),
-                "type": NotificationType.SCHEDULE_CHANGE,
-                "title": "Schedule Updated",
-                "message": f"Your schedule for {schedule.start_time.strftime('%Y-%m-%d')} has been updated",
-                "priority": NotificationPriority.HIGH,
-                "data": {
-                    "schedule_id": schedule.id,
-                    "date": schedule.start_time.strftime("%Y-%m-%d"),
-                    "time": f"{schedule.start_time.strftime('%H:%M')}-{schedule.end_time.strftime('%H:%M')}",
-                    "status": schedule.status.value,
-                },
-                "status": NotificationStatus.PENDING,
-            }
-
-            notification = Notification(**notification_data)
-            db.add(notification)
-            db.flush()
-
-        # Send real-time notification
-        sent = await notification_manager.send_notification(
-            schedule["user_id"], notification.to_dict()
-        )
-
-        if sent:
-            notification.mark_as_sent()
+        # Bulk writes publish one event per user carrying every new notification
+        notifications = event.data.get("notifications")
+        if notifications is None:
+            notifications = [event.data.get("notification")]
+        user_id = event.data.get("user_id") or event.data["schedule"]["user_id"]
+
+        for notification in notifications:
+            payload = (
+                notification
+                if isinstance(notification, dict)
+                else notification.to_dict()
+            )
 
-        db.commit()
+            # Send real-time notification; the socket writer marks it sent
+            await notification_manager.send_notification(user_id, payload)
 
     except Exception as e:
         db.rollback()
@@ -94,21 +79,15 @@ async def handle_trade_response_notification(event: Event, db: Session) -> None:
             },
         }
 
-        async with db.begin():
-            notification = Notification(**notification_data)
-            db.add(notification)
-            db.flush()
-
-            sent = await notification_manager.send_notification(
-                trade_request.author_id, notification.to_dict()
-            )
-
-            if sent:
-                notification.status = "sent"
-                notification.sent_at = datetime.now(timezone.utc)
-
+        notification = Notification(**notification_data)
+        db.add(notification)
         db.commit()
 
+        # Committed first so the socket writer can mark the row sent
+        await notification_manager.send_notification(
+            trade_request.author_id, notification.to_dict()
+        )
+
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -122,75 +101,99 @@ async def handle_new_announcement_notification(event: Event, db: Session) -> Non
     try:
         announcement = event.data.get("announcement")
         logger.info(
-            f"Processing announcement: {announcement.id if announcement else 'None'}"
+            f"Processing announcement: {announcement['id'] if announcement else 'None'}"
         )
 
         if not announcement:
             logger.error("No announcement data in event")
             return
 
-        users = db.query(User).filter(User.is_active == True).all()
-        logger.info(f"Found {len(users)} active users")
-
-        for user in users:
-            try:
-                notification_data = {
-                    "user_id": user.id,
-                    "type": NotificationType.ANNOUNCEMENT,
-                    "title": "New announcement posted",
-                    "message": announcement.title,
-                    "priority": (
-                        NotificationPriority.HIGH
-                        if announcement.priority == "high"
-                        else NotificationPriority.NORMAL
-                    ),
-                    "data": {
-                        "announcement_id": announcement.id,
-                        "title": announcement.title,
-                        "preview": (
-                            announcement.content[:100] + "..."
-                            if len(announcement.content) > 100
-                            else announcement.content
-                        ),
-                        "author": {
-                            "id": announcement.author.id,
-                            "name": announcement.author.full_name,
-                            "position": announcement.author.position,
-                        },
-                    },
-                    "status": NotificationStatus.PENDING,
-                }
-
-                notification = Notification(**notification_data)
-                db.add(notification)
-                db.flush()
-
-                # notification_manager가 None인지 체크
-                if notification_manager:
-                    sent = await notification_manager.send_notification(
-                        user.id, notification.to_dict()
-                    )
-                    if sent:
-                        notification.status = NotificationStatus.SENT
-                        notification.sent_at = datetime.now(timezone.utc)
-                else:
-                    logger.error("notification_manager is not initialized")
-                    notification.status = NotificationStatus.FAILED
-                    notification.error_message = "Notification manager not available"
-
-            except Exception as e:
-                logger.error(
-                    f"Error processing notification for user {user.id}: {str(e)}"
-                )
-                continue
+        priority = (
+            NotificationPriority.HIGH
+            if announcement["priority"] == "high"
+            else NotificationPriority.NORMAL
+        )
+        data = {
+            "announcement_id": announcement["id"],
+            "title": announcement["title"],
+            "preview": (
+                announcement["content"][:100] + "..."
+                if len(announcement["content"]) > 100
+                else announcement["content"]
+            ),
+            "author": announcement["author"],
+        }
 
+        # One INSERT ... SELECT creates the row of every active user
+        rows = db.execute(
+            insert(Notification)
+            .from_select(
+                [
+                    "user_id",
+                    "type",
+                    "title",
+                    "message",
+                    "priority",
+                    "data",
+                    "created_at",
+                ],
+                select(
+                    User.id,
+                    literal(NotificationType.ANNOUNCEMENT, Notification.type.type),
+                    literal("New announcement posted"),
+                    literal(announcement["title"]),
+                    literal(priority, Notification.priority.type),
+                    literal(data, Notification.data.type),
+                    func.now(),
+                ).where(User.is_active == True),
+            )
+            .returning(Notification.id, Notification.user_id, Notification.created_at)
+        ).all()
+        record_created(
+            db, NotificationType.ANNOUNCEMENT, [user_id for _, user_id, _ in rows]
+        )
         db.commit()
+        logger.info(f"Created announcement notifications for {len(rows)} users")
+
+        if not notification_manager:
+            logger.error("notification_manager is not initialized")
+            return
+
+        # Every row is created in one statement, so only id and user differ
+        payload = {
+            "type": NotificationType.ANNOUNCEMENT.value,
+            "title": "New announcement posted",
+            "message": announcement["title"],
+            "priority": priority.value,
+            "status": NotificationStatus.PENDING.value,
+            "data": data,
+            "is_read": False,
+            "read_at": None,
+            "created_at": rows[0][2].isoformat() if rows else None,
+            "sent_at": None,
+        }
+        recipients = [
+            (user_id, notification_id) for notification_id, user_id, _ in rows
+        ]
+
+        await _deliver(payload, recipients)
 
     except Exception as e:
         logger.error(f"Error in handle_new_announcement_notification: {str(e)}")
-        if not isinstance(db.rollback, type(None)):
-            db.rollback()
+        db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process announcement notification: {str(e)}",
         )
+
+
+async def _deliver(payload: dict, recipients: List[Tuple[int, int]]) -> None:
+    """Send a shared payload to (user_id, id) recipients chunk by chunk
+
+    Each chunk is one relay message for users on other workers.
+    """
+    chunk_size = settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    for start in range(0, len(recipients), chunk_size):
+        await notification_manager.send_to_recipients(
+            payload, recipients[start : start + chunk_size]
+        )
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.features.notifications.counters import notification_counts
+from app.models.notification import (
+    Notification,
+    NotificationArchive,
+    NotificationType,
+)
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Columns copied verbatim from notifications into notifications_archive
+ARCHIVED_COLUMNS = [
+    "id",
+    "user_id",
+    "type",
+    "title",
+    "message",
+    "priority",
+    "data",
+    "status",
+    "is_read",
+    "read_at",
+    "sent_at",
+    "created_at",
+    "deleted_at",
+]
+
+
+class NotificationRetention:
+    """Background compaction moving expired read notifications to the archive
+
+    Keeping only live rows in `notifications` bounds inbox queries and
+    vacuum work by retention rather than by how long the company has existed.
+    """
+
+    def __init__(
+        self,
+        retention_days: Dict[str, int] = settings.NOTIFICATION_RETENTION_DAYS,
+        interval: float = settings.NOTIFICATION_RETENTION_INTERVAL_SECONDS,
+        batch_size: int = settings.NOTIFICATION_RETENTION_BATCH_SIZE,
+    ):
+        self.retention_days = retention_days
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the compaction loop"""
+        self._task = asyncio.create_task(self._run())
+        logger.info("Notification retention started")
+
+    async def stop(self) -> None:
+        """Stop the compaction loop"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        logger.info("Notification retention stopped")
+
+    def compact(self, db: Session) -> List[int]:
+        """Archive every expired read notification, one batch per transaction
+
+        Returns the user id of each archived row. Cached counts are not
+        touched here, since this runs off the event loop; the caller
+        invalidates them for these users.
+        """
+        archived: List[int] = []
+        now = datetime.now(timezone.utc)
+        for type_name, days in self.retention_days.items():
+            try:
+                ntype = NotificationType(type_name)
+            except ValueError:
+                logger.warning(f"Unknown notification type in retention: {type_name}")
+                continue
+
+            cutoff = now - timedelta(days=days)
+            while True:
+                moved = self.archive_batch(db, ntype, cutoff)
+                archived += moved
+                if len(moved) < self.batch_size:
+                    break
+
+        return archived
+
+    def archive_batch(
+        self, db: Session, ntype: NotificationType, cutoff: datetime
+    ) -> List[int]:
+        """Move one batch with a single DELETE ... RETURNING into the archive"""
+        expired = (
+            select(Notification.id)
+            .where(
+                Notification.type == ntype,
+                Notification.is_read == True,
+                Notification.created_at < cutoff,
+            )
+            .order_by(Notification.id)
+            .limit(self.batch_size)
+            # Rows locked by a concurrent writer are left for the next run
+            .with_for_update(skip_locked=True)
+        )
+        table = Notification.__table__
+        moved = (
+            delete(Notification)
+            .where(Notification.id.in_(expired))
+            .returning(*(table.c[name] for name in ARCHIVED_COLUMNS))
+            .cte("moved")
+        )
+        user_ids = db.scalars(
+            insert(NotificationArchive)
+            .from_select(
+                ARCHIVED_COLUMNS, select(*(moved.c[name] for name in ARCHIVED_COLUMNS))
+            )
+            .returning(NotificationArchive.user_id)
+            .add_cte(moved)
+        ).all()
+        db.commit()
+        return user_ids
+
+    def _compact_in_session(self) -> List[int]:
+        db = next(get_db())
+        try:
+            return self.compact(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Large backlogs take a while; keep them off the event loop
+                archived = await asyncio.to_thread(self._compact_in_session)
+                # Back on the loop, where the count cache is only ever touched
+                for user_id in set(archived):
+                    notification_counts.invalidate(user_id)
+                if archived:
+                    logger.info(f"Archived {len(archived)} expired notifications")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification retention failed: {str(e)}")
+
+            await asyncio.sleep(self.interval)
+
+
+notification_retention = NotificationRetention()
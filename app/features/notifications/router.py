@@ -1,9 +1,15 @@
+from typing import Optional
+
 from app.core.database import get_db
+from app.core.pagination import MAX_PAGE_LIMIT
 from app.core.security import get_current_user
-from app.features.notifications.schemas import NotificationList
+from app.features.notifications.schemas import (
+    NotificationList,
+    NotificationTotalMode,
+)
 from app.features.notifications.service import NotificationService
 from app.models.user import User
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 router = APIRouter(tags=["Notifications"])
@@ -11,15 +17,16 @@ router = APIRouter(tags=["Notifications"])
 
 @router.get("/", response_model=NotificationList)
 async def get_notification(
-    skip: int = 0,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
     unread_only: bool = False,
+    total: NotificationTotalMode = NotificationTotalMode.EXACT,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get user's notification"""
+    """Get a page of the user's notifications"""
     return await NotificationService.get_user_notification(
-        db, current_user.id, skip, limit, unread_only
+        db, current_user.id, limit, cursor, unread_only, total
     )
 
 
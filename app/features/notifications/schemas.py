@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 
 from app.models.notification import NotificationPriority, NotificationType
@@ -28,7 +29,16 @@ class NotificationResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class NotificationTotalMode(str, Enum):
+    """How the notification list reports its total and unread counts"""
+
+    EXACT = "exact"  # Counted by query on every request
+    APPROXIMATE = "approximate"  # Cached counts, else planner estimates
+    NONE = "none"  # Counts are omitted
+
+
 class NotificationList(BaseModel):
     items: list[NotificationResponse]
-    total: int
-    unread: int
+    total: Optional[int] = None
+    unread: Optional[int] = None
+    next_cursor: Optional[str] = None
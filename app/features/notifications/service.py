@@ -1,10 +1,18 @@
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import List, Optional, Tuple
 
+from app.core.pagination import (
+    MAX_PAGE_LIMIT,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+)
+from app.features.notifications.counters import TypeCounts, notification_counts
+from app.features.notifications.schemas import NotificationTotalMode
 from app.models.notification import Notification, NotificationStatus, NotificationType
 from app.models.user import User
 from fastapi import HTTPException
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_, tuple_
 from sqlalchemy.orm import Session
 
 
@@ -29,40 +37,80 @@ class NotificationService:
     async def get_user_notification(
         db: Session,
         user_id: int,
-        skip: int = 0,
         limit: int = 20,
+        cursor: Optional[str] = None,
         unread_only: bool = False,
+        total_mode: NotificationTotalMode = NotificationTotalMode.EXACT,
     ) -> dict:
-        "Get notifications for user"
-        print(f"Fetching notifications for user {user_id}")
-
-        query = db.query(Notification).filter(Notification.user_id == user_id)
+        "Get a page of notifications for user, keyset paginated on (created_at, id)"
+        limit = min(limit, MAX_PAGE_LIMIT)
+        query = db.query(Notification).filter(
+            Notification.user_id == user_id, Notification.deleted_at.is_(None)
+        )
 
         if unread_only:
             query = query.filter(Notification.is_read == False)
 
-        total = query.count()
-        print(f"Found {total} total notifications")
-
-        unread = (
-            db.query(Notification)
-            .filter(Notification.user_id == user_id, Notification.is_read == False)
-            .count()
+        total, unread = NotificationService._get_list_counts(
+            db, user_id, query, unread_only, total_mode
         )
 
+        if cursor:
+            created_at, notification_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Notification.created_at, Notification.id)
+                < (created_at, notification_id)
+            )
+
+        # Fetch one extra row to know whether another page exists
         notifications = (
-            query.order_by(Notification.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            query.order_by(Notification.created_at.desc(), Notification.id.desc())
+            .limit(limit + 1)
             .all()
         )
 
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            next_cursor = encode_cursor(
+                notifications[-1].created_at, notifications[-1].id
+            )
+
         return {
             "items": [notification.to_dict() for notification in notifications],
             "total": total,
             "unread": unread,
+            "next_cursor": next_cursor,
         }
 
+    @staticmethod
+    def _get_list_counts(
+        db: Session,
+        user_id: int,
+        query,
+        unread_only: bool,
+        total_mode: NotificationTotalMode,
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """(total, unread) for a notification list in the requested mode"""
+        if total_mode == NotificationTotalMode.NONE:
+            return None, None
+
+        counts = (
+            notification_counts.get(user_id)
+            if total_mode == NotificationTotalMode.APPROXIMATE
+            # Other workers' writes reach this cache only after its TTL
+            else NotificationService.get_type_counts(db, user_id, use_cache=False)
+        )
+        if counts is None:
+            # Planner estimates keep deep inboxes from paying for a COUNT
+            unread_query = query.filter(Notification.is_read == False)
+            unread = estimate_count(db, unread_query)
+            return (unread if unread_only else estimate_count(db, query)), unread
+
+        unread = sum(unread for _, unread in counts.values())
+        total = unread if unread_only else sum(total for total, _ in counts.values())
+        return total, unread
+
     @staticmethod
     async def mark_as_read(db: Session, notification_id: int, user_id: int) -> bool:
         """Mark a notification as read"""
@@ -94,6 +142,7 @@ class NotificationService:
                 Notification.user_id == user_id, Notification.is_read == False
             ).update({"is_read": True, "read_at": datetime.now(timezone.utc)})
             db.commit()
+            notification_counts.mark_all_read(user_id)
             return True
         except Exception as e:
             db.rollback()
@@ -125,24 +174,72 @@ class NotificationService:
             .all()
         )
 
+    @staticmethod
+    async def get_notifications_after(
+        db: Session,
+        user_id: int,
+        after_seq: int,
+        limit: int,
+        pending_only: bool = False,
+        days: int = 15,
+    ) -> List[Notification]:
+        """Get one page of notifications following a client's sequence cursor"""
+        cutoff_date = datetime.now() - timedelta(days=days)
+
+        query = db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.id > after_seq,
+            Notification.created_at >= cutoff_date,
+        )
+        if pending_only:
+            query = query.filter(Notification.status == NotificationStatus.PENDING)
+
+        return query.order_by(Notification.id).limit(limit).all()
+
+    @staticmethod
+    def get_type_counts(
+        db: Session, user_id: int, use_cache: bool = True
+    ) -> TypeCounts:
+        """Get (total, unread) per type, from the counter cache when possible
+
+        With `use_cache=False` the counts are always queried, and the fresh
+        result replaces the cached one.
+        """
+        counts = notification_counts.get(user_id) if use_cache else None
+        if counts is not None:
+            return counts
+
+        rows = (
+            db.query(
+                Notification.type,
+                func.count(),
+                func.count().filter(Notification.is_read == False),
+            )
+            .filter(Notification.user_id == user_id, Notification.deleted_at.is_(None))
+            .group_by(Notification.type)
+            .all()
+        )
+        counts = {
+            (ntype.value if ntype else None): (total, unread)
+            for ntype, total, unread in rows
+        }
+        notification_counts.set(user_id, counts)
+        return counts
+
     @staticmethod
     def get_notification_summary(db: Session, user_id: int) -> dict:
         """Get notification summary for dashboard"""
         try:
-            base_query = db.query(Notification).filter(
-                Notification.user_id == user_id, Notification.deleted_at.is_(None)
-            )
-
-            total_unread = base_query.filter(Notification.is_read == False).count()
-
-            type_summary = {}
-            for ntype in NotificationType:
-                count = base_query.filter(
-                    Notification.type == ntype, Notification.is_read == False
-                ).count()
-                type_summary[ntype.value] = count
+            counts = NotificationService.get_type_counts(db, user_id)
+            type_summary = {
+                ntype.value: counts.get(ntype.value, (0, 0))[1]
+                for ntype in NotificationType
+            }
 
-            return {"total_unread": total_unread, "type_summary": type_summary}
+            return {
+                "total_unread": sum(unread for _, unread in counts.values()),
+                "type_summary": type_summary,
+            }
 
         except Exception as e:
             raise HTTPException(
@@ -1,15 +1,22 @@
+import asyncio
 import json
 import logging
+from collections import deque
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
+from app.core.config import settings
 from app.models.user import User
+
+from .encoding import encode_message
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DEVICE_ID = "default"
+
 
 class ConnectionState(str, Enum):
     CONNECTING = "connecting"
@@ -19,6 +26,12 @@ class ConnectionState(str, Enum):
     ERROR = "error"
 
 
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued message
+    COALESCE = "coalesce"  # Replace a queued message with the same key
+    DISCONNECT = "disconnect"  # Drop the client; it replays on reconnect
+
+
 class WebSocketConnection:
     def __init__(
         self,
@@ -27,9 +40,13 @@ class WebSocketConnection:
         ping_interval: int = 30,
         ping_timeout: int = 10,
         max_reconnect_attempts: int = 5,
+        send_queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy(settings.WS_OVERFLOW_POLICY),
+        device_id: str = DEFAULT_DEVICE_ID,
     ):
         self.websocket = websocket
         self.user = user
+        self.device_id = device_id
         self.state = ConnectionState.CONNECTING
         self.last_ping = datetime.now()
         self.last_pong = datetime.now()
@@ -41,6 +58,23 @@ class WebSocketConnection:
         self.pending_notifications: List[Dict[str, Any]] = []
         self.connected_handlers: Set[Callable] = set()
         self.disconnected_handlers: Set[Callable] = set()
+        self.ack_handlers: Set[Callable] = set()
+        self.delivered_handlers: Set[Callable] = set()
+        # Notification ids this connection wrote and the client has not acked
+        # yet, oldest first; cumulative acks only ever cover these
+        self._unacked_ids: Dict[int, None] = {}
+
+        # Encoded outbound messages as (coalesce key, text, notification id),
+        # drained by a writer task
+        self.send_queue_size = send_queue_size
+        self.overflow_policy = overflow_policy
+        self._outbox: Deque[Tuple[Optional[str], str, Optional[int]]] = deque()
+        self._outbox_ready = asyncio.Event()
+        self._outbox_drained = asyncio.Event()
+        self._outbox_drained.set()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._close_task: Optional[asyncio.Task] = None
+        self.dropped_messages = 0
 
     async def connect(self) -> bool:
         """Establish WebSocket connection"""
@@ -63,10 +97,15 @@ class WebSocketConnection:
 
     async def disconnect(self, code: int = 1000) -> None:
         """Close WebSocket connection"""
+        if self._writer_task and self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+        self._writer_task = None
+        # Nothing will be written any more; unsent rows stay PENDING
+        self._stop_outbox()
         try:
             self.state = ConnectionState.DISCONNECTING
             if self.websocket.client_state == WebSocketState.CONNECTED:
-                await self.websocket.close()
+                await self.websocket.close(code=code)
             self.state = ConnectionState.DISCONNECTED
         except Exception as e:
             logger.error(f"Error closing WebSocket: {str(e)}")
@@ -95,39 +134,137 @@ class WebSocketConnection:
             return False
 
     async def send_notification(self, notification: Dict[str, Any]) -> bool:
-        """Send notification to client"""
+        """Queue notification for the client without waiting on the socket
+
+        True only means the message was queued; delivered handlers are called
+        once the writer has actually sent it.
+        """
         if self.state != ConnectionState.CONNECTED:
             self.pending_notifications.append(notification)
             return False
 
-        try:
-            await self.websocket.send_json(
+        return self.enqueue(
+            encode_message(
                 {
                     "type": "notification",
+                    # Notification ids increase monotonically, so they double
+                    # as the per-user sequence number clients resume from
+                    "seq": notification.get("id"),
                     "payload": notification,
                     "timestamp": datetime.now().isoformat(),
                 }
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Error sending notification to user {self.user.id}: {str(e)}")
-            await self.handle_error(e)
+            ),
+            key=(
+                f"notification:{notification['id']}"
+                if notification.get("id") is not None
+                else None
+            ),
+            notification_id=notification.get("id"),
+        )
+
+    async def send_encoded(self, data: str, key: Optional[str] = None) -> bool:
+        """Queue an already encoded message, e.g. one shared by a broadcast"""
+        if self.state != ConnectionState.CONNECTED:
             return False
+        return self.enqueue(data, key)
 
-    async def send_ping(self) -> bool:
-        """Send ping message to client"""
+    async def send_ping(self, encoded: Optional[str] = None) -> bool:
+        """Queue ping message for the client"""
         if self.state != ConnectionState.CONNECTED:
             return False
 
+        self.last_ping = datetime.now()
+        return self.enqueue(
+            encoded
+            or encode_message(
+                {"type": "ping", "timestamp": self.last_ping.isoformat()}
+            ),
+            key="ping",
+        )
+
+    def enqueue(
+        self,
+        message: str,
+        key: Optional[str] = None,
+        notification_id: Optional[int] = None,
+    ) -> bool:
+        """Add a message to the outbound queue, applying the overflow policy"""
+        if self.overflow_policy == OverflowPolicy.COALESCE and key is not None:
+            for index, (queued_key, _, _) in enumerate(self._outbox):
+                if queued_key == key:
+                    self._outbox[index] = (key, message, notification_id)
+                    return True
+
+        if len(self._outbox) >= self.send_queue_size:
+            if self.overflow_policy == OverflowPolicy.DISCONNECT:
+                logger.warning(
+                    f"Send queue full for user {self.user.id}, disconnecting"
+                )
+                self.dropped_messages += len(self._outbox)
+                self._stop_outbox()
+                self.state = ConnectionState.ERROR
+                self.error = "Send queue overflow"
+                # The client reconnects itself and gets its backlog replayed
+                self.reconnect_attempts = self.max_reconnect_attempts
+                self._close_task = asyncio.create_task(
+                    self.disconnect(code=1008)  # 1008 = Policy violation
+                )
+                return False
+
+            self._outbox.popleft()
+            self.dropped_messages += 1
+
+        self._outbox.append((key, message, notification_id))
+        self._outbox_drained.clear()
+        self._outbox_ready.set()
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._write_outbox())
+        return True
+
+    def _stop_outbox(self) -> None:
+        """Discard queued messages and release anyone waiting on drain()"""
+        self._outbox.clear()
+        self._outbox_drained.set()
+        self._outbox_ready.set()
+
+    async def _write_outbox(self) -> None:
+        """Drain the outbound queue onto the socket"""
+        while self.state == ConnectionState.CONNECTED:
+            if not self._outbox:
+                self._outbox_drained.set()
+                self._outbox_ready.clear()
+                await self._outbox_ready.wait()
+                continue
+
+            _, message, notification_id = self._outbox.popleft()
+            try:
+                await self.websocket.send_text(message)
+            except Exception as e:
+                logger.error(f"Error sending message to user {self.user.id}: {str(e)}")
+                await self.handle_error(e)
+                return
+
+            # Dropped or unsent messages stay PENDING and are retried or replayed
+            if notification_id is not None:
+                self._track_unacked(notification_id)
+                for handler in self.delivered_handlers:
+                    try:
+                        await handler(self.user.id, notification_id)
+                    except Exception as e:
+                        logger.error(f"Error in delivered handler: {str(e)}")
+
+    def _track_unacked(self, notification_id: int) -> None:
+        self._unacked_ids[notification_id] = None
+        # Bounded; ids a client never acks were marked SENT when written
+        while len(self._unacked_ids) > self.send_queue_size * 10:
+            del self._unacked_ids[next(iter(self._unacked_ids))]
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the writer has flushed every queued message"""
         try:
-            await self.websocket.send_json(
-                {"type": "ping", "timestamp": datetime.now().isoformat()}
-            )
-            self.last_ping = datetime.now()
+            await asyncio.wait_for(self._outbox_drained.wait(), timeout)
             return True
-        except Exception as e:
-            logger.error(f"Error sending ping to user {self.user.id}: {str(e)}")
-            await self.handle_error(e)
+        except asyncio.TimeoutError:
             return False
 
     async def process_pending_notifications(self) -> None:
@@ -162,12 +299,15 @@ class WebSocketConnection:
         """Get connection status information"""
         return {
             "user_id": self.user.id,
+            "device_id": self.device_id,
             "state": self.state,
             "last_ping": self.last_ping.isoformat(),
             "last_pong": self.last_pong.isoformat(),
             "is_alive": self.is_alive(),
             "error": self.error,
             "pending_notifications": len(self.pending_notifications),
+            "queued_messages": len(self._outbox),
+            "dropped_messages": self.dropped_messages,
             "reconnect_attempts": self.reconnect_attempts,
         }
 
@@ -180,18 +320,50 @@ class WebSocketConnection:
             if message_type == "pong":
                 await self.handle_pong()
             elif message_type == "notification_ack":
-                notification_id = data.get("notification_id")
-                logger.info(
-                    f"Notification {notification_id} acknowledged by user {self.user.id}"
-                )
+                await self.handle_ack(data)
 
         except json.JSONDecodeError:
             logger.warning(f"Invalid message format from user {self.user.id}")
         except Exception as e:
             await self.handle_error(e)
 
+    async def handle_ack(self, data: Dict[str, Any]) -> None:
+        """Handle an ack for one notification or, with `seq`, everything up to it
+
+        Ids are not allocated in commit order, so a cumulative ack only
+        covers notifications this connection actually sent.
+        """
+        cumulative = data.get("seq") is not None
+        seq = data.get("seq") if cumulative else data.get("notification_id")
+        if not isinstance(seq, int):
+            logger.warning(f"Invalid notification ack from user {self.user.id}")
+            return
+
+        if cumulative:
+            notification_ids = [
+                notification_id
+                for notification_id in self._unacked_ids
+                if notification_id <= seq
+            ]
+        else:
+            notification_ids = [seq]
+        for notification_id in notification_ids:
+            self._unacked_ids.pop(notification_id, None)
+        if not notification_ids:
+            return
+
+        logger.info(f"Notification {seq} acknowledged by user {self.user.id}")
+        for handler in self.ack_handlers:
+            await handler(self.user.id, notification_ids)
+
     def add_connected_handler(self, handler: callable) -> None:
         self.connected_handlers.add(handler)
 
     def add_disconnected_handler(self, handler: callable) -> None:
         self.disconnected_handlers.add(handler)
+
+    def add_ack_handler(self, handler: callable) -> None:
+        self.ack_handlers.add(handler)
+
+    def add_delivered_handler(self, handler: callable) -> None:
+        self.delivered_handlers.add(handler)
@@ -0,0 +1,21 @@
+import json
+from datetime import date, datetime
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder is used without it
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """Serialize a WebSocket message once so it can be sent to many clients"""
+    if orjson is not None:
+        return orjson.dumps(message, default=_default).decode()
+    return json.dumps(message, default=_default, separators=(",", ":"))
@@ -7,6 +7,7 @@ from typing import Any, Callable, Dict, List, Optional
 from app.models.events import Event, EventType
 
 from .connection import WebSocketConnection
+from .encoding import encode_message
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,7 @@ class WSMessage:
         self.type = type
         self.payload = payload or {}
         self.timestamp = timestamp or datetime.now()
+        self._encoded: Optional[str] = None
 
     def to_json(self) -> Dict[str, Any]:
         return {
@@ -37,6 +39,12 @@ class WSMessage:
             "timestamp": self.timestamp.isoformat(),
         }
 
+    def encode(self) -> str:
+        """Serialized form, computed once however many clients receive it"""
+        if self._encoded is None:
+            self._encoded = encode_message(self.to_json())
+        return self._encoded
+
     @classmethod
     def from_json(cls, data: Dict[str, Any]) -> "WSMessage":
         return cls(
@@ -95,7 +103,7 @@ class WSProtocol:
 
     async def send_message(self, message: WSMessage) -> None:
         """Send message to client"""
-        await self.connection.websocket.send_json(message.to_json())
+        await self.connection.send_encoded(message.encode())
 
     def add_event_handler(self, event_type: EventType, handler: Callable) -> None:
         """Add event handler"""
@@ -0,0 +1,89 @@
+from typing import Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+from .connection import WebSocketConnection
+
+DeviceConnections = Dict[str, WebSocketConnection]
+
+
+class ShardedConnectionRegistry(MutableMapping[int, DeviceConnections]):
+    """Per-device connections keyed by user id, split into shards swept independently"""
+
+    def __init__(self, shard_count: int = 16):
+        self._shards: List[Dict[int, DeviceConnections]] = [
+            {} for _ in range(max(1, shard_count))
+        ]
+
+    @property
+    def shards(self) -> List[Dict[int, DeviceConnections]]:
+        return self._shards
+
+    def shard_for(self, user_id: int) -> Dict[int, DeviceConnections]:
+        return self._shards[user_id % len(self._shards)]
+
+    def add(
+        self, user_id: int, device_id: str, connection: WebSocketConnection
+    ) -> Optional[WebSocketConnection]:
+        """Register a device connection, returning the one it replaces"""
+        devices = self.shard_for(user_id).setdefault(user_id, {})
+        # Re-inserted so devices stay ordered from oldest to newest connection
+        replaced = devices.pop(device_id, None)
+        devices[device_id] = connection
+        return replaced
+
+    def evict_oldest(
+        self, user_id: int, keep: int
+    ) -> List[Tuple[str, WebSocketConnection]]:
+        """Remove the user's oldest device connections beyond `keep`"""
+        devices = self.shard_for(user_id).get(user_id, {})
+        evicted = list(devices.items())[: max(0, len(devices) - keep)]
+        for device_id, _ in evicted:
+            del devices[device_id]
+        return evicted
+
+    def discard(
+        self,
+        user_id: int,
+        device_id: str,
+        connection: Optional[WebSocketConnection] = None,
+    ) -> None:
+        """Remove a device connection, only if it is still `connection` when given"""
+        shard = self.shard_for(user_id)
+        devices = shard.get(user_id)
+        if not devices or device_id not in devices:
+            return
+        if connection is not None and devices[device_id] is not connection:
+            return
+        del devices[device_id]
+        if not devices:
+            del shard[user_id]
+
+    def iter_connections(
+        self, shard: Optional[Dict[int, DeviceConnections]] = None
+    ) -> Iterator[Tuple[int, str, WebSocketConnection]]:
+        """Yield (user_id, device_id, connection) for one shard or all of them"""
+        for current in [shard] if shard is not None else self._shards:
+            for user_id, devices in list(current.items()):
+                for device_id, connection in list(devices.items()):
+                    yield user_id, device_id, connection
+
+    def connection_count(self) -> int:
+        return sum(len(devices) for shard in self._shards for devices in shard.values())
+
+    def __getitem__(self, user_id: int) -> DeviceConnections:
+        return self.shard_for(user_id)[user_id]
+
+    def __setitem__(self, user_id: int, devices: DeviceConnections) -> None:
+        self.shard_for(user_id)[user_id] = devices
+
+    def __delitem__(self, user_id: int) -> None:
+        del self.shard_for(user_id)[user_id]
+
+    def __contains__(self, user_id: object) -> bool:
+        return isinstance(user_id, int) and user_id in self.shard_for(user_id)
+
+    def __iter__(self) -> Iterator[int]:
+        for shard in self._shards:
+            yield from list(shard)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
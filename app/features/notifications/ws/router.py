@@ -1,9 +1,10 @@
 import logging
 from datetime import datetime
+from typing import Optional
 
 from app.core.database import get_db
 from app.core.security import get_user_from_token
-from app.features.notifications.service import NotificationService
+from app.features.notifications.ws.connection import DEFAULT_DEVICE_ID
 from app.features.notifications.ws_manager import notification_manager
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
@@ -17,7 +18,12 @@ async def notification_websocket(
     websocket: WebSocket,
     user_id: int,
     token: str = Query(...),
+    device_id: Optional[str] = Query(None, max_length=64),
+    last_seq: Optional[int] = Query(None, ge=0),
 ):
+    # Clients without a device id share one slot, so a reconnect replaces
+    # their stale socket instead of piling up new ones
+    device_id = device_id or DEFAULT_DEVICE_ID
     db_session = None
     try:
         await websocket.accept()
@@ -29,25 +35,26 @@ async def notification_websocket(
             await websocket.close(code=4001)  # Unauthorized
             return
 
+        # Without a cursor, devices already online have been receiving the
+        # pending backlog, so only the first one replays it
+        first_device = user_id not in notification_manager.active_connections
+
         # Connect WebSocket
-        connected = await notification_manager.connect(user, websocket)
+        connected = await notification_manager.connect(user, websocket, device_id)
         if not connected:
             return
 
         try:
-            # Send pending notifications
-            pending_notifications = await NotificationService.get_pending_notifications(
-                db_session, user_id
-            )
-            for notification in pending_notifications:
-                await notification_manager.send_notification(
-                    user_id, notification.to_dict()
+            if last_seq is not None or first_device:
+                # Send only the gap since the client's last seen sequence number
+                await notification_manager.replay_missed(
+                    db_session, user_id, device_id, last_seq
                 )
 
             # Handle incoming messages
             while True:
                 data = await websocket.receive_text()
-                await notification_manager.handle_message(user_id, data)
+                await notification_manager.handle_message(user_id, data, device_id)
 
         except WebSocketDisconnect:
             logger.info(f"WebSocket disconnected for user {user_id}")
@@ -57,7 +64,7 @@ async def notification_websocket(
         if websocket.client_state != WebSocketState.DISCONNECTED:
             await websocket.close(code=1011)
     finally:
-        await notification_manager.disconnect(user_id)
+        await notification_manager.disconnect(user_id, device_id, websocket)
         if db_session:
             db_session.close()
 
@@ -1,39 +1,310 @@
 import asyncio
+import json
 import logging
-from typing import Any, Dict, Optional, Set
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from uuid import uuid4
 
+import psycopg2
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.features.notifications.acks import ack_aggregator
+from app.features.notifications.service import NotificationService
 from app.features.notifications.ws.connection import (
+    DEFAULT_DEVICE_ID,
     ConnectionState,
     WebSocketConnection,
 )
+from app.features.notifications.ws.protocols import WSMessage, WSMessageType
+from app.features.notifications.ws.registry import (
+    DeviceConnections,
+    ShardedConnectionRegistry,
+)
+from app.models.notification import Notification
 from app.models.user import User
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
+from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class DeliveryTransport(ABC):
+    """Pub/sub channel carrying delivery requests between worker processes"""
+
+    @abstractmethod
+    async def start(self, on_message: MessageHandler) -> None:
+        """Subscribe `on_message` to requests published by any worker"""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Unsubscribe and release the channel"""
+
+    @abstractmethod
+    async def publish(self, message: Dict[str, Any]) -> None:
+        """Send a request to every subscribed worker"""
+
+
+class InMemoryTransport(DeliveryTransport):
+    """Process-local transport; managers sharing one instance act as workers"""
+
+    def __init__(self):
+        self._subscribers: List[MessageHandler] = []
+        self._on_message: Optional[MessageHandler] = None
+
+    def share(self) -> "InMemoryTransport":
+        """Another endpoint on the same in-memory channel"""
+        endpoint = InMemoryTransport()
+        endpoint._subscribers = self._subscribers
+        return endpoint
+
+    async def start(self, on_message: MessageHandler) -> None:
+        self._on_message = on_message
+        self._subscribers.append(on_message)
+
+    async def stop(self) -> None:
+        if self._on_message in self._subscribers:
+            self._subscribers.remove(self._on_message)
+        self._on_message = None
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        for subscriber in list(self._subscribers):
+            await subscriber(message)
+
+
+class PostgresTransport(DeliveryTransport):
+    """Transport over Postgres LISTEN/NOTIFY"""
+
+    # NOTIFY payloads must stay below 8000 bytes
+    MAX_PAYLOAD_BYTES = 7900
+    # Recipient pairs per id-only message when a fan-out is too large
+    RECIPIENTS_PER_REFERENCE = 250
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = "ws_delivery",
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = settings.WS_TRANSPORT_MAX_RECONNECT_SECONDS,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._listen_conn = None
+        self._listen_fd: Optional[int] = None
+        self._notify_conn = None
+        self._on_message: Optional[MessageHandler] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    async def start(self, on_message: MessageHandler) -> None:
+        self._on_message = on_message
+        await self._listen()
+        logger.info(f"Listening for deliveries on channel {self.channel}")
+
+    async def stop(self) -> None:
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        self._close_listen()
+        if self._notify_conn:
+            self._notify_conn.close()
+            self._notify_conn = None
+        self._on_message = None
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        payload = json.dumps(message, default=str)
+        if len(payload.encode()) <= self.MAX_PAYLOAD_BYTES:
+            payloads = [payload]
+        else:
+            payloads = [
+                json.dumps(reference) for reference in self._by_reference(message)
+            ]
+
+        loop = asyncio.get_running_loop()
+        try:
+            for payload in payloads:
+                await loop.run_in_executor(None, self._notify, payload)
+        except psycopg2.Error as e:
+            # The row stays PENDING for the owning worker's dispatcher
+            logger.warning(f"Publishing on channel {self.channel} failed: {str(e)}")
+
+    @classmethod
+    def _by_reference(cls, message: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Split a request too large for NOTIFY into id-only requests
+
+        Receiving workers load the notification rows themselves.
+        """
+        if "recipients" in message:
+            recipients = message["recipients"]
+            for start in range(0, len(recipients), cls.RECIPIENTS_PER_REFERENCE):
+                yield {
+                    "worker_id": message["worker_id"],
+                    "recipients": recipients[
+                        start : start + cls.RECIPIENTS_PER_REFERENCE
+                    ],
+                }
+            return
+
+        notification_id = message["notification"].get("id")
+        if notification_id is None:
+            logger.warning("Unsaved notification too large for NOTIFY, skipping")
+            return
+        yield {
+            "worker_id": message["worker_id"],
+            "user_id": message["user_id"],
+            "notification_id": notification_id,
+        }
+
+    def _notify(self, payload: str) -> None:
+        if self._notify_conn is None or self._notify_conn.closed:
+            self._notify_conn = psycopg2.connect(self.dsn)
+            self._notify_conn.autocommit = True
+        try:
+            with self._notify_conn.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+        except psycopg2.OperationalError:
+            # Reconnect on the next publish
+            self._notify_conn.close()
+            raise
+
+    async def _listen(self) -> None:
+        """Open the LISTEN connection and watch it on the event loop"""
+        loop = asyncio.get_running_loop()
+        self._listen_conn = await loop.run_in_executor(None, self._connect_listener)
+        self._listen_fd = self._listen_conn.fileno()
+        loop.add_reader(self._listen_fd, self._on_readable)
+
+    def _connect_listener(self):
+        connection = psycopg2.connect(self.dsn)
+        connection.autocommit = True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+        except psycopg2.Error:
+            connection.close()
+            raise
+        return connection
+
+    def _close_listen(self) -> None:
+        if self._listen_fd is not None:
+            asyncio.get_running_loop().remove_reader(self._listen_fd)
+            self._listen_fd = None
+        if self._listen_conn:
+            self._listen_conn.close()
+            self._listen_conn = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._listen_conn.poll()
+        except psycopg2.OperationalError as e:
+            logger.error(f"Lost delivery channel {self.channel}: {str(e)}")
+            self._close_listen()
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+            return
+
+        while self._listen_conn.notifies:
+            notify = self._listen_conn.notifies.pop(0)
+            task = asyncio.create_task(self._on_message(json.loads(notify.payload)))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _reconnect(self) -> None:
+        """LISTEN again, backing off exponentially between failed attempts
+
+        Requests published while disconnected are lost; their rows stay
+        PENDING and the dispatcher of the worker holding the socket sends them.
+        """
+        delay = self.reconnect_delay
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                logger.info(f"Reconnected to delivery channel {self.channel}")
+                return
+            except psycopg2.OperationalError as e:
+                delay = min(delay * 2, self.max_reconnect_delay)
+                logger.warning(
+                    f"Reconnecting to channel {self.channel} failed, "
+                    f"retrying in {delay}s: {str(e)}"
+                )
+
+
+def create_transport(name: str) -> DeliveryTransport:
+    """Build the transport selected by settings.WS_TRANSPORT"""
+    if name == "postgres":
+        return PostgresTransport(
+            engine.url.set(drivername="postgresql").render_as_string(
+                hide_password=False
+            )
+        )
+    if name == "memory":
+        return InMemoryTransport()
+    raise ValueError(f"Unknown WebSocket transport: {name}")
+
 
 class ConnectionManager:
-    def __init__(self, ping_interval: int = 30, cleanup_interval: int = 60):
-        self.active_connections: Dict[int, WebSocketConnection] = {}
+    def __init__(
+        self,
+        ping_interval: int = 30,
+        cleanup_interval: int = 60,
+        transport: Optional[DeliveryTransport] = None,
+        shard_count: int = settings.WS_REGISTRY_SHARDS,
+        sweep_concurrency: int = settings.WS_SWEEP_CONCURRENCY,
+        max_devices_per_user: int = settings.WS_MAX_DEVICES_PER_USER,
+    ):
+        self.active_connections = ShardedConnectionRegistry(shard_count)
+        self.max_devices_per_user = max_devices_per_user
         self.ping_interval = ping_interval
         self.cleanup_interval = cleanup_interval
-        self._cleanup_task: Optional[asyncio.Task] = None
-        self._ping_task: Optional[asyncio.Task] = None
+        self.sweep_concurrency = sweep_concurrency
+        self._sweep_tasks: List[asyncio.Task] = []
         self._notification_handlers: Set[callable] = set()
+        # Identifies this worker on the transport so it ignores its own requests
+        self.worker_id = uuid4().hex
+        self.transport = transport
 
     async def start(self) -> None:
         """Start background tasks"""
-        self._cleanup_task = asyncio.create_task(self._cleanup_inactive_connections())
-        self._ping_task = asyncio.create_task(self._ping_active_connections())
+        # One cleanup and one ping task per shard, staggered across the interval
+        shards = self.active_connections.shards
+        for index, shard in enumerate(shards):
+            offset = index / len(shards)
+            self._sweep_tasks += [
+                asyncio.create_task(
+                    self._cleanup_inactive_connections(
+                        shard, offset * self.cleanup_interval
+                    )
+                ),
+                asyncio.create_task(
+                    self._ping_active_connections(shard, offset * self.ping_interval)
+                ),
+            ]
+        if self.transport:
+            await self.transport.start(self._handle_transport_message)
         logger.info("Connection manager started")
 
     async def stop(self) -> None:
         """Stop background tasks and cleanup connections"""
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-        if self._ping_task:
-            self._ping_task.cancel()
+        for task in self._sweep_tasks:
+            task.cancel()
+        self._sweep_tasks = []
+        if self.transport:
+            await self.transport.stop()
 
         # Disconnect all clients
         for user_id in list(self.active_connections.keys()):
@@ -41,22 +312,36 @@ class ConnectionManager:
 
         logger.info("Connection manager stopped")
 
-    async def connect(self, user: User, websocket: WebSocket) -> bool:
-        """Establish new WebSocket connection"""
+    async def connect(
+        self, user: User, websocket: WebSocket, device_id: str = DEFAULT_DEVICE_ID
+    ) -> bool:
+        """Establish new WebSocket connection for one of the user's devices"""
         user_id = user.id
+        connection = None
         try:
-            # Disconnect existing connection if any
-            if user_id in self.active_connections:
-                await self.disconnect(user_id)
-
-            connection = WebSocketConnection(websocket, user)
+            connection = WebSocketConnection(websocket, user, device_id=device_id)
             connection.add_connected_handler(self._handle_client_connected)
             connection.add_disconnected_handler(self._handle_client_disconnected)
+            connection.add_ack_handler(self._handle_client_ack)
+            connection.add_delivered_handler(self._handle_delivered)
 
             connection.state = ConnectionState.CONNECTED
-            self.active_connections[user_id] = connection
+            # Other devices stay connected; only a stale socket of this device is replaced
+            replaced = self.active_connections.add(user_id, device_id, connection)
+            if replaced is not None:
+                await replaced.disconnect()
+            # Bound the sockets one user can hold open
+            for evicted_id, evicted in self.active_connections.evict_oldest(
+                user_id, self.max_devices_per_user
+            ):
+                logger.warning(
+                    f"Too many devices for user {user_id}, closing {evicted_id}"
+                )
+                await evicted.disconnect(code=1008)  # 1008 = Policy violation
 
-            logger.info(f"New connection established for user {user_id}")
+            logger.info(
+                f"New connection established for user {user_id} device {device_id}"
+            )
             return True
 
         except Exception as e:
@@ -66,32 +351,117 @@ class ConnectionManager:
                     await websocket.close(code=1011)
             except Exception:
                 pass
-            if user_id in self.active_connections:
-                self.active_connections.pop(user_id, None)
+            if connection is not None:
+                self.active_connections.discard(user_id, device_id, connection)
             return False
 
-    async def disconnect(self, user_id: int) -> None:
-        """Disconnect and cleanup WebSocket connection"""
-        if user_id in self.active_connections:
+    async def disconnect(
+        self,
+        user_id: int,
+        device_id: Optional[str] = None,
+        websocket: Optional[WebSocket] = None,
+    ) -> None:
+        """Disconnect one device, or all of the user's devices when none is given
+
+        When `websocket` is given the device is only disconnected if it is
+        still served by that socket, so a closing socket never drops the
+        connection that replaced it.
+        """
+        devices = self.active_connections.get(user_id)
+        if not devices:
+            return
+
+        for current_id in [device_id] if device_id else list(devices):
+            connection = devices.get(current_id)
+            if connection is None or (
+                websocket is not None and connection.websocket is not websocket
+            ):
+                continue
             try:
-                connection = self.active_connections[user_id]
                 await connection.disconnect()
-                logger.info(f"Connection closed for user {user_id}")
+                logger.info(f"Connection closed for user {user_id} device {current_id}")
             except Exception as e:
                 logger.error(f"Error disconnecting user {user_id}: {str(e)}")
             finally:
-                self.active_connections.pop(user_id, None)
+                self.active_connections.discard(user_id, current_id, connection)
 
     async def send_notification(
         self, user_id: int, notification: Dict[str, Any]
     ) -> bool:
-        """Send notification to specific user"""
+        """Send notification to specific user
+
+        True means a local device queued it. Rows are marked SENT once a
+        connection's writer has put them on the socket, not here.
+        """
+        if self.transport:
+            # Other devices of the user may be connected to other workers
+            await self.transport.publish(
+                {
+                    "worker_id": self.worker_id,
+                    "user_id": user_id,
+                    "notification": notification,
+                }
+            )
+
         if user_id not in self.active_connections:
-            logger.warning(f"No active connection for user {user_id}")
+            if not self.transport:
+                logger.warning(f"No active connection for user {user_id}")
             return False
 
+        return await self._send_local(user_id, notification)
+
+    async def send_to_recipients(
+        self, notification: Dict[str, Any], recipients: List[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        """Send one notification to many users as (user_id, notification_id) pairs
+
+        Users connected to this worker are sent to directly, and every
+        recipient is relayed to the other workers in a single transport
+        message, since a user's devices may be spread across workers.
+        Returns the pairs this worker queued.
+        """
+        if recipients and self.transport:
+            await self.transport.publish(
+                {
+                    "worker_id": self.worker_id,
+                    "notification": notification,
+                    "recipients": recipients,
+                }
+            )
+
+        local = [
+            recipient
+            for recipient in recipients
+            if recipient[0] in self.active_connections
+        ]
+
+        results = await asyncio.gather(
+            *(
+                self._send_local(user_id, {**notification, "id": notification_id})
+                for user_id, notification_id in local
+            ),
+            return_exceptions=True,
+        )
+        return [recipient for recipient, sent in zip(local, results) if sent is True]
+
+    async def _send_local(self, user_id: int, notification: Dict[str, Any]) -> bool:
+        """Send notification to every device of the user held by this worker"""
+        connections = list(self.active_connections.get(user_id, {}).values())
+        results = await asyncio.gather(
+            *(
+                self._send_to_device(user_id, connection, notification)
+                for connection in connections
+            )
+        )
+        return any(results)
+
+    async def _send_to_device(
+        self,
+        user_id: int,
+        connection: WebSocketConnection,
+        notification: Dict[str, Any],
+    ) -> bool:
         try:
-            connection = self.active_connections[user_id]
             sent = await connection.send_notification(notification)
 
             if not sent and connection.state != ConnectionState.CONNECTED:
@@ -103,56 +473,213 @@ class ConnectionManager:
 
         except Exception as e:
             logger.error(f"Failed to send notification to user {user_id}: {str(e)}")
-            await self.handle_connection_error(user_id, e)
+            await self.handle_connection_error(user_id, e, connection.device_id)
             return False
 
+    async def replay_missed(
+        self,
+        db: Session,
+        user_id: int,
+        device_id: str,
+        last_seq: Optional[int] = None,
+        page_size: int = settings.WS_REPLAY_PAGE_SIZE,
+        drain_timeout: float = settings.WS_REPLAY_DRAIN_TIMEOUT_SECONDS,
+    ) -> int:
+        """Send a device the notifications it missed, one page at a time
+
+        With `last_seq` everything after the client's cursor is replayed;
+        without one only PENDING notifications are. Each page waits, at most
+        `drain_timeout` seconds, for the socket to flush so a long gap never
+        overflows the send queue. Like live sends, replayed rows are marked
+        SENT by the connection's writer as they go out, so the dispatcher
+        does not send them again.
+        """
+        connection = self.active_connections.get(user_id, {}).get(device_id)
+        if connection is None:
+            return 0
+
+        page_size = min(page_size, connection.send_queue_size)
+        after_seq, replayed = last_seq or 0, 0
+        while connection.state == ConnectionState.CONNECTED:
+            page = await NotificationService.get_notifications_after(
+                db, user_id, after_seq, page_size, pending_only=last_seq is None
+            )
+            for notification in page:
+                # Disconnected mid-page; the rest waits for the next replay
+                if connection.state != ConnectionState.CONNECTED:
+                    return replayed
+                await connection.send_notification(notification.to_dict())
+                replayed += 1
+            if len(page) < page_size:
+                break
+            after_seq = page[-1].id
+            # A client that stopped reading is left to the cleanup sweep
+            if not await connection.drain(drain_timeout):
+                logger.warning(
+                    f"Replay to user {user_id} device {device_id} stalled, stopping"
+                )
+                break
+
+        return replayed
+
+    async def _handle_client_ack(
+        self, user_id: int, notification_ids: List[int]
+    ) -> None:
+        """Buffer a client ack; delivered state is written back in batches"""
+        await ack_aggregator.record(
+            (user_id, notification_id) for notification_id in notification_ids
+        )
+
+    async def _handle_delivered(self, user_id: int, notification_id: int) -> None:
+        """Record a notification the connection's writer has put on the socket"""
+        await ack_aggregator.record([(user_id, notification_id)])
+
+    async def _handle_transport_message(self, message: Dict[str, Any]) -> None:
+        """Deliver a request published by another worker to local sockets"""
+        if message.get("worker_id") == self.worker_id:
+            return
+
+        notification = message.get("notification")
+        if notification is None:
+            deliveries = self._load_referenced(message)
+        else:
+            # Fan-out requests share one notification across many recipients
+            deliveries = [
+                (user_id, {**notification, "id": notification_id})
+                for user_id, notification_id in message.get("recipients", [])
+            ] or [(message.get("user_id"), notification)]
+
+        for user_id, payload in deliveries:
+            if user_id in self.active_connections:
+                await self._send_local(user_id, payload)
+
+    def _load_referenced(
+        self, message: Dict[str, Any]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Load the rows of an id-only request for the users connected here"""
+        recipients = message.get("recipients") or [
+            (message.get("user_id"), message.get("notification_id"))
+        ]
+        notification_ids = [
+            notification_id
+            for user_id, notification_id in recipients
+            if user_id in self.active_connections
+        ]
+        if not notification_ids:
+            return []
+
+        db = SessionLocal()
+        try:
+            notifications = (
+                db.query(Notification)
+                .filter(Notification.id.in_(notification_ids))
+                .order_by(Notification.id)
+                .all()
+            )
+            return [
+                (notification.user_id, notification.to_dict())
+                for notification in notifications
+            ]
+        finally:
+            db.close()
+
     async def broadcast(
         self, message: Dict[str, Any], exclude: Set[int] = None
     ) -> None:
         """Broadcast message to all connected users except excluded ones"""
         exclude = exclude or set()
-        for user_id in list(self.active_connections.keys()):
-            if user_id not in exclude:
-                await self.send_notification(user_id, message)
-
-    async def handle_message(self, user_id: int, message: str) -> None:
-        """Handle incoming messages from clients"""
-        if user_id not in self.active_connections:
-            logger.warning(f"No active connection for user {user_id}")
+        # Serialized once and shared by every recipient
+        encoded = WSMessage(type=WSMessageType.NOTIFICATION, payload=message).encode()
+        await self._gather_bounded(
+            connection.send_encoded(encoded)
+            for user_id, _, connection in self.active_connections.iter_connections()
+            if user_id not in exclude
+        )
+
+    async def _gather_bounded(self, coroutines: Iterable[Awaitable]) -> None:
+        """Await coroutines concurrently, at most sweep_concurrency at a time"""
+        semaphore = asyncio.Semaphore(self.sweep_concurrency)
+
+        async def run(coroutine: Awaitable) -> None:
+            async with semaphore:
+                await coroutine
+
+        await asyncio.gather(
+            *(run(coroutine) for coroutine in coroutines), return_exceptions=True
+        )
+
+    async def handle_message(
+        self, user_id: int, message: str, device_id: str = DEFAULT_DEVICE_ID
+    ) -> None:
+        """Handle incoming messages from one of the user's devices"""
+        connection = self.active_connections.get(user_id, {}).get(device_id)
+        if connection is None:
+            logger.warning(
+                f"No active connection for user {user_id} device {device_id}"
+            )
             return
 
         try:
-            connection = self.active_connections[user_id]
             await connection.handle_message(message)
         except Exception as e:
             logger.error(f"Error handling message from user {user_id}: {str(e)}")
-            await self.handle_connection_error(user_id, e)
+            await self.handle_connection_error(user_id, e, device_id)
 
-    async def handle_connection_error(self, user_id: int, error: Exception) -> None:
-        """Handle connection errors"""
+    async def handle_connection_error(
+        self, user_id: int, error: Exception, device_id: Optional[str] = None
+    ) -> None:
+        """Handle connection errors of one device, or all when none is given"""
         logger.error(f"Connection error for user {user_id}: {str(error)}")
-        if user_id in self.active_connections:
-            connection = self.active_connections[user_id]
-            if connection.state == ConnectionState.CONNECTED:
-                await self.disconnect(user_id)
+        devices = self.active_connections.get(user_id, {})
+        for current_id in [device_id] if device_id else list(devices):
+            connection = devices.get(current_id)
+            if connection and connection.state == ConnectionState.CONNECTED:
+                await self.disconnect(user_id, current_id)
 
     def get_connection_status(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """Get connection status for a user"""
+        """Get connection status for each of the user's devices"""
         if user_id in self.active_connections:
-            return self.active_connections[user_id].get_connection_info()
+            return {
+                device_id: connection.get_connection_info()
+                for device_id, connection in self.active_connections[user_id].items()
+            }
         return None
 
-    async def _cleanup_inactive_connections(self) -> None:
-        """Periodically cleanup inactive connections"""
+    async def _cleanup_shard(self, shard: Dict[int, DeviceConnections]) -> None:
+        """Disconnect inactive connections of one shard"""
+        inactive = [
+            (user_id, device_id, connection)
+            for user_id, device_id, connection in (
+                self.active_connections.iter_connections(shard)
+            )
+            if not connection.is_alive()
+        ]
+        for user_id, device_id, _ in inactive:
+            logger.warning(
+                f"Cleaning up inactive connection for user {user_id} device {device_id}"
+            )
+        await self._gather_bounded(
+            self.disconnect(user_id, device_id, connection.websocket)
+            for user_id, device_id, connection in inactive
+        )
+
+    async def _ping_shard(self, shard: Dict[int, DeviceConnections]) -> None:
+        """Ping connected clients of one shard"""
+        encoded = WSMessage(type=WSMessageType.PING).encode()
+        await self._gather_bounded(
+            connection.send_ping(encoded)
+            for _, _, connection in self.active_connections.iter_connections(shard)
+            if connection.state == ConnectionState.CONNECTED
+        )
+
+    async def _cleanup_inactive_connections(
+        self, shard: Dict[int, DeviceConnections], delay: float = 0
+    ) -> None:
+        """Periodically cleanup inactive connections of one shard"""
+        await asyncio.sleep(delay)
         while True:
             try:
-                for user_id, connection in list(self.active_connections.items()):
-                    if not connection.is_alive():
-                        logger.warning(
-                            f"Cleaning up inactive connection for user {user_id}"
-                        )
-                        await self.disconnect(user_id)
-
+                await self._cleanup_shard(shard)
                 await asyncio.sleep(self.cleanup_interval)
             except asyncio.CancelledError:
                 break
@@ -160,14 +687,14 @@ class ConnectionManager:
                 logger.error(f"Error in cleanup task: {str(e)}")
                 await asyncio.sleep(self.cleanup_interval)
 
-    async def _ping_active_connections(self) -> None:
-        """Periodically ping active connections"""
+    async def _ping_active_connections(
+        self, shard: Dict[int, DeviceConnections], delay: float = 0
+    ) -> None:
+        """Periodically ping active connections of one shard"""
+        await asyncio.sleep(delay)
         while True:
             try:
-                for user_id, connection in list(self.active_connections.items()):
-                    if connection.state == ConnectionState.CONNECTED:
-                        await connection.send_ping()
-
+                await self._ping_shard(shard)
                 await asyncio.sleep(self.ping_interval)
             except asyncio.CancelledError:
                 break
@@ -203,25 +730,25 @@ class ConnectionManager:
 
     def get_active_connections_count(self) -> int:
         """Get count of active connections"""
-        return len(self.active_connections)
+        return self.active_connections.connection_count()
 
     def get_connection_stats(self) -> Dict[str, Any]:
         """Get connection statistics"""
+        connections = [
+            conn for _, _, conn in self.active_connections.iter_connections()
+        ]
         return {
-            "total_connections": len(self.active_connections),
-            "active_connections": sum(
-                1 for conn in self.active_connections.values() if conn.is_alive()
-            ),
+            "total_connections": len(connections),
+            "connected_users": len(self.active_connections),
+            "active_connections": sum(1 for conn in connections if conn.is_alive()),
             "connections_by_state": {
-                state.value: sum(
-                    1
-                    for conn in self.active_connections.values()
-                    if conn.state == state
-                )
+                state.value: sum(1 for conn in connections if conn.state == state)
                 for state in ConnectionState
             },
         }
 
 
 # Global instance
-notification_manager = ConnectionManager()
+notification_manager = ConnectionManager(
+    transport=create_transport(settings.WS_TRANSPORT)
+)
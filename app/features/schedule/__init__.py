@@ -1,12 +1,16 @@
 from .admin_router import router as admin_router
 from .bulk_service import BulkScheduleService
+from .materializer import RecurrenceMaterializer, recurrence_materializer
 from .router import router
 from .schemas import (
     BulkScheduleCreate,
     RepeatingPattern,
     RepeatingScheduleCreate,
     ScheduleBase,
+    ScheduleConflict,
     ScheduleCreate,
+    ScheduleExportFormat,
+    ScheduleList,
     ScheduleResponse,
     ScheduleSearchParams,
     ScheduleUpdate,
@@ -20,11 +24,16 @@ __all__ = [
     "RepeatingPattern",
     "RepeatingScheduleCreate",
     "ScheduleBase",
+    "ScheduleConflict",
     "ScheduleCreate",
     "ScheduleResponse",
+    "ScheduleList",
     "ScheduleUpdate",
     "ScheduleSearchParams",
+    "ScheduleExportFormat",
     "ScheduleService",
     "BulkScheduleService",
+    "RecurrenceMaterializer",
+    "recurrence_materializer",
     "RepeatPattern",
 ]
@@ -1,15 +1,20 @@
-from typing import List
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.pagination import MAX_PAGE_LIMIT
 from app.core.security import get_current_admin_user
 from app.models.user import User
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from .bulk_service import BulkScheduleService
 from .schemas import (
     BulkScheduleCreate,
+    ScheduleConflict,
     ScheduleCreate,
+    ScheduleExportFormat,
+    ScheduleList,
     ScheduleResponse,
     ScheduleSearchParams,
     ScheduleUpdate,
@@ -19,14 +24,51 @@ from .service import ScheduleService
 router = APIRouter(tags=["Admin"])
 
 
-@router.get("/", response_model=List[ScheduleResponse])
+@router.get("/", response_model=ScheduleList)
 async def get_all_schedules(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     search_params: ScheduleSearchParams = Depends(),
     admin: User = Depends(get_current_admin_user),
 ):
-    """Get all schedules with optional filtering"""
-    return ScheduleService.get_all_schedules(db, search_params.model_dump(), admin.id)
+    """Get a page of schedules with optional filtering"""
+    return ScheduleService.get_all_schedules(
+        db, search_params.model_dump(), admin.id, limit, cursor
+    )
+
+
+@router.get("/export")
+async def export_schedules(
+    export_format: ScheduleExportFormat = Query(
+        ScheduleExportFormat.NDJSON, alias="format"
+    ),
+    search_params: ScheduleSearchParams = Depends(),
+    admin: User = Depends(get_current_admin_user),
+):
+    """Stream schedules as NDJSON or CSV for payroll export"""
+    filters = search_params.model_dump()
+
+    def stream():
+        # The request-scoped session is closed before the body is streamed
+        db = next(get_db())
+        try:
+            yield from ScheduleService.iter_schedule_export(db, filters, export_format)
+        finally:
+            db.close()
+
+    media_type = (
+        "text/csv"
+        if export_format == ScheduleExportFormat.CSV
+        else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="schedules.{export_format.value}"'
+        },
+    )
 
 
 @router.post("/", response_model=ScheduleResponse)
@@ -51,20 +93,32 @@ async def create_bulk_schedules(
     )
 
 
+@router.post("/bulk/conflicts", response_model=List[ScheduleConflict])
+async def check_bulk_schedule_conflicts(
+    schedules_data: BulkScheduleCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin_user),
+):
+    """Report every row of a bulk request that would be rejected, and why"""
+    return BulkScheduleService.get_schedule_conflicts(
+        db, [schedule.model_dump() for schedule in schedules_data.schedules]
+    )
+
+
 @router.put("/{schedule_id}", response_model=ScheduleResponse)
 async def update_schedule(
     schedule_id: int, schedule_update: ScheduleUpdate, db: Session = Depends(get_db)
 ):
     """Update schedule details"""
-    return ScheduleService.update_schedule(
-        db, schedule_id, schedule_update.model_dump()
+    return await ScheduleService.update_schedule(
+        db, schedule_id, schedule_update.model_dump(exclude_unset=True)
     )
 
 
 @router.delete("/{schedule_id}")
 async def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
     """Delete a schedule"""
-    return ScheduleService.delete_schedule(db, schedule_id)
+    return await ScheduleService.delete_schedule(db, schedule_id)
 
 
 @router.patch("/{schedule_id}/status")
@@ -72,4 +126,4 @@ async def update_schedule_status(
     schedule_id: int, status: str, db: Session = Depends(get_db)
 ):
     """Update schedule status"""
-    return ScheduleService.update_schedule_status(db, schedule_id, status)
+    return await ScheduleService.update_schedule_status(db, schedule_id, status)
@@ -17,7 +17,7 @@ async def create_bulk_schedules(
 ):
     """Create multiple schedules at once"""
     return await BulkScheduleService.create_bulk_schedules(
-        db, schedules.schedules, current_user.id
+        db, [schedule.model_dump() for schedule in schedules.schedules], current_user.id
     )
 
 
@@ -29,5 +29,8 @@ async def create_repeating_schedule(
 ):
     """Create Repeating schedule"""
     return await BulkScheduleService.create_repeating_schedules(
-        db, schedule.base_schedule, schedule.pattern, current_user.id
+        db,
+        schedule.base_schedule.model_dump(),
+        schedule.pattern.model_dump(),
+        current_user.id,
     )
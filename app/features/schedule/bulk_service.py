@@ -1,28 +1,48 @@
-from datetime import datetime, timedelta
-from typing import List, Optional, Union
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
 
+from app.core.config import settings
 from app.core.events import Event, event_bus
+from app.features.notifications.counters import record_created
 from app.features.notifications.events.types import NotificationEventType
 from app.models.notification import Notification, NotificationPriority, NotificationType
 from app.models.schedule import Schedule
 from app.models.schedule_enums import ScheduleStatus
+from app.models.schedule_intervals import ScheduleIntervalIndex, has_schedule_conflict
 from app.models.user import User
 from fastapi import HTTPException, status
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    and_,
+    column,
+    insert,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.orm import Session
 
+from .conflicts import schedule_write_error
+from .recurrence import RecurrenceRule
+
+logger = logging.getLogger(__name__)
+
 
 class BulkScheduleService:
     @staticmethod
-    def _format_schedule(schedule: Schedule) -> dict:
+    def _format_schedule(schedule: Schedule, user: Optional[User] = None) -> dict:
         """Format schedule for API response"""
+        user = user or schedule.user
         return {
             "id": schedule.id,
             "user_id": schedule.user_id,
             "user": {
-                "id": schedule.user.id,
-                "name": schedule.user.full_name,
-                "position": schedule.user.position,
-                "department": schedule.user.department,
+                "id": user.id,
+                "name": user.full_name,
+                "position": user.position,
+                "department": user.department,
             },
             "start_time": schedule.start_time.isoformat(),
             "end_time": schedule.end_time.isoformat(),
@@ -38,140 +58,453 @@ class BulkScheduleService:
             ),
         }
 
+    @staticmethod
+    def _to_datetime(value: Union[str, datetime]) -> datetime:
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+    @staticmethod
+    def get_schedule_conflicts(db: Session, schedules: List[dict]) -> List[dict]:
+        """Build a per-row conflict report for a batch of proposed schedules"""
+        rows = [
+            (
+                index,
+                schedule["user_id"],
+                BulkScheduleService._to_datetime(schedule["start_time"]),
+                BulkScheduleService._to_datetime(schedule["end_time"]),
+            )
+            for index, schedule in enumerate(schedules)
+        ]
+
+        # Check every referenced user in one query
+        user_ids = {row[1] for row in rows}
+        existing_user_ids = {
+            user_id for (user_id,) in db.query(User.id).filter(User.id.in_(user_ids))
+        }
+
+        report = [
+            {"index": index, "user_id": user_id, "reason": "user_not_found"}
+            for index, user_id, _, _ in rows
+            if user_id not in existing_user_ids
+        ]
+        candidates = [row for row in rows if row[1] in existing_user_ids]
+        if not candidates:
+            return report
+
+        # Check all proposed intervals against stored schedules in one query
+        proposed = values(
+            column("index", Integer),
+            column("user_id", Integer),
+            column("start_time", DateTime(timezone=True)),
+            column("end_time", DateTime(timezone=True)),
+            name="proposed",
+        ).data(candidates)
+
+        overlaps = db.execute(
+            select(proposed.c.index, proposed.c.user_id, Schedule.id)
+            .select_from(proposed)
+            .join(
+                Schedule,
+                and_(
+                    Schedule.user_id == proposed.c.user_id,
+                    Schedule.status != ScheduleStatus.CANCELLED,
+                    Schedule.start_time < proposed.c.end_time,
+                    Schedule.end_time > proposed.c.start_time,
+                ),
+            )
+            .order_by(proposed.c.index, Schedule.start_time)
+        ).all()
+
+        report.extend(
+            {
+                "index": index,
+                "user_id": user_id,
+                "reason": "existing_schedule",
+                "schedule_id": schedule_id,
+            }
+            for index, user_id, schedule_id in overlaps
+        )
+
+        # Check proposed intervals against each other
+        latest_by_user = {}
+        for index, user_id, start, end in sorted(
+            candidates, key=lambda row: (row[1], row[2])
+        ):
+            latest = latest_by_user.get(user_id)
+            if latest and start < latest[1]:
+                report.append(
+                    {
+                        "index": index,
+                        "user_id": user_id,
+                        "reason": "batch_overlap",
+                        "conflicts_with": latest[0],
+                    }
+                )
+            if not latest or end > latest[1]:
+                latest_by_user[user_id] = (index, end)
+
+        return sorted(report, key=lambda entry: entry["index"])
+
     @staticmethod
     async def validate_schedules(db: Session, schedules: List[dict]) -> bool:
         """Validate bulk schedule creation request"""
-        for schedule in schedules:
-            # Check if user exist
-            user = db.query(User).filter(User.id == schedule["user_id"]).first()
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"User {schedule['user_id']} not found",
-                )
+        report = BulkScheduleService.get_schedule_conflicts(db, schedules)
+        if not report:
+            return True
 
-            # Check schedule conflicts
-            if await BulkScheduleService._check_schedule_conflict(
-                db, schedule["user_id"], schedule["start_time"], schedule["end_time"]
-            ):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Schedule conflict found for user {schedule['user_id']}",
-                )
+        messages = []
+        missing_users = sorted(
+            {
+                entry["user_id"]
+                for entry in report
+                if entry["reason"] == "user_not_found"
+            }
+        )
+        if missing_users:
+            messages.append(f"User {', '.join(map(str, missing_users))} not found")
 
-        return True
+        conflicting_users = sorted(
+            {
+                entry["user_id"]
+                for entry in report
+                if entry["reason"] != "user_not_found"
+            }
+        )
+        if conflicting_users:
+            messages.append(
+                f"Schedule conflict found for user {', '.join(map(str, conflicting_users))}"
+            )
+
+        # The per-row report is served by the bulk conflicts endpoint
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="; ".join(messages)
+        )
 
     @staticmethod
-    async def create_bulk_schedules(
+    def _insert_schedules(
         db: Session, schedules: List[dict], created_by: int
     ) -> List[Schedule]:
-        """Create multiple schedules at once"""
-        # Validate schedules first
-        await BulkScheduleService.validate_schedules(db, schedules)
-
-        created_schedules = []
-        try:
-            for schedule_data in schedules:
-                schedule = Schedule(
+        """Insert schedules with one multi-row INSERT ... RETURNING"""
+        return db.scalars(
+            insert(Schedule).returning(Schedule, sort_by_parameter_order=True),
+            [
+                {
                     **schedule_data,
-                    created_by=created_by,
-                    status=ScheduleStatus.CONFIRMED,
-                )
-                db.add(schedule)
-                created_schedules.append(schedule)
+                    "created_by": created_by,
+                    "status": ScheduleStatus.CONFIRMED,
+                }
+                for schedule_data in schedules
+            ],
+        ).all()
 
-            db.commit()
-            for schedule in created_schedules:
-                db.refresh(schedule)
-
-                formatted_schedule = BulkScheduleService._format_schedule(schedule)
-                notification = Notification(
-                    user_id=schedule.user_id,
-                    type=NotificationType.SCHEDULE_CHANGE,
-                    title="New Schedule Assignment",
-                    message=f"New schedule assigned for {schedule.start_time.strftime('%Y-%m-%d')}",
-                    priority=NotificationPriority.NORMAL,
-                    data=formatted_schedule,
-                )
+    @staticmethod
+    def _insert_schedule_notifications(
+        db: Session, formatted_schedules: List[dict]
+    ) -> List[Notification]:
+        """Insert one assignment notification per schedule in a single statement"""
+        record_created(
+            db,
+            NotificationType.SCHEDULE_CHANGE,
+            [schedule["user_id"] for schedule in formatted_schedules],
+        )
+        return db.scalars(
+            insert(Notification).returning(Notification, sort_by_parameter_order=True),
+            [
+                {
+                    "user_id": schedule["user_id"],
+                    "type": NotificationType.SCHEDULE_CHANGE,
+                    "title": "New Schedule Assignment",
+                    "message": f"New schedule assigned for {schedule['start_time'][:10]}",
+                    "priority": NotificationPriority.NORMAL,
+                    "data": schedule,
+                }
+                for schedule in formatted_schedules
+            ],
+        ).all()
 
-            db.add(notification)
-            db.commit()
+    @staticmethod
+    async def _publish_schedule_updates(
+        formatted_schedules: List[dict], notifications: List[dict]
+    ) -> None:
+        """Publish one batched SCHEDULE_UPDATED event per affected user"""
+        updates_by_user: Dict[int, dict] = {}
+        for schedule, notification in zip(formatted_schedules, notifications):
+            update = updates_by_user.setdefault(
+                schedule["user_id"], {"schedules": [], "notifications": []}
+            )
+            update["schedules"].append(schedule)
+            update["notifications"].append(notification)
 
-            # Event for real-time notification
+        for user_id, update in updates_by_user.items():
             await event_bus.publish(
                 Event(
                     type=NotificationEventType.SCHEDULE_UPDATED,
-                    data={"schedule": formatted_schedule, "notification": notification},
+                    data={"user_id": user_id, **update},
                 )
             )
 
-            return [
-                BulkScheduleService._format_schedule(schedule)
+    @staticmethod
+    async def _write_schedules(
+        db: Session,
+        schedules: List[dict],
+        created_by: int,
+        link_series: bool = False,
+        materialized_until: Optional[datetime] = None,
+    ) -> List[dict]:
+        """Insert validated schedules with their notifications and publish events
+
+        `materialized_until` is stored on the series parent in the same
+        transaction, so the series is never extended past rows it lacks.
+        """
+        try:
+            # Loaded once up front so formatting needs no per-schedule lazy loads
+            users = {
+                user.id: user
+                for user in db.query(User).filter(
+                    User.id.in_({schedule["user_id"] for schedule in schedules})
+                )
+            }
+
+            created_schedules = BulkScheduleService._insert_schedules(
+                db, schedules, created_by
+            )
+
+            # The first occurrence of a new series becomes its parent
+            if link_series and len(created_schedules) > 1:
+                db.execute(
+                    update(Schedule)
+                    .where(Schedule.id.in_([s.id for s in created_schedules[1:]]))
+                    .values(parent_schedule_id=created_schedules[0].id)
+                )
+            if materialized_until is not None:
+                parent_id = (
+                    created_schedules[0].id
+                    if link_series
+                    else schedules[0]["parent_schedule_id"]
+                )
+                BulkScheduleService._set_materialized_until(
+                    db, parent_id, materialized_until
+                )
+
+            formatted_schedules = [
+                BulkScheduleService._format_schedule(schedule, users[schedule.user_id])
                 for schedule in created_schedules
             ]
 
+            notifications = [
+                notification.to_dict()
+                for notification in BulkScheduleService._insert_schedule_notifications(
+                    db, formatted_schedules
+                )
+            ]
+
+            db.commit()
+
         except Exception as e:
             db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-            )
+            raise schedule_write_error(e)
+
+        # Event for real-time notification
+        await BulkScheduleService._publish_schedule_updates(
+            formatted_schedules, notifications
+        )
+
+        return formatted_schedules
+
+    @staticmethod
+    async def create_bulk_schedules(
+        db: Session, schedules: List[dict], created_by: int
+    ) -> List[Schedule]:
+        """Create multiple schedules at once"""
+        # Validate schedules first
+        await BulkScheduleService.validate_schedules(db, schedules)
+
+        return await BulkScheduleService._write_schedules(db, schedules, created_by)
+
+    @staticmethod
+    def _set_materialized_until(
+        db: Session, parent_id: int, materialized_until: datetime
+    ) -> None:
+        db.execute(
+            update(Schedule)
+            .where(Schedule.id == parent_id)
+            .values(materialized_until=materialized_until)
+        )
+
+    @staticmethod
+    def _horizon_end(first_start: datetime) -> datetime:
+        """End of the rolling window that repeating schedules are materialized for"""
+        now = datetime.now(first_start.tzinfo)
+        return max(first_start, now) + timedelta(
+            weeks=settings.SCHEDULE_RECURRENCE_HORIZON_WEEKS
+        )
+
+    @staticmethod
+    def _without_conflicts(
+        db: Session, user_id: int, occurrences: List[Tuple[datetime, datetime]]
+    ) -> List[Tuple[datetime, datetime]]:
+        """Drop occurrences that overlap stored schedules or each other"""
+        if not occurrences:
+            return []
+
+        index = ScheduleIntervalIndex.load(
+            db, [user_id], occurrences[0][0], occurrences[-1][1]
+        )
+
+        accepted = []
+        for start, end in occurrences:
+            if index.has_overlap(user_id, start, end):
+                continue
+            index.add(user_id, start, end)
+            accepted.append((start, end))
+
+        return accepted
 
     @staticmethod
     async def create_repeating_schedules(
         db: Session, base_schedule: dict, pattern: dict, created_by: int
     ) -> List[Schedule]:
         """Create repeating schedules"""
-        schedules = []
-        current_date = (
-            base_schedule["start_time"]
-            if isinstance(base_schedule["start_time"], datetime)
-            else datetime.fromisoformat(base_schedule["start_time"])
-        )
-        end_date = (
-            pattern["end_date"]
-            if isinstance(pattern["end_date"], datetime)
-            else datetime.fromisoformat(pattern["end_date"])
-        )
-
-        while current_date <= end_date:
-            if (
-                pattern["type"] == "weekly"
-                and str(current_date.weekday()) not in pattern["days"]
-            ):
-                current_date += timedelta(days=1)
-                continue
+        rule = RecurrenceRule.from_pattern(pattern)
+        first_start = BulkScheduleService._to_datetime(base_schedule["start_time"])
+        duration = (
+            timedelta(hours=int(base_schedule["duration"]))
+            if base_schedule.get("duration")
+            else BulkScheduleService._to_datetime(base_schedule["end_time"])
+            - first_start
+        )
+
+        # Only the rolling horizon is materialized; the rest stays in the rule
+        horizon_end = BulkScheduleService._horizon_end(first_start)
+        occurrences = list(
+            rule.iter_occurrences(first_start, duration, until=horizon_end)
+        )
+        occurrences = BulkScheduleService._without_conflicts(
+            db, base_schedule["user_id"], occurrences
+        )
+        if not occurrences:
+            return []
+
+        schedule_data = {
+            key: value
+            for key, value in base_schedule.items()
+            if key not in ("start_time", "end_time", "duration")
+        }
+        schedules = [
+            {
+                **schedule_data,
+                **rule.to_columns(),
+                "start_time": start,
+                "end_time": end,
+            }
+            for start, end in occurrences
+        ]
+
+        return await BulkScheduleService._write_schedules(
+            db,
+            schedules,
+            created_by,
+            link_series=True,
+            materialized_until=min(horizon_end, rule.until),
+        )
+
+    @staticmethod
+    async def extend_repeating_schedules(
+        db: Session, parent_schedule_id: int, created_by: int
+    ) -> List[Schedule]:
+        """Materialize the next occurrences of a series up to the rolling horizon
+
+        Progress is read from the parent's `materialized_until`, never from
+        the surviving rows, so deleted occurrences are not recreated.
+        """
+        parent = db.query(Schedule).filter(Schedule.id == parent_schedule_id).first()
+        if not parent or not parent.is_repeating:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Repeating schedule not found",
+            )
+        if (
+            parent.status == ScheduleStatus.CANCELLED
+            or parent.materialized_until is None
+        ):
+            return []
+
+        rule = RecurrenceRule.from_schedule(parent)
+        horizon_end = min(
+            BulkScheduleService._horizon_end(parent.start_time), rule.until
+        )
+        if parent.materialized_until >= horizon_end:
+            return []
 
-            schedule_data = {
-                **base_schedule,
-                "start_time": current_date.isoformat(),
-                "end_time": (
-                    current_date + timedelta(hours=int(base_schedule["duration"]))
-                ).isoformat(),
+        occurrences = list(
+            rule.iter_occurrences(
+                parent.start_time,
+                parent.end_time - parent.start_time,
+                after=parent.materialized_until,
+                until=horizon_end,
+            )
+        )
+        occurrences = BulkScheduleService._without_conflicts(
+            db, parent.user_id, occurrences
+        )
+        if not occurrences:
+            # Nothing to write in this window; move the marker past it anyway
+            BulkScheduleService._set_materialized_until(db, parent.id, horizon_end)
+            db.commit()
+            return []
+
+        schedules = [
+            {
+                "user_id": parent.user_id,
+                "shift_type": parent.shift_type,
+                "description": parent.description,
+                "parent_schedule_id": parent.id,
+                **rule.to_columns(),
+                "start_time": start,
+                "end_time": end,
             }
+            for start, end in occurrences
+        ]
+
+        return await BulkScheduleService._write_schedules(
+            db, schedules, created_by, materialized_until=horizon_end
+        )
+
+    @staticmethod
+    async def extend_due_series(db: Session) -> int:
+        """Extend every active series materialized only partway into the horizon
 
+        Returns the number of occurrences created. A series that fails to
+        extend is logged and retried on the next run.
+        """
+        horizon_end = datetime.now(timezone.utc) + timedelta(
+            weeks=settings.SCHEDULE_RECURRENCE_HORIZON_WEEKS
+        )
+        # Plain ids, since a failed extension rolls back and expires the parents
+        series = (
+            db.query(Schedule.id, Schedule.created_by)
+            .filter(
+                Schedule.is_repeating == True,
+                Schedule.parent_schedule_id.is_(None),
+                Schedule.status != ScheduleStatus.CANCELLED,
+                Schedule.materialized_until < horizon_end,
+                Schedule.materialized_until < Schedule.repeat_end_date,
+            )
+            .all()
+        )
+
+        created = 0
+        for parent_id, created_by in series:
             try:
-                if not await BulkScheduleService._check_schedule_conflict(
-                    db,
-                    base_schedule["user_id"],
-                    schedule_data["start_time"],
-                    schedule_data["end_time"],
-                ):
-                    schedules.append(schedule_data)
-            except Exception:
-                pass  # Skip conflicting schedules in repeating
-
-            if pattern["type"] == "daily":
-                current_date += timedelta(days=pattern["interval"])
-            elif pattern["type"] == "weekly":
-                current_date += timedelta(days=1)
-            elif pattern["type"] == "monthly":
-                current_date = current_date.replace(
-                    month=current_date.month + pattern["interval"]
+                created += len(
+                    await BulkScheduleService.extend_repeating_schedules(
+                        db, parent_id, created_by
+                    )
                 )
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to extend schedule series {parent_id}: {e}")
 
-        return await BulkScheduleService.create_bulk_schedules(
-            db, schedules, created_by
-        )
+        return created
 
     @staticmethod
     async def _check_schedule_conflict(
@@ -182,25 +515,7 @@ class BulkScheduleService:
         exclude_id: Optional[int] = None,
     ) -> bool:
         """Check for schedule conflicts"""
-        start = (
-            start_time
-            if isinstance(start_time, datetime)
-            else datetime.fromisoformat(start_time)
-        )
-        end = (
-            end_time
-            if isinstance(end_time, datetime)
-            else datetime.fromisoformat(end_time)
-        )
-
-        query = db.query(Schedule).filter(
-            Schedule.user_id == user_id,
-            Schedule.status != ScheduleStatus.CANCELLED,
-            Schedule.start_time < end,
-            Schedule.end_time > start,
-        )
-
-        if exclude_id:
-            query = query.filter(Schedule.id != exclude_id)
+        start = BulkScheduleService._to_datetime(start_time)
+        end = BulkScheduleService._to_datetime(end_time)
 
-        return query.first() is not None
+        return has_schedule_conflict(db, user_id, start, end, exclude_id)
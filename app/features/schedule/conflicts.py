@@ -0,0 +1,28 @@
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+
+# Exclusion constraint keeping a user's active schedules apart (see Schedule)
+SCHEDULE_OVERLAP_CONSTRAINT = "ex_schedules_user_id_time_range"
+EXCLUSION_VIOLATION = "23P01"
+
+
+def is_schedule_overlap(error: IntegrityError) -> bool:
+    """Whether a failed write was rejected by the schedule overlap constraint"""
+    orig = error.orig
+    return (
+        getattr(orig, "pgcode", None) == EXCLUSION_VIOLATION
+        and getattr(getattr(orig, "diag", None), "constraint_name", None)
+        == SCHEDULE_OVERLAP_CONSTRAINT
+    )
+
+
+def schedule_write_error(error: Exception) -> HTTPException:
+    """Map a failed schedule write to the HTTP error to raise"""
+    if isinstance(error, IntegrityError) and is_schedule_overlap(error):
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Schedule conflicts with existing schedule",
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error)
+    )
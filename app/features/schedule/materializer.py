@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+
+from .bulk_service import BulkScheduleService
+
+logger = logging.getLogger(__name__)
+
+
+class RecurrenceMaterializer:
+    """Background job keeping repeating schedules materialized up to the horizon
+
+    Series are only written a few weeks ahead when created, so this tops
+    them up as time moves on until their repeat end date is reached.
+    """
+
+    def __init__(
+        self, interval: float = settings.SCHEDULE_RECURRENCE_EXTEND_INTERVAL_SECONDS
+    ):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the materialization loop"""
+        self._task = asyncio.create_task(self._run())
+        logger.info("Recurrence materializer started")
+
+    async def stop(self) -> None:
+        """Stop the materialization loop"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        logger.info("Recurrence materializer stopped")
+
+    async def _run(self) -> None:
+        while True:
+            db = next(get_db())
+            try:
+                created = await BulkScheduleService.extend_due_series(db)
+                if created:
+                    logger.info(f"Materialized {created} repeating schedules")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Recurrence materialization failed: {str(e)}")
+            finally:
+                db.close()
+
+            await asyncio.sleep(self.interval)
+
+
+recurrence_materializer = RecurrenceMaterializer()
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from app.models.schedule import Schedule
+from app.models.schedule_enums import RepeatFrequency
+from dateutil.relativedelta import relativedelta
+
+
+@dataclass
+class RecurrenceRule:
+    """RRULE-style description of a repeating schedule"""
+
+    frequency: RepeatFrequency
+    interval: int
+    until: datetime
+    days: Optional[List[int]] = None  # Days of week (0-6) for weekly rules
+
+    @classmethod
+    def from_pattern(cls, pattern: dict) -> "RecurrenceRule":
+        """Build a rule from a RepeatingPattern payload"""
+        until = pattern["end_date"]
+        return cls(
+            frequency=RepeatFrequency(pattern["type"]),
+            interval=int(pattern.get("interval") or 1),
+            until=(
+                until if isinstance(until, datetime) else datetime.fromisoformat(until)
+            ),
+            days=[int(day) for day in pattern.get("days") or []] or None,
+        )
+
+    @classmethod
+    def from_schedule(cls, schedule: Schedule) -> "RecurrenceRule":
+        """Build a rule from the repeat columns of a stored schedule"""
+        return cls(
+            frequency=schedule.repeat_frequency,
+            interval=schedule.repeat_interval or 1,
+            until=schedule.repeat_end_date,
+            days=(
+                [int(day) for day in schedule.repeat_days.split(",")]
+                if schedule.repeat_days
+                else None
+            ),
+        )
+
+    def to_columns(self) -> dict:
+        """Repeat columns to store on each materialized occurrence"""
+        return {
+            "is_repeating": True,
+            "repeat_frequency": self.frequency,
+            "repeat_interval": self.interval,
+            "repeat_days": (
+                ",".join(str(day) for day in self.days) if self.days else None
+            ),
+            "repeat_end_date": self.until,
+        }
+
+    def _iter_starts(self, first_start: datetime) -> Iterator[datetime]:
+        if self.frequency == RepeatFrequency.DAILY:
+            step = 0
+            while True:
+                yield first_start + timedelta(days=step * self.interval)
+                step += 1
+
+        elif self.frequency == RepeatFrequency.WEEKLY:
+            days = sorted(set(self.days or [first_start.weekday()]))
+            week_start = first_start - timedelta(days=first_start.weekday())
+            while True:
+                for day in days:
+                    start = week_start + timedelta(days=day)
+                    if start >= first_start:
+                        yield start
+                week_start += timedelta(weeks=self.interval)
+
+        elif self.frequency == RepeatFrequency.MONTHLY:
+            # Offset from the first start so short months don't shift later dates
+            step = 0
+            while True:
+                yield first_start + relativedelta(months=step * self.interval)
+                step += 1
+
+        else:
+            raise ValueError(f"Unsupported repeat frequency: {self.frequency}")
+
+    def iter_occurrences(
+        self,
+        first_start: datetime,
+        duration: timedelta,
+        after: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[Tuple[datetime, datetime]]:
+        """Lazily yield (start, end) pairs, optionally only those after a cursor"""
+        limit = min(self.until, until) if until else self.until
+        for start in self._iter_starts(first_start):
+            if start > limit:
+                return
+            if after is not None and start <= after:
+                continue
+            yield start, start + duration
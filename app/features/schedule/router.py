@@ -1,23 +1,27 @@
-from typing import List
+from typing import Optional
 
 from app.core.database import get_db
+from app.core.pagination import MAX_PAGE_LIMIT
 from app.core.security import get_current_active_user
 from app.models.user import User
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from .schemas import ScheduleResponse
+from .schemas import ScheduleList, ScheduleResponse
 from .service import ScheduleService
 
 router = APIRouter(tags=["Employee"])
 
 
-@router.get("/my-schedules", response_model=List[ScheduleResponse])
+@router.get("/my-schedules", response_model=ScheduleList)
 async def get_my_schedules(
-    current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
 ):
-    """Get current user's schedules"""
-    return ScheduleService.get_user_schedules(db, current_user.id)
+    """Get a page of current user's schedules"""
+    return ScheduleService.get_user_schedules(db, current_user.id, limit, cursor)
 
 
 @router.get("/{schedule_id}", response_model=ScheduleResponse)
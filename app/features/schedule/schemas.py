@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 
 from app.models import ScheduleStatus, ShiftType
@@ -54,6 +55,13 @@ class ScheduleResponse(ScheduleBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ScheduleList(BaseModel):
+    """Schema for a page of schedules"""
+
+    items: List[ScheduleResponse]
+    next_cursor: Optional[str] = None
+
+
 class ScheduleSearchParams(BaseModel):
     """Schema for schedule search parameters"""
 
@@ -64,6 +72,13 @@ class ScheduleSearchParams(BaseModel):
     status: Optional[ScheduleStatus] = None
 
 
+class ScheduleExportFormat(str, Enum):
+    """Output formats for schedule export"""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class RepeatingPattern(BaseModel):
     """Schema for repeating schedule"""
 
@@ -81,6 +96,16 @@ class BulkScheduleCreate(BaseModel):
     schedules: List[ScheduleCreate] = Field(..., min_length=1)
 
 
+class ScheduleConflict(BaseModel):
+    """One row of a bulk schedule conflict report"""
+
+    index: int
+    user_id: int
+    reason: str  # user_not_found, existing_schedule or batch_overlap
+    schedule_id: Optional[int] = None
+    conflicts_with: Optional[int] = None
+
+
 class RepeatingScheduleCreate(BaseModel):
     """Schema for creating repeating schedule"""
 
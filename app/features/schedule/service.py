@@ -1,17 +1,43 @@
+import csv
+import io
+import json
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Iterator, Optional
 
 from app.core.events import Event, event_bus
+from app.core.pagination import MAX_PAGE_LIMIT, decode_cursor, encode_cursor
+from app.features.notifications.coalescer import schedule_change_coalescer
 from app.features.notifications.events.types import NotificationEventType
-from app.features.schedule.bulk_service import BulkScheduleService
+from app.features.schedule.conflicts import schedule_write_error
 from app.models.notification import Notification, NotificationPriority, NotificationType
 from app.models.schedule import Schedule
 from app.models.schedule_enums import ScheduleStatus, ShiftType
-from app.models.user import User
 from fastapi import HTTPException, status
-from sqlalchemy import and_, or_
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, func, or_, tuple_
 from sqlalchemy.orm import Session, joinedload
 
+from .schemas import ScheduleExportFormat
+
+# Rows fetched per round trip and flushed per chunk when exporting
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_CSV_COLUMNS = [
+    "id",
+    "user_id",
+    "user_name",
+    "position",
+    "department",
+    "start_time",
+    "end_time",
+    "shift_type",
+    "status",
+    "description",
+    "created_by",
+    "created_at",
+    "updated_at",
+]
+
 
 class ScheduleService:
     @staticmethod
@@ -51,52 +77,136 @@ class ScheduleService:
         return schedule
 
     @staticmethod
-    def get_user_schedules(db: Session, user_id: int) -> List[Schedule]:
-        """Get all schedules for a specific user"""
+    def _apply_search_params(query, search_params: Optional[dict]):
+        """Apply ScheduleSearchParams filters to a schedule query"""
+        if not search_params:
+            return query
+
+        if search_params.get("user_id"):
+            query = query.filter(Schedule.user_id == search_params["user_id"])
+
+        if search_params.get("start_date"):
+            query = query.filter(Schedule.start_time >= search_params["start_date"])
+
+        if search_params.get("end_date"):
+            query = query.filter(Schedule.end_time <= search_params["end_date"])
+
+        if search_params.get("shift_type"):
+            query = query.filter(Schedule.shift_type == search_params["shift_type"])
+
+        if search_params.get("status"):
+            query = query.filter(Schedule.status == search_params["status"])
+
+        return query
+
+    @staticmethod
+    def _paginate(query, limit: int, cursor: Optional[str]) -> dict:
+        """Keyset pagination on (start_time, id), newest first"""
+        limit = min(limit, MAX_PAGE_LIMIT)
+
+        if cursor:
+            start_time, schedule_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Schedule.start_time, Schedule.id) < (start_time, schedule_id)
+            )
+
+        # Fetch one extra row to know whether another page exists
         schedules = (
-            db.query(Schedule)
-            .options(joinedload(Schedule.user))
-            .filter(Schedule.user_id == user_id)
-            .order_by(Schedule.start_time.desc())
+            query.order_by(Schedule.start_time.desc(), Schedule.id.desc())
+            .limit(limit + 1)
             .all()
         )
 
-        return [
-            BulkScheduleService._format_schedule(schedule) for schedule in schedules
-        ]
+        next_cursor = None
+        if len(schedules) > limit:
+            schedules = schedules[:limit]
+            next_cursor = encode_cursor(schedules[-1].start_time, schedules[-1].id)
+
+        return {
+            "items": [
+                ScheduleService._format_schedule(schedule) for schedule in schedules
+            ],
+            "next_cursor": next_cursor,
+        }
 
     @staticmethod
-    def get_all_schedules(
-        db: Session,
-        search_params: Optional[dict] = None,
-        admin_id: int = None,
-    ) -> List[Schedule]:
-        """Get all schedules with optional filtering"""
+    def get_user_schedules(
+        db: Session, user_id: int, limit: int = 50, cursor: Optional[str] = None
+    ) -> dict:
+        """Get a page of schedules for a specific user"""
         query = (
             db.query(Schedule)
-            .join(User, Schedule.user_id == User.id)
             .options(joinedload(Schedule.user))
+            .filter(Schedule.user_id == user_id)
         )
 
-        if search_params:
-            if search_params.get("user_id"):
-                query = query.filter(Schedule.user_id == search_params["user_id"])
+        return ScheduleService._paginate(query, limit, cursor)
 
-            if search_params.get("start_date"):
-                query = query.filter(Schedule.start_time >= search_params["start_date"])
+    @staticmethod
+    def get_all_schedules(
+        db: Session,
+        search_params: Optional[dict] = None,
+        admin_id: int = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        """Get a page of schedules with optional filtering"""
+        query = db.query(Schedule).options(joinedload(Schedule.user))
+        query = ScheduleService._apply_search_params(query, search_params)
 
-            if search_params.get("end_date"):
-                query = query.filter(Schedule.end_time <= search_params["end_date"])
+        return ScheduleService._paginate(query, limit, cursor)
 
-            if search_params.get("shift_type"):
-                query = query.filter(Schedule.shift_type == search_params["shift_type"])
+    @staticmethod
+    def iter_schedule_export(
+        db: Session,
+        search_params: Optional[dict] = None,
+        export_format: ScheduleExportFormat = ScheduleExportFormat.NDJSON,
+    ) -> Iterator[str]:
+        """Stream schedules as NDJSON lines or CSV rows, one batch at a time"""
+        query = db.query(Schedule).options(joinedload(Schedule.user))
+        query = ScheduleService._apply_search_params(query, search_params)
+
+        # yield_per streams from a server-side cursor instead of loading every row
+        schedules = query.order_by(Schedule.start_time, Schedule.id).yield_per(
+            EXPORT_BATCH_SIZE
+        )
 
-            if search_params.get("status"):
-                query = query.filter(Schedule.status == search_params["status"])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ScheduleExportFormat.CSV:
+            writer.writerow(EXPORT_CSV_COLUMNS)
+
+        for index, schedule in enumerate(schedules, start=1):
+            formatted = ScheduleService._format_schedule(schedule)
+
+            if export_format == ScheduleExportFormat.CSV:
+                writer.writerow(
+                    [
+                        formatted["id"],
+                        formatted["user_id"],
+                        formatted["user"]["name"],
+                        formatted["user"]["position"],
+                        formatted["user"]["department"],
+                        formatted["start_time"],
+                        formatted["end_time"],
+                        formatted["shift_type"],
+                        formatted["status"],
+                        formatted["description"],
+                        formatted["created_by"],
+                        formatted["created_at"],
+                        formatted["updated_at"],
+                    ]
+                )
+            else:
+                buffer.write(json.dumps(formatted) + "\n")
 
-        schedules = query.order_by(Schedule.start_time.desc()).all()
+            if index % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
 
-        return [ScheduleService._format_schedule(schedule) for schedule in schedules]
+        if buffer.tell():
+            yield buffer.getvalue()
 
     @staticmethod
     async def create_schedule(
@@ -110,19 +220,7 @@ class ScheduleService:
                 detail="End time must be after start time",
             )
 
-        has_conflict = ScheduleService._check_schedule_conflict(
-            db,
-            user_id=schedule_data["user_id"],
-            start_time=schedule_data["start_time"],
-            end_time=schedule_data["end_time"],
-        )
-
-        if has_conflict:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Schedule conflicts with existing schedule",
-            )
-
+        # Overlaps are rejected by the schedules exclusion constraint on insert
         try:
             schedule = Schedule(
                 **schedule_data, created_by=created_by, status=ScheduleStatus.CONFIRMED
@@ -159,7 +257,10 @@ class ScheduleService:
             await event_bus.publish(
                 Event(
                     type=NotificationEventType.SCHEDULE_UPDATED,
-                    data={"schedule": formatted_schedule, "notification": notification},
+                    data={
+                        "schedule": formatted_schedule,
+                        "notification": notification.to_dict(),
+                    },
                 )
             )
 
@@ -167,9 +268,7 @@ class ScheduleService:
 
         except Exception as e:
             db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-            )
+            raise schedule_write_error(e)
 
     @staticmethod
     async def update_schedule(
@@ -193,10 +292,9 @@ class ScheduleService:
             db.commit()
             db.refresh(schedule)
 
-            # Create notification for schedule update
-            notification = Notification(
-                user_id=schedule.user_id,
-                type=NotificationType.SCHEDULE_CHANGE,
+            # Rapid edits reach the employee as one digest notification
+            await schedule_change_coalescer.add(
+                schedule.user_id,
                 title="Schedule Updated",
                 message=f"Your schedule for {schedule.start_time.strftime('%Y-%m-%d')} has been updated",
                 priority=NotificationPriority.HIGH,
@@ -209,53 +307,39 @@ class ScheduleService:
                         "shift_type": schedule.shift_type.value,
                         "status": schedule.status.value,
                     },
-                    "changes": schedule_data,
+                    "changes": jsonable_encoder(schedule_data),
                 },
             )
-            db.add(notification)
-            db.commit()
-
-            # Event for real-time notification
-            await event_bus.publish(
-                Event(
-                    type=NotificationEventType.SCHEDULE_UPDATED,
-                    data={
-                        "schedule": ScheduleService._format_schedule(schedule),
-                        "notification": notification.to_dict(),
-                    },
-                )
-            )
 
             return schedule
 
         except Exception as e:
             db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-            )
+            raise schedule_write_error(e)
 
     @staticmethod
-    def delete_schedule(db: Session, schedule_id: int) -> dict:
+    async def delete_schedule(db: Session, schedule_id: int) -> dict:
         """Delete a schedule"""
         schedule = ScheduleService.get_schedule(db, schedule_id)
 
         try:
-            notification = Notification(
-                user_id=schedule.user_id,
-                type=NotificationType.SCHEDULE_CHANGE,
-                title="Schedule Deleted",
-                message=f"Schedule for {schedule.start_time.strftime('%Y-%m-%d')} has been deleted",
-                priority=NotificationPriority.HIGH,
-                data={
+            user_id = schedule.user_id
+            change = {
+                "title": "Schedule Deleted",
+                "message": f"Schedule for {schedule.start_time.strftime('%Y-%m-%d')} has been deleted",
+                "priority": NotificationPriority.HIGH,
+                "data": {
                     "schedule_id": schedule.id,
                     "date": schedule.start_time.strftime("%Y-%m-%d"),
+                    "deleted": True,
                 },
-            )
-            db.add(notification)
+            }
 
             db.delete(schedule)
             db.commit()
 
+            await schedule_change_coalescer.add(user_id, **change)
+
             return {"message": "Schedule deleted successfully"}
 
         except Exception as e:
@@ -275,110 +359,126 @@ class ScheduleService:
         try:
             schedule.status = new_status
 
-            notification = Notification(
-                user_id=schedule.user_id,
-                type=NotificationType.SCHEDULE_CHANGE,
+            db.commit()
+            db.refresh(schedule)
+
+            await schedule_change_coalescer.add(
+                schedule.user_id,
                 title="Schedule Status Updated",
                 message=f"Your schedule status has been updated to {new_status}",
                 priority=NotificationPriority.NORMAL,
                 data={
                     "schedule_id": schedule.id,
                     "old_status": old_status.value,
-                    "new_status": new_status,
+                    "new_status": schedule.status.value,
                     "date": schedule.start_time.strftime("%Y-%m-%d"),
                 },
             )
-            db.add(notification)
-
-            db.commit()
-            db.refresh(schedule)
-
-            # Event for real-time notification
-            await event_bus.publish(
-                Event(
-                    type=NotificationEventType.SCHEDULE_UPDATED,
-                    data={
-                        "schedule": ScheduleService._format_schedule(schedule),
-                        "notification": notification.to_dict(),
-                    },
-                )
-            )
 
             return schedule
 
         except Exception as e:
             db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-            )
+            raise schedule_write_error(e)
+
+    @staticmethod
+    def _empty_day_stats() -> dict:
+        return {
+            "total_count": 0,
+            "shift_counts": {"morning": 0, "afternoon": 0, "evening": 0},
+            "status_counts": {"confirmed": 0, "pending": 0},
+            "schedules": [],
+        }
 
     @staticmethod
     async def get_schedule_overview(
         db: Session, start_date: datetime, end_date: datetime, view_type: str = "week"
     ) -> dict:
         """Overview of schedules"""
-        base_query = db.query(Schedule).filter(
-            and_(
-                Schedule.start_time >= start_date,
-                Schedule.end_time <= end_date,
-                Schedule.status != ScheduleStatus.CANCELLED,
+        range_filter = and_(
+            Schedule.start_time >= start_date,
+            Schedule.end_time <= end_date,
+            Schedule.status != ScheduleStatus.CANCELLED,
+        )
+        day = func.date_trunc("day", Schedule.start_time).label("day")
+
+        # Daily stats from a single aggregate query
+        day_counts = (
+            db.query(
+                day,
+                func.count().label("total_count"),
+                func.count()
+                .filter(Schedule.shift_type == ShiftType.MORNING)
+                .label("morning"),
+                func.count()
+                .filter(Schedule.shift_type == ShiftType.AFTERNOON)
+                .label("afternoon"),
+                func.count()
+                .filter(Schedule.shift_type == ShiftType.EVENING)
+                .label("evening"),
+                func.count()
+                .filter(Schedule.status == ScheduleStatus.CONFIRMED)
+                .label("confirmed"),
+                func.count()
+                .filter(Schedule.status == ScheduleStatus.PENDING)
+                .label("pending"),
             )
+            .filter(range_filter)
+            .group_by(day)
+            .all()
         )
 
-        # Daily stats
         daily_stats = {}
-        current_date = start_date
-        while current_date <= end_date:
-            next_date = current_date + timedelta(days=1)
-
-            # Get schedules for the day
-            day_schedules = base_query.filter(
-                and_(
-                    Schedule.start_time >= current_date,
-                    Schedule.end_time < next_date,
-                )
-            ).all()
-
-            daily_stats[current_date.strftime("%Y-%m-%d")] = {
-                "total_count": len(day_schedules),
-                "shift_counts": {
-                    "morning": sum(
-                        1 for s in day_schedules if s.shift_type == ShiftType.MORNING
-                    ),
-                    "afternoon": sum(
-                        1 for s in day_schedules if s.shift_type == ShiftType.AFTERNOON
-                    ),
-                    "evening": sum(
-                        1 for s in day_schedules if s.shift_type == ShiftType.EVENING
-                    ),
-                },
-                "status_counts": {
-                    "confirmed": sum(
-                        1 for s in day_schedules if s.status == ScheduleStatus.CONFIRMED
-                    ),
-                    "pending": sum(
-                        1 for s in day_schedules if s.status == ScheduleStatus.PENDING
-                    ),
-                },
-                "schedules": [
-                    {
-                        "id": schedule.id,
-                        "user_id": schedule.user_id,
-                        "user": {
-                            "id": schedule.user.id,
-                            "name": schedule.user.full_name,
-                            "position": schedule.user.position,
-                        },
-                        "shift_type": schedule.shift_type.value,
-                        "start_time": schedule.start_time.strftime("%H:%M"),
-                        "end_time": schedule.end_time.strftime("%H:%M"),
-                        "status": schedule.status.value,
-                    }
-                    for schedule in day_schedules
-                ],
+        current_date = start_date.date()
+        while current_date <= end_date.date():
+            daily_stats[current_date.strftime("%Y-%m-%d")] = (
+                ScheduleService._empty_day_stats()
+            )
+            current_date += timedelta(days=1)
+
+        for row in day_counts:
+            stats = daily_stats.setdefault(
+                row.day.strftime("%Y-%m-%d"), ScheduleService._empty_day_stats()
+            )
+            stats["total_count"] = row.total_count
+            stats["shift_counts"] = {
+                "morning": row.morning,
+                "afternoon": row.afternoon,
+                "evening": row.evening,
+            }
+            stats["status_counts"] = {
+                "confirmed": row.confirmed,
+                "pending": row.pending,
             }
 
-            current_date = next_date
+        # Schedules with their users in one query, bucketed in a single pass
+        schedules = (
+            db.query(Schedule)
+            .options(joinedload(Schedule.user))
+            .filter(range_filter)
+            .order_by(Schedule.start_time)
+            .all()
+        )
+
+        for schedule in schedules:
+            daily_stats.setdefault(
+                schedule.start_time.strftime("%Y-%m-%d"),
+                ScheduleService._empty_day_stats(),
+            )["schedules"].append(
+                {
+                    "id": schedule.id,
+                    "user_id": schedule.user_id,
+                    "user": {
+                        "id": schedule.user.id,
+                        "name": schedule.user.full_name,
+                        "position": schedule.user.position,
+                    },
+                    "shift_type": schedule.shift_type.value,
+                    "start_time": schedule.start_time.strftime("%H:%M"),
+                    "end_time": schedule.end_time.strftime("%H:%M"),
+                    "status": schedule.status.value,
+                }
+            )
 
         return {
             "start_date": start_date.strftime("%Y-%m-%d"),
@@ -386,37 +486,3 @@ class ScheduleService:
             "view_type": view_type,
             "daily_stats": daily_stats,
         }
-
-    @staticmethod
-    def _check_schedule_conflict(
-        db: Session,
-        user_id: int,
-        start_time: datetime,
-        end_time: datetime,
-        exclude_schedule_id: Optional[int] = None,
-    ) -> bool:
-        """Check for schedule conflicts"""
-        query = db.query(Schedule).filter(
-            and_(
-                Schedule.user_id == user_id,
-                Schedule.status != ScheduleStatus.CANCELLED,
-                Schedule.start_time < end_time,
-                Schedule.end_time > start_time,
-            )
-        )
-
-        if exclude_schedule_id:
-            query = query.filter(Schedule.id != exclude_schedule_id)
-
-        existing = query.first()
-
-        if existing:
-            print(
-                f"""
-            Conflict detected:
-            New Schedule: {start_time} - {end_time}
-            Existing Schedule: {existing.start_time} - {existing.end_time}
-            """
-            )
-
-        return existing is not None
@@ -1,6 +1,7 @@
 from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.pagination import MAX_PAGE_LIMIT
 from app.core.security import get_current_user
 from app.features.shift_trade.schemas import (
     ShiftTradeCreate,
@@ -12,7 +13,7 @@ from app.features.shift_trade.schemas import (
 from app.features.shift_trade.service import ShiftTradeService
 from app.models.shift_trade import TradeType
 from app.models.user import User
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 router = APIRouter(tags=["Shift Trade"])
@@ -23,11 +24,13 @@ async def get_trade_requests(
     status: Optional[str] = None,
     type: Optional[str] = None,
     search: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_LIMIT),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all trade requests with optional filtering"""
-    return ShiftTradeService.get_trade_requests(db, status, type, search)
+    return ShiftTradeService.get_trade_requests(db, status, type, search, skip, limit)
 
 
 @router.get("/{trade_id}", response_model=ShiftTradeResponse)
@@ -6,7 +6,7 @@ from app.core.events import Event, event_bus
 from app.features.notifications.events.types import NotificationEventType
 from app.models.notification import Notification, NotificationPriority, NotificationType
 from app.models.schedule import Schedule
-from app.models.schedule_enums import ScheduleStatus
+from app.models.schedule_intervals import has_schedule_conflict
 from app.models.shift_trade import (
     ResponseStatus,
     ShiftTrade,
@@ -17,7 +17,7 @@ from app.models.shift_trade import (
 from app.models.user import User
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 logger = logging.getLogger(__name__)
 
@@ -77,14 +77,81 @@ class ShiftTradeService:
             },
         }
 
+    @staticmethod
+    def _format_user_summary(user: User) -> dict:
+        return {"id": user.id, "name": user.full_name, "position": user.position}
+
+    @staticmethod
+    def _format_shift_summary(shift: Optional[Schedule]) -> Optional[dict]:
+        if not shift:
+            return None
+        return {
+            "id": shift.id,
+            "start_time": shift.start_time.strftime("%Y-%m-%d %H:%M"),
+            "end_time": shift.end_time.strftime("%Y-%m-%d %H:%M"),
+            "type": shift.shift_type,
+        }
+
+    @staticmethod
+    def _format_trade_summary(trade: ShiftTrade) -> dict:
+        """Format a trade for listings from its eagerly loaded relationships"""
+        return {
+            "id": trade.id,
+            "type": trade.type,
+            "author_id": trade.author_id,
+            "original_shift_id": trade.original_shift_id,
+            "preferred_shift_id": trade.preferred_shift_id,
+            "reason": trade.reason,
+            "status": trade.status,
+            "urgency": trade.urgency,
+            "created_at": trade.created_at,
+            "updated_at": trade.updated_at,
+            "author": ShiftTradeService._format_user_summary(trade.author),
+            "original_shift": ShiftTradeService._format_shift_summary(
+                trade.original_shift
+            ),
+            "preferred_shift": ShiftTradeService._format_shift_summary(
+                trade.preferred_shift
+            ),
+            "responses": [
+                {
+                    "id": response.id,
+                    "respondent": ShiftTradeService._format_user_summary(
+                        response.respondent
+                    ),
+                    "offered_shift": ShiftTradeService._format_shift_summary(
+                        response.offered_shift
+                    ),
+                    "content": response.content,
+                    "status": response.status,
+                    "created_at": response.created_at,
+                }
+                for response in trade.responses
+                if response.respondent
+                and (response.offered_shift or trade.type == "GIVEAWAY")
+            ],
+        }
+
     @staticmethod
     def get_trade_requests(
         db: Session,
         status: Optional[str] = None,
         type: Optional[str] = None,
         search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
     ) -> List[ShiftTrade]:
-        query = db.query(ShiftTrade)
+        # One joined query for the trades and one for all their responses,
+        # however many trades and responses the page holds
+        query = db.query(ShiftTrade).options(
+            joinedload(ShiftTrade.author),
+            joinedload(ShiftTrade.original_shift),
+            joinedload(ShiftTrade.preferred_shift),
+            selectinload(ShiftTrade.responses).options(
+                joinedload(ShiftTradeResponse.respondent),
+                joinedload(ShiftTradeResponse.offered_shift),
+            ),
+        )
 
         if status:
             query = query.filter(ShiftTrade.status == status)
@@ -92,91 +159,19 @@ class ShiftTradeService:
             query = query.filter(ShiftTrade.type == type)
         if search:
             # Search in user names or schedule details
-            query = query.join(ShiftTrade.author).filter(
-                User.full_name.ilike(f"%{search}%")
+            query = query.filter(
+                ShiftTrade.author.has(User.full_name.ilike(f"%{search}%"))
             )
 
-        trades = query.order_by(ShiftTrade.created_at.desc()).all()
+        trades = (
+            query.order_by(ShiftTrade.created_at.desc(), ShiftTrade.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
         # Convert to response format
-        return [
-            {
-                "id": trade.id,
-                "type": trade.type,
-                "author_id": trade.author_id,
-                "original_shift_id": trade.original_shift_id,
-                "preferred_shift_id": trade.preferred_shift_id,
-                "reason": trade.reason,
-                "status": trade.status,
-                "urgency": trade.urgency,
-                "created_at": trade.created_at,
-                "updated_at": trade.updated_at,
-                "author": {
-                    "id": trade.author.id,
-                    "name": trade.author.full_name,
-                    "position": trade.author.position,
-                },
-                "original_shift": (
-                    {
-                        "id": trade.original_shift.id,
-                        "start_time": trade.original_shift.start_time.strftime(
-                            "%Y-%m-%d %H:%M"
-                        ),
-                        "end_time": trade.original_shift.end_time.strftime(
-                            "%Y-%m-%d %H:%M"
-                        ),
-                        "type": trade.original_shift.shift_type,
-                    }
-                    if trade.original_shift
-                    else None
-                ),
-                "preferred_shift": (
-                    {
-                        "id": trade.preferred_shift.id,
-                        "start_time": trade.preferred_shift.start_time.strftime(
-                            "%Y-%m-%d %H:%M"
-                        ),
-                        "end_time": trade.preferred_shift.end_time.strftime(
-                            "%Y-%m-%d %H:%M"
-                        ),
-                        "type": trade.preferred_shift.shift_type,
-                    }
-                    if trade.preferred_shift
-                    else None
-                ),
-                "responses": [
-                    {
-                        "id": response.id,
-                        "respondent": {
-                            "id": response.respondent.id,
-                            "name": response.respondent.full_name,
-                            "position": response.respondent.position,
-                        },
-                        "offered_shift": (
-                            {
-                                "id": response.offered_shift.id,
-                                "start_time": response.offered_shift.start_time.strftime(
-                                    "%Y-%m-%d %H:%M"
-                                ),
-                                "end_time": response.offered_shift.end_time.strftime(
-                                    "%Y-%m-%d %H:%M"
-                                ),
-                                "type": response.offered_shift.shift_type,
-                            }
-                            if response.offered_shift
-                            else None
-                        ),
-                        "content": response.content,
-                        "status": response.status,
-                        "created_at": response.created_at,
-                    }
-                    for response in trade.responses
-                    if response.respondent
-                    and (response.offered_shift or trade.type == "GIVEAWAY")
-                ],
-            }
-            for trade in trades
-        ]
+        return [ShiftTradeService._format_trade_summary(trade) for trade in trades]
 
     @staticmethod
     def get_trade_request(db: Session, trade_id: int) -> ShiftTrade:
@@ -208,9 +203,15 @@ class ShiftTradeService:
             )
 
         # Check for existing active trade request
-        if not await ShiftTradeService.check_schedule_availability(
-            db, original_shift.id, original_shift
-        ):
+        existing_trade = (
+            db.query(ShiftTrade.id)
+            .filter(
+                ShiftTrade.original_shift_id == original_shift.id,
+                ShiftTrade.status == TradeStatus.OPEN,
+            )
+            .first()
+        )
+        if existing_trade:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="An active trade request already exists for this shift",
@@ -628,17 +629,9 @@ class ShiftTradeService:
         db: Session, user_id: int, schedule: Schedule
     ) -> bool:
         """Check if user has any conflicting schedules"""
-        conflicting_schedule = (
-            db.query(Schedule)
-            .filter(
-                Schedule.user_id == user_id,
-                Schedule.status != ScheduleStatus.CANCELLED,
-                Schedule.start_time < schedule.end_time,
-                Schedule.end_time > schedule.start_time,
-            )
-            .first()
+        return not has_schedule_conflict(
+            db, user_id, schedule.start_time, schedule.end_time
         )
-        return conflicting_schedule is None
 
     @staticmethod
     async def _send_response_notifications(
@@ -4,6 +4,7 @@ from .events import Event, EventType
 from .leave_request import LeaveRequest, LeaveStatus, LeaveType
 from .notification import (
     Notification,
+    NotificationArchive,
     NotificationPriority,
     NotificationStatus,
     NotificationType,
@@ -29,6 +30,7 @@ __all__ = [
     "ShiftTrade",
     "ShiftTradeResponse",
     "Notification",
+    "NotificationArchive",
     "Announcement",
     "AnnouncementRead",
     "Event",
@@ -4,7 +4,7 @@ from typing import Dict, Optional
 
 from sqlalchemy import JSON, Boolean, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -53,11 +53,33 @@ class Notification(Base):
     sent_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(String, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), onupdate=datetime.now(timezone.utc))
+    created_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    updated_at = Column(
+        DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc)
+    )
 
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # Keyset pagination of a user's inbox, newest first
+        Index(
+            "ix_notifications_user_id_created_at",
+            user_id,
+            created_at.desc(),
+            id.desc(),
+        ),
+        # Unread-only listing and counting touch just the unread rows
+        Index(
+            "ix_notifications_user_id_unread",
+            user_id,
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=is_read == False,
+        ),
+    )
+
     def to_dict(self) -> Dict:
         return {
             "id": self.id,
@@ -106,3 +128,33 @@ class Notification(Base):
 
     def __repr__(self) -> str:
         return f"<Notification(id={self.id}, type={self.type}, status={self.status})>"
+
+
+class NotificationArchive(Base):
+    """Read notifications moved out of the inbox once past their retention"""
+
+    __tablename__ = "notifications_archive"
+
+    # Keeps the original notification id
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    type = Column(SQLEnum(NotificationType))
+    title = Column(String, nullable=False)
+    message = Column(String, nullable=False)
+    priority = Column(SQLEnum(NotificationPriority))
+    data = Column(JSON, nullable=True)
+
+    status = Column(SQLEnum(NotificationStatus))
+    is_read = Column(Boolean, default=True)
+    read_at = Column(DateTime(timezone=True), nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_notifications_archive_user_id_created_at", user_id, created_at),
+    )
+
+    def __repr__(self) -> str:
+        return f"<NotificationArchive(id={self.id}, type={self.type})>"
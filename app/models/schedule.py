@@ -7,10 +7,13 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
+    text,
 )
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -24,6 +27,20 @@ class Schedule(Base):
     """Schedule model for managing employee work schedules"""
 
     __tablename__ = "schedules"
+    __table_args__ = (
+        # Keyset pagination indexes for schedule listings
+        Index("ix_schedules_user_id_start_time", "user_id", "start_time"),
+        Index("ix_schedules_status_start_time", "status", "start_time"),
+        # A user's active schedules may not overlap; the int4range wrapper lets
+        # gist compare user_id without the btree_gist extension
+        ExcludeConstraint(
+            (text("int4range(user_id, user_id, '[]')"), "="),
+            (text("tstzrange(start_time, end_time)"), "&&"),
+            name="ex_schedules_user_id_time_range",
+            using="gist",
+            where=text("status <> 'CANCELLED'"),
+        ),
+    )
 
     # Primary fields
     id: Mapped[int] = Column(Integer, primary_key=True, index=True)
@@ -61,6 +78,11 @@ class Schedule(Base):
     repeat_end_date: Mapped[Optional[datetime]] = Column(
         DateTime(timezone=True), nullable=True
     )
+    materialized_until: Mapped[Optional[datetime]] = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Set on series parents: occurrences up to here have been written",
+    )
 
     # Parent-child relationship for recurring schedules
     parent_schedule_id: Mapped[Optional[int]] = mapped_column(
@@ -0,0 +1,123 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .schedule import Schedule
+from .schedule_enums import ScheduleStatus
+
+# (start, end, schedule_id); schedule_id is None for intervals not stored yet
+Interval = Tuple[datetime, datetime, Optional[int]]
+
+
+def as_utc(value: datetime) -> datetime:
+    """Naive datetimes are stored as UTC (see database connect_args)"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class ScheduleIntervalIndex:
+    """Snapshot of per-user sorted schedule intervals for one flow
+
+    Meant for flows checking many intervals: load it once for the users and
+    window involved, then add() each interval the flow accepts so later
+    checks see it without another query. It is not shared between requests
+    and does not follow writes made elsewhere; single checks go through
+    has_schedule_conflict, and the exclusion constraint stays authoritative.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[int, List[Interval]] = defaultdict(list)
+        self._max_duration: Dict[int, timedelta] = defaultdict(timedelta)
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        user_ids: Iterable[int],
+        start: datetime,
+        end: datetime,
+    ) -> "ScheduleIntervalIndex":
+        """Load active schedules of the given users that touch [start, end)"""
+        index = cls()
+        user_ids = set(user_ids)
+        if not user_ids:
+            return index
+
+        rows = db.query(
+            Schedule.id, Schedule.user_id, Schedule.start_time, Schedule.end_time
+        ).filter(
+            Schedule.user_id.in_(user_ids),
+            Schedule.status != ScheduleStatus.CANCELLED,
+            Schedule.start_time < end,
+            Schedule.end_time > start,
+        )
+        for schedule_id, user_id, schedule_start, schedule_end in rows:
+            index.add(user_id, schedule_start, schedule_end, schedule_id)
+
+        return index
+
+    def add(
+        self,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        schedule_id: Optional[int] = None,
+    ) -> None:
+        """Add an interval, e.g. after a schedule is written in the same flow"""
+        start, end = as_utc(start), as_utc(end)
+        insort(self._intervals[user_id], (start, end, schedule_id), key=_start_of)
+        self._max_duration[user_id] = max(self._max_duration[user_id], end - start)
+
+    def has_overlap(
+        self,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[int] = None,
+    ) -> bool:
+        """Check [start, end) against the user's intervals in this snapshot"""
+        intervals = self._intervals.get(user_id)
+        if not intervals:
+            return False
+
+        start, end = as_utc(start), as_utc(end)
+
+        # Only intervals starting before `end` can overlap, and none starting
+        # more than the longest duration before `start` can still be running
+        position = bisect_left(intervals, end, key=_start_of)
+        earliest = start - self._max_duration[user_id]
+        for interval_start, interval_end, schedule_id in reversed(intervals[:position]):
+            if interval_start <= earliest:
+                break
+            if interval_end > start and (
+                exclude_id is None or schedule_id != exclude_id
+            ):
+                return True
+
+        return False
+
+
+def _start_of(interval: Interval) -> datetime:
+    return interval[0]
+
+
+def has_schedule_conflict(
+    db: Session,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    exclude_id: Optional[int] = None,
+) -> bool:
+    """Check a single interval against the user's stored schedules in one query"""
+    query = db.query(Schedule.id).filter(
+        Schedule.user_id == user_id,
+        Schedule.status != ScheduleStatus.CANCELLED,
+        Schedule.start_time < end,
+        Schedule.end_time > start,
+    )
+    if exclude_id is not None:
+        query = query.filter(Schedule.id != exclude_id)
+
+    return db.query(query.exists()).scalar()
@@ -2,11 +2,12 @@ from datetime import datetime
 from enum import Enum as PyEnum
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, and_, func
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, relationship
 
 from .base import Base
 from .schedule import Schedule
+from .schedule_intervals import ScheduleIntervalIndex, has_schedule_conflict
 
 
 class TradeType(str, PyEnum):
@@ -78,52 +79,35 @@ class ShiftTrade(Base):
 
     async def _check_giveaway_conflict(self, db_session) -> bool:
         """Check conflicts for giveaway requests"""
-        original_shift = db_session.get(Schedule, self.original_shift_id)
-        if not original_shift:
-            return False
-
-        # Check if the user has any existing shifts that conflict with the original shift
-        existing_schedule = (
-            db_session.query(Schedule)
-            .filter(
-                Schedule.user_id == self.author_id,
-                Schedule.id != self.original_shift_id,
-                and_(
-                    Schedule.start_time < original_shift.end_time,
-                    Schedule.end_time > original_shift.start_time,
-                ),
-            )
-            .first()
-        )
+        return await self._check_trade_conflict(db_session, include_preferred=False)
 
-        return existing_schedule is None
-
-    async def _check_trade_conflict(self, db_session) -> bool:
+    async def _check_trade_conflict(
+        self, db_session, include_preferred: bool = True
+    ) -> bool:
         """Check conflicts for trade requests"""
-        if not self._check_giveaway_conflict(db_session):
-            return False
+        shift_ids = [self.original_shift_id]
+        if include_preferred and self.preferred_shift_id:
+            shift_ids.append(self.preferred_shift_id)
 
-        if self.preferred_shift_id:
-            preferred_shift = db_session.get(Schedule, self.preferred_shift_id)
-            if not preferred_shift:
-                return False
-
-            existing_schedule = (
-                db_session.query(Schedule)
-                .filter(
-                    Schedule.user_id == self.author_id,
-                    Schedule.id != self.preferred_shift_id,
-                    and_(
-                        Schedule.start_time < preferred_shift.end_time,
-                        Schedule.end_time > preferred_shift.start_time,
-                    ),
-                )
-                .first()
-            )
+        shifts = [db_session.get(Schedule, shift_id) for shift_id in shift_ids]
+        if not all(shifts):
+            return False
 
-            return existing_schedule is None
+        # One window covering every shift in question, answered in-process
+        index = ScheduleIntervalIndex.load(
+            db_session,
+            [self.author_id],
+            min(shift.start_time for shift in shifts),
+            max(shift.end_time for shift in shifts),
+        )
 
-        return True
+        # Check if the user has any existing shifts that conflict with these shifts
+        return not any(
+            index.has_overlap(
+                self.author_id, shift.start_time, shift.end_time, exclude_id=shift.id
+            )
+            for shift in shifts
+        )
 
 
 class ShiftTradeResponse(Base):
@@ -162,7 +146,7 @@ class ShiftTradeResponse(Base):
             return False
 
         original_shift = trade_request.original_shift
-        return self._check_schedule_conflict(
+        return await self._check_schedule_conflict(
             db_session, self.respondent_id, original_shift
         )
 
@@ -170,17 +154,6 @@ class ShiftTradeResponse(Base):
         self, db_session, user_id: int, shift: Schedule
     ) -> bool:
         """Helper method to check schedule conflicts"""
-        existing_schedule = (
-            db_session.query(Schedule)
-            .filter(
-                Schedule.user_id == user_id,
-                Schedule.id != shift.id,
-                and_(
-                    Schedule.start_time < shift.end_time,
-                    Schedule.end_time > shift.start_time,
-                ),
-            )
-            .first()
+        return not has_schedule_conflict(
+            db_session, user_id, shift.start_time, shift.end_time, exclude_id=shift.id
         )
-
-        return existing_schedule is None
@@ -0,0 +1,110 @@
+"""Ping sweep time over simulated WebSocket connections
+
+Compares the old sequential sweep (one awaited send per connection) with
+the sharded ConnectionManager sweep, where pings are fanned out per shard
+with bounded concurrency and written by each connection's writer task.
+
+Usage (settings are read from the environment like the app):
+
+    python benchmarks/ws_sweep_benchmark.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.features.notifications.ws.connection import (  # noqa: E402
+    ConnectionState,
+    WebSocketConnection,
+)
+from app.features.notifications.ws_manager import ConnectionManager  # noqa: E402
+
+
+class SimulatedWebSocket:
+    client_state = "connected"
+
+    def __init__(self, latency: float, done: asyncio.Event, counter: list):
+        self.latency = latency
+        self.done = done
+        self.counter = counter
+
+    async def send_text(self, data):
+        await asyncio.sleep(self.latency)
+        self.counter[0] -= 1
+        if self.counter[0] == 0:
+            self.done.set()
+
+    async def close(self):
+        pass
+
+
+def build_connections(count: int, latency: float):
+    done = asyncio.Event()
+    counter = [count]
+    connections = {}
+    for user_id in range(1, count + 1):
+        connection = WebSocketConnection(
+            SimulatedWebSocket(latency, done, counter),
+            SimpleNamespace(id=user_id),
+        )
+        connection.state = ConnectionState.CONNECTED
+        connections[user_id] = connection
+    return connections, done
+
+
+async def sequential_sweep(count: int, latency: float) -> float:
+    connections, _ = build_connections(count, latency)
+    started = time.perf_counter()
+    for connection in connections.values():
+        await connection.websocket.send_text('{"type":"ping"}')
+    return time.perf_counter() - started
+
+
+async def sharded_sweep(count: int, latency: float, shards: int) -> float:
+    connections, done = build_connections(count, latency)
+    manager = ConnectionManager(shard_count=shards)
+    for user_id, connection in connections.items():
+        manager.active_connections.add(user_id, connection.device_id, connection)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(manager._ping_shard(shard) for shard in manager.active_connections.shards)
+    )
+    await done.wait()
+    elapsed = time.perf_counter() - started
+
+    for connection in connections.values():
+        await connection.disconnect()
+    return elapsed
+
+
+async def main(args) -> None:
+    latency = args.latency_ms / 1000
+    print(f"{'connections':>12} {'sequential (s)':>15} {'sharded (s)':>12}")
+    for size in args.sizes:
+        sequential = (
+            f"{await sequential_sweep(size, latency):15.3f}"
+            if size <= args.sequential_max
+            else f"{'skipped':>15}"
+        )
+        sharded = await sharded_sweep(size, latency, args.shards)
+        print(f"{size:>12} {sequential} {sharded:12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument(
+        "--sequential-max",
+        type=int,
+        default=10000,
+        help="Skip the sequential baseline above this many connections",
+    )
+    asyncio.run(main(parser.parse_args()))
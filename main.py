@@ -3,6 +3,7 @@ from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.database import engine
 from app.core.events import event_bus
+from app.core.security import auth_cache
 from app.features.admin_dashboard import router as admin_dashboard_router
 from app.features.announcements import router as announcement_router
 from app.features.auth import router as auth_router
@@ -12,10 +13,17 @@ from app.features.employee_management import position_router as position_router
 from app.features.employee_management import router as employee_router
 from app.features.leave import router as leave_router
 from app.features.notifications import router as notification_router
-from app.features.notifications import ws_router
+from app.features.notifications import (
+    ack_aggregator,
+    notification_dispatcher,
+    notification_retention,
+    schedule_change_coalescer,
+    ws_router,
+)
 from app.features.notifications.events import register_notification_handlers
 from app.features.notifications.ws_manager import notification_manager
 from app.features.schedule import admin_router as schedule_admin_router
+from app.features.schedule import recurrence_materializer
 from app.features.schedule import router as schedule_router
 from app.features.shift_trade import router as shift_trade_router
 from app.models import Base
@@ -32,10 +40,24 @@ async def lifespan(app: FastAPI):
     # Execute the code start up
     register_notification_handlers(event_bus)
 
+    await ack_aggregator.start()
     await notification_manager.start()
+    await notification_dispatcher.start()
+    await notification_retention.start()
+    await event_bus.start()
+    await recurrence_materializer.start()
+    await schedule_change_coalescer.start()
     yield
     # Execute the code shutdown
+    # Buffered schedule changes are flushed while the event bus still runs
+    await schedule_change_coalescer.stop()
+    await recurrence_materializer.stop()
+    await event_bus.stop()
+    await notification_retention.stop()
+    await notification_dispatcher.stop()
     await notification_manager.stop()
+    # Last, so acks recorded while shutting down are still written back
+    await ack_aggregator.stop()
 
 
 # Initialize FastAPI app
@@ -139,4 +161,4 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {"status": "healthy", "auth_cache": auth_cache.stats()}
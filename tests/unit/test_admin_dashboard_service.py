@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 
 import pytest
 from app.features.admin_dashboard.service import AdminDashboardService
+from app.models.leave_request import LeaveRequest, LeaveStatus, LeaveType
 from app.models.notification import Notification, NotificationStatus, NotificationType
 from app.models.schedule import Schedule
 from app.models.schedule_enums import ScheduleStatus, ShiftType
@@ -55,7 +56,7 @@ def setup_schedules(db_session, setup_employees, test_admin):
             )
             schedules.append(schedule)
 
-        # Afternoon shift with conflict
+        # Afternoon shift followed by a pending evening shift
         elif i % 3 == 1:
             schedule1 = Schedule(
                 user_id=employee.id,
@@ -65,10 +66,10 @@ def setup_schedules(db_session, setup_employees, test_admin):
                 status=ScheduleStatus.CONFIRMED,
                 created_by=test_admin.id,
             )
-            # Conflicting schedule
+            # Overlapping schedules are rejected by the exclusion constraint
             schedule2 = Schedule(
                 user_id=employee.id,
-                start_time=today_start.replace(hour=20),
+                start_time=today_start.replace(hour=21),
                 end_time=today_start.replace(hour=23),
                 shift_type=ShiftType.EVENING,
                 status=ScheduleStatus.PENDING,
@@ -129,8 +130,34 @@ def setup_notifications(db_session, setup_employees):
 
 
 @pytest.mark.asyncio
-async def test_get_dashboard_stats(db_session, setup_employees, setup_schedules):
+async def test_get_dashboard_stats(
+    db_session, test_admin, setup_employees, setup_schedules
+):
     """Test comprehensive dashboard statistics"""
+    # Tomorrow's shift of the third employee falls in an approved leave
+    tomorrow = next(
+        s for s in setup_schedules if s.start_time.date() > datetime.now().date()
+    )
+    db_session.add_all(
+        [
+            LeaveRequest(
+                employee_id=tomorrow.user_id,
+                leave_type=LeaveType.VACATION,
+                start_date=tomorrow.start_time - timedelta(hours=1),
+                end_date=tomorrow.end_time + timedelta(days=1),
+                status=LeaveStatus.APPROVED,
+            ),
+            LeaveRequest(
+                employee_id=setup_schedules[0].user_id,
+                leave_type=LeaveType.VACATION,
+                start_date=setup_schedules[0].start_time,
+                end_date=setup_schedules[0].end_time,
+                status=LeaveStatus.REJECTED,
+            ),
+        ]
+    )
+    db_session.commit()
+
     stats = await AdminDashboardService.get_dashboard_stats(db_session)
 
     # Employee stats verification
@@ -148,7 +175,7 @@ async def test_get_dashboard_stats(db_session, setup_employees, setup_schedules)
 
     assert stats["schedules"]["today"] == len(today_schedules)
     assert stats["schedules"]["pending"] == len(pending_schedules)
-    assert stats["schedules"]["conflicts"] > 0  # We created conflicting schedules
+    assert stats["schedules"]["conflicts"] == 1
 
 
 @pytest.mark.asyncio
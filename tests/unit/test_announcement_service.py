@@ -207,3 +207,60 @@ async def test_error_handling(db_session, test_admin):
         )
 
     assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_announcement_notification_fanout(
+    db_session, test_admin, test_user, test_employee2
+):
+    """Test announcement fan-out inserts every row and marks delivered ones sent"""
+    from app.core.events import Event
+    from app.features.notifications.events import (
+        NotificationEventType,
+        handle_new_announcement_notification,
+    )
+    from app.features.notifications.ws_manager import notification_manager
+    from app.models.notification import Notification, NotificationStatus
+
+    class MockWebSocket:
+        async def send_json(self, data):
+            pass
+
+        async def send_text(self, data):
+            pass
+
+        async def close(self):
+            pass
+
+        client_state = "connected"
+
+    test_employee2.is_active = False
+    db_session.commit()
+    await notification_manager.connect(test_user, MockWebSocket())
+
+    try:
+        await handle_new_announcement_notification(
+            Event(
+                type=NotificationEventType.ANNOUNCEMENT_CREATED,
+                data={
+                    "announcement": {
+                        "id": 1,
+                        "title": "Fan-out",
+                        "content": "x" * 150,
+                        "priority": "high",
+                        "author": {"id": test_admin.id, "name": "Admin"},
+                    }
+                },
+            ),
+            db_session,
+        )
+    finally:
+        await notification_manager.disconnect(test_user.id)
+
+    statuses = dict(db_session.query(Notification.user_id, Notification.status).all())
+    assert statuses == {
+        test_user.id: NotificationStatus.SENT,
+        test_admin.id: NotificationStatus.PENDING,
+    }
+    notification = db_session.query(Notification).first()
+    assert notification.data["preview"] == "x" * 100 + "..."
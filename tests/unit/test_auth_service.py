@@ -5,11 +5,12 @@ from fastapi import HTTPException
 
 
 # Authenticate user tests
-def test_authenticate_user_success(db_session, test_user):
+@pytest.mark.asyncio
+async def test_authenticate_user_success(db_session, test_user):
     """Test successful user authentication"""
     login_data = LoginSchema(email="test@example.com", password="testpass123")
 
-    user = AuthService.authenticate_user(db_session, login_data)
+    user = await AuthService.authenticate_user(db_session, login_data)
 
     assert user is not None
     assert user.email == "test@example.com"
@@ -17,29 +18,55 @@ def test_authenticate_user_success(db_session, test_user):
 
 
 # Wrong password test
-def test_authenticate_user_wrong_password(db_session, test_user):
+@pytest.mark.asyncio
+async def test_authenticate_user_wrong_password(db_session, test_user):
     """Test user authentication with wrong password"""
     login_data = LoginSchema(email="test@example.com", password="wrongpass123")
 
     with pytest.raises(HTTPException) as exc_info:
-        AuthService.authenticate_user(db_session, login_data)
+        await AuthService.authenticate_user(db_session, login_data)
 
     assert exc_info.value.status_code == 401
     assert "Incorrect email or password" in str(exc_info.value.detail)
 
 
 # Non-existent email test
-def test_authenticate_user_nonexistent_email(db_session, test_user):
+@pytest.mark.asyncio
+async def test_authenticate_user_nonexistent_email(db_session, test_user):
     """Test user authentication with non-existent email"""
     login_data = LoginSchema(email="not-exist@example.com", password="testpass123")
 
     with pytest.raises(HTTPException) as exc_info:
-        AuthService.authenticate_user(db_session, login_data)
+        await AuthService.authenticate_user(db_session, login_data)
 
     assert exc_info.value.status_code == 401
     assert "Incorrect email or password" in str(exc_info.value.detail)
 
 
+@pytest.mark.asyncio
+async def test_authenticate_user_does_not_block_loop(db_session, test_user):
+    """Test bcrypt runs off the event loop so other tasks keep running"""
+    import asyncio
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    before = ticks
+    login_data = LoginSchema(email="test@example.com", password="testpass123")
+    user = await AuthService.authenticate_user(db_session, login_data)
+    task.cancel()
+
+    assert user.id == test_user.id
+    assert ticks - before > 1
+
+
 # Create access token test
 def test_authenticate_create_user_tokens(db_session, test_user):
     """Test creating access token"""
@@ -67,3 +94,50 @@ def test_get_user_by_email_invalid(db_session):
     """Test getting user by email - invalid email"""
     user = AuthService.get_user_by_email(db_session, None)
     assert user is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_cached(db_session, test_user):
+    """Test verified tokens skip the user lookup until invalidated"""
+    from app.core.security import (
+        auth_cache,
+        blacklist_token,
+        create_access_token,
+        get_current_user,
+    )
+    from app.features.employee_management.schemas import EmployeeUpdate
+    from app.features.employee_management.service import EmployeeManagementService
+    from sqlalchemy import event
+
+    auth_cache.clear()
+    token = create_access_token({"sub": test_user.email})
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        first = await get_current_user(db_session, token)
+        cached = await get_current_user(db_session, token)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert cached.id == first.id == test_user.id
+    assert cached in db_session
+    assert len(statements) == 1
+    assert auth_cache.stats()["hits"] >= 1
+
+    # Updating the employee drops their cached tokens
+    await EmployeeManagementService.update_employee(
+        db_session, test_user.id, EmployeeUpdate(full_name="Renamed User")
+    )
+    assert auth_cache.get(token) is None
+    assert (await get_current_user(db_session, token)).full_name == "Renamed User"
+
+    # A blacklisted token is rejected even though it was cached
+    blacklist_token(token)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(db_session, token)
+    assert exc_info.value.status_code == 401
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 
 import pytest
 from app.features.schedule.bulk_service import BulkScheduleService
+from app.models.notification import Notification
 from app.models.schedule import Schedule
 from app.models.schedule_enums import RepeatFrequency, ScheduleStatus, ShiftType
 from fastapi import HTTPException
@@ -58,6 +59,17 @@ async def test_create_bulk_schedules(db_session, test_admin, bulk_schedule_data)
         assert schedule["status"] == ScheduleStatus.CONFIRMED.value
         assert schedule["created_by"] == test_admin.id
 
+    # Every schedule gets its own assignment notification
+    notifications = (
+        db_session.query(Notification)
+        .filter(Notification.user_id == bulk_schedule_data[0]["user_id"])
+        .all()
+    )
+    assert len(notifications) == len(bulk_schedule_data)
+    assert {n.data["id"] for n in notifications} == {
+        schedule["id"] for schedule in created_schedules
+    }
+
 
 @pytest.mark.asyncio
 async def test_create_bulk_schedules_with_conflict(
@@ -143,3 +155,142 @@ async def test_check_schedule_conflict(db_session, test_user, basic_schedule_dat
         db_session, test_user.id, no_conflict_start, no_conflict_end
     )
     assert has_conflict is False
+
+
+@pytest.mark.asyncio
+async def test_get_schedule_conflicts_report(
+    db_session, test_admin, test_user, bulk_schedule_data
+):
+    """Test per-row conflict report for a batch"""
+    # Store the first schedule of the batch
+    schedule = Schedule(**bulk_schedule_data[0], created_by=test_admin.id)
+    db_session.add(schedule)
+    db_session.commit()
+
+    overlapping = bulk_schedule_data[1].copy()
+    overlapping["start_time"] = bulk_schedule_data[1]["start_time"] + timedelta(hours=4)
+    overlapping["end_time"] = overlapping["start_time"] + timedelta(hours=8)
+
+    missing_user = bulk_schedule_data[2].copy()
+    missing_user["user_id"] = 99999
+
+    report = BulkScheduleService.get_schedule_conflicts(
+        db_session,
+        [bulk_schedule_data[0], bulk_schedule_data[1], overlapping, missing_user],
+    )
+
+    assert {(entry["index"], entry["reason"]) for entry in report} == {
+        (0, "existing_schedule"),
+        (2, "batch_overlap"),
+        (3, "user_not_found"),
+    }
+    assert report[0]["schedule_id"] == schedule.id
+
+    # Validation reports every row instead of stopping at the first hit
+    with pytest.raises(HTTPException) as exc_info:
+        await BulkScheduleService.validate_schedules(
+            db_session,
+            [bulk_schedule_data[0], bulk_schedule_data[1], overlapping, missing_user],
+        )
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == (
+        "User 99999 not found; Schedule conflict found for user " f"{test_user.id}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_repeating_schedules_rolling_horizon(
+    db_session, test_admin, basic_schedule_data
+):
+    """Test that only the rolling horizon of a long pattern is materialized"""
+    pattern = {
+        "type": RepeatFrequency.DAILY,
+        "interval": 1,
+        "end_date": basic_schedule_data["start_time"] + timedelta(weeks=52),
+    }
+
+    created_schedules = await BulkScheduleService.create_repeating_schedules(
+        db_session, basic_schedule_data, pattern, test_admin.id
+    )
+
+    horizon_end = basic_schedule_data["start_time"] + timedelta(weeks=8)
+    assert 0 < len(created_schedules) <= 8 * 7 + 1
+    assert all(
+        datetime.fromisoformat(schedule["start_time"]).replace(tzinfo=None)
+        <= horizon_end
+        for schedule in created_schedules
+    )
+
+    # Series members point at the first occurrence
+    parent_id = created_schedules[0]["id"]
+    children = (
+        db_session.query(Schedule)
+        .filter(Schedule.parent_schedule_id == parent_id)
+        .all()
+    )
+    assert len(children) == len(created_schedules) - 1
+
+    # Extending within the same horizon has nothing new to materialize
+    extended = await BulkScheduleService.extend_repeating_schedules(
+        db_session, parent_id, test_admin.id
+    )
+    assert extended == []
+
+
+@pytest.mark.asyncio
+async def test_extend_due_series_tops_up_horizon(
+    db_session, test_admin, basic_schedule_data
+):
+    """Test series are extended from their marker, never from surviving rows"""
+    pattern = {
+        "type": RepeatFrequency.DAILY,
+        "interval": 1,
+        "end_date": basic_schedule_data["start_time"] + timedelta(weeks=52),
+    }
+    created_schedules = await BulkScheduleService.create_repeating_schedules(
+        db_session, basic_schedule_data, pattern, test_admin.id
+    )
+    parent = db_session.get(Schedule, created_schedules[0]["id"])
+    children = db_session.query(Schedule).filter(
+        Schedule.parent_schedule_id == parent.id
+    )
+
+    # As if the series had been created a week ago
+    parent.materialized_until -= timedelta(weeks=1)
+    children.filter(Schedule.start_time > parent.materialized_until).delete()
+    db_session.commit()
+    assert await BulkScheduleService.extend_due_series(db_session) == 7
+
+    # Occurrences an admin deleted are not recreated
+    children.filter(
+        Schedule.start_time
+        > datetime.fromisoformat(created_schedules[-3]["start_time"])
+    ).delete()
+    db_session.commit()
+    assert await BulkScheduleService.extend_due_series(db_session) == 0
+
+    # Cancelled series stay as they are
+    parent.materialized_until -= timedelta(weeks=1)
+    parent.status = ScheduleStatus.CANCELLED
+    db_session.commit()
+    assert await BulkScheduleService.extend_due_series(db_session) == 0
+
+
+def test_monthly_recurrence_keeps_day_of_month():
+    """Test monthly rules clamp short months without drifting"""
+    from app.features.schedule.recurrence import RecurrenceRule
+
+    rule = RecurrenceRule(
+        frequency=RepeatFrequency.MONTHLY,
+        interval=1,
+        until=datetime(2025, 4, 30, 23, 59),
+    )
+    starts = [
+        start
+        for start, _ in rule.iter_occurrences(
+            datetime(2025, 1, 31, 9), timedelta(hours=8)
+        )
+    ]
+
+    assert [start.day for start in starts] == [31, 28, 31, 30]
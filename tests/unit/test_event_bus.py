@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from app.core.events import Event, EventBus
+from app.features.notifications.events.types import NotificationEventType
+
+
+@pytest.mark.asyncio
+async def test_queued_publish_drains_on_stop():
+    """Test queued events are handled off the publisher and drained on stop"""
+    bus = EventBus()
+    handled = []
+
+    async def slow_handler(event, db):
+        await asyncio.sleep(0.01)
+        handled.append(event.data["id"])
+
+    bus.subscribe(NotificationEventType.SCHEDULE_UPDATED, slow_handler)
+    await bus.start(workers=2, queue_size=2)
+
+    for i in range(5):
+        await bus.publish(
+            Event(type=NotificationEventType.SCHEDULE_UPDATED, data={"id": i})
+        )
+
+    # Publishing returns before the handlers finish
+    assert len(handled) < 5
+
+    await bus.stop()
+    assert sorted(handled) == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_is_isolated():
+    """Test a failing handler neither raises to the publisher nor blocks others"""
+    bus = EventBus()
+    sessions = []
+
+    async def failing_handler(event, db):
+        sessions.append(db)
+        raise RuntimeError("boom")
+
+    async def handler(event, db):
+        sessions.append(db)
+
+    bus.subscribe(NotificationEventType.ANNOUNCEMENT_CREATED, failing_handler)
+    bus.subscribe(NotificationEventType.ANNOUNCEMENT_CREATED, handler)
+
+    await bus.publish(Event(type=NotificationEventType.ANNOUNCEMENT_CREATED, data={}))
+
+    assert len(sessions) == 2
+    assert sessions[0] is not sessions[1]
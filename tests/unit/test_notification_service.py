@@ -1,3 +1,4 @@
+import json
 from datetime import datetime, timedelta
 
 import pytest
@@ -49,7 +50,7 @@ async def test_get_user_notifications(db_session, test_user, notification_data):
 
     # Get notifications
     result = await NotificationService.get_user_notification(
-        db_session, test_user.id, skip=0, limit=10
+        db_session, test_user.id, limit=10
     )
 
     assert result["total"] == 2
@@ -57,6 +58,61 @@ async def test_get_user_notifications(db_session, test_user, notification_data):
     assert len(result["items"]) == 2
 
 
+@pytest.mark.asyncio
+async def test_get_user_notifications_keyset(db_session, test_user, notification_data):
+    """Test cursor pages walk the inbox in order and totals follow the mode"""
+    from app.features.notifications.counters import notification_counts
+    from app.features.notifications.schemas import NotificationTotalMode
+    from app.models.notification import Notification
+
+    # Two rows share a timestamp so the id breaks the tie
+    now = datetime.now()
+    created = [now, now, now - timedelta(hours=1), now - timedelta(hours=2)]
+    notifications = [
+        Notification(**notification_data, user_id=test_user.id, created_at=created_at)
+        for created_at in created
+    ]
+    db_session.add_all(notifications)
+    db_session.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = await NotificationService.get_user_notification(
+            db_session, test_user.id, limit=3, cursor=cursor
+        )
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(notifications, key=lambda n: (n.created_at, n.id), reverse=True)
+    assert seen == [n.id for n in expected]
+    assert page["total"] == 4
+
+    # Exact totals bypass stale cached counts; approximate ones serve them
+    notification_counts.set(test_user.id, {None: (99, 99)})
+    page = await NotificationService.get_user_notification(db_session, test_user.id)
+    assert page["total"] == 4
+    notification_counts.set(test_user.id, {None: (99, 99)})
+    page = await NotificationService.get_user_notification(
+        db_session, test_user.id, total_mode=NotificationTotalMode.APPROXIMATE
+    )
+    assert page["total"] == 99
+
+    page = await NotificationService.get_user_notification(
+        db_session, test_user.id, total_mode=NotificationTotalMode.NONE
+    )
+    assert page["total"] is None and page["unread"] is None
+
+    # Without cached counts the approximate mode falls back to estimates
+    notification_counts.invalidate(test_user.id)
+    page = await NotificationService.get_user_notification(
+        db_session, test_user.id, total_mode=NotificationTotalMode.APPROXIMATE
+    )
+    assert isinstance(page["total"], int)
+    assert notification_counts.get(test_user.id) is None
+
+
 @pytest.mark.asyncio
 async def test_mark_notification_as_read(db_session, test_user, notification_data):
     """Test marking notification as read"""
@@ -133,6 +189,52 @@ async def test_get_notification_summary(db_session, test_user, notification_data
     assert NotificationType.ANNOUNCEMENT.value in summary["type_summary"]
 
 
+@pytest.mark.asyncio
+async def test_notification_counts_cached(db_session, test_user, notification_data):
+    """Test counts load with one grouped query and then track writes without one"""
+    from app.features.notifications.counters import notification_counts
+    from app.features.notifications.schemas import NotificationTotalMode
+    from sqlalchemy import event
+
+    notification_data["user_id"] = test_user.id
+    first = await NotificationService.create_notification(db_session, notification_data)
+    await NotificationService.create_notification(
+        db_session, {**notification_data, "type": NotificationType.ANNOUNCEMENT}
+    )
+    notification_counts.invalidate(test_user.id)
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if "count(" in statement:
+            statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        summary = NotificationService.get_notification_summary(db_session, test_user.id)
+        assert summary["total_unread"] == 2
+        assert len(statements) == 1
+
+        await NotificationService.mark_as_read(db_session, first.id, test_user.id)
+        await NotificationService.create_notification(db_session, notification_data)
+        result = await NotificationService.get_user_notification(
+            db_session, test_user.id, total_mode=NotificationTotalMode.APPROXIMATE
+        )
+        summary = NotificationService.get_notification_summary(db_session, test_user.id)
+        assert (result["total"], result["unread"]) == (3, 2)
+        assert summary["type_summary"][NotificationType.SCHEDULE_CHANGE.value] == 1
+
+        await NotificationService.mark_all_as_read(db_session, test_user.id)
+        summary = NotificationService.get_notification_summary(db_session, test_user.id)
+        assert summary["total_unread"] == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    # Only the initial load counted
+    assert len(statements) == 1
+
+
 @pytest.mark.asyncio
 async def test_handle_user_login(db_session, test_user, notification_data):
     """Test notification handling during user login"""
@@ -161,6 +263,9 @@ async def test_notification_websocket_connection(db_session, test_user):
         async def send_json(self, data):
             pass
 
+        async def send_text(self, data):
+            pass
+
         async def close(self):
             pass
 
@@ -183,3 +288,750 @@ async def test_notification_websocket_connection(db_session, test_user):
     # Test disconnection
     await notification_manager.disconnect(test_user.id)
     assert test_user.id not in notification_manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_notification_dispatcher(
+    db_session, test_user, test_employee2, notification_data
+):
+    """Test due notifications are delivered or rescheduled with backoff"""
+    from app.features.notifications.dispatcher import NotificationDispatcher
+    from app.features.notifications.ws.connection import ConnectionState
+    from app.features.notifications.ws_manager import ConnectionManager
+    from app.models.notification import Notification
+
+    class MockConnection:
+        state = ConnectionState.CONNECTED
+
+        def __init__(self, sent):
+            self.sent = sent
+
+        async def send_notification(self, notification):
+            return self.sent
+
+    manager = ConnectionManager()
+    manager.active_connections.add(test_user.id, "default", MockConnection(sent=True))
+    dispatcher = NotificationDispatcher(manager, grace_period=30)
+
+    old = datetime.now() - timedelta(minutes=5)
+    due, fresh, offline = [
+        Notification(**notification_data, user_id=user_id, created_at=created_at)
+        for user_id, created_at in [
+            (test_user.id, old),
+            (test_user.id, datetime.now()),
+            (test_employee2.id, old),
+        ]
+    ]
+    db_session.add_all([due, fresh, offline])
+    db_session.commit()
+
+    # Queued rows wait for the socket writer to mark them sent
+    assert await dispatcher.dispatch_due(db_session) == 1
+    assert due.status == NotificationStatus.PENDING
+    assert due.retry_count == 0
+    assert due.next_retry is not None
+    assert fresh.status == NotificationStatus.PENDING
+    assert offline.status == NotificationStatus.PENDING
+
+    # Failed deliveries back off instead of being retried on the next tick
+    manager.active_connections.add(
+        test_employee2.id, "default", MockConnection(sent=False)
+    )
+    assert await dispatcher.dispatch_due(db_session) == 1
+    assert offline.retry_count == 1
+    assert offline.next_retry is not None
+    assert await dispatcher.dispatch_due(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_notification_cross_worker_delivery(test_user):
+    """Test notifications reach sockets held by another worker"""
+    from app.features.notifications.ws.connection import ConnectionState
+    from app.features.notifications.ws_manager import (
+        ConnectionManager,
+        InMemoryTransport,
+    )
+
+    class MockConnection:
+        state = ConnectionState.CONNECTED
+
+        def __init__(self):
+            self.received = []
+
+        async def send_notification(self, notification):
+            self.received.append(notification)
+            return True
+
+    transport = InMemoryTransport()
+    worker_a = ConnectionManager(transport=transport)
+    worker_b = ConnectionManager(transport=transport.share())
+    await worker_a.transport.start(worker_a._handle_transport_message)
+    await worker_b.transport.start(worker_b._handle_transport_message)
+
+    connection = MockConnection()
+    worker_b.active_connections.add(test_user.id, "default", connection)
+
+    notification = {"type": NotificationType.SCHEDULE_CHANGE, "message": "Remote"}
+    sent_locally = await worker_a.send_notification(test_user.id, notification)
+
+    assert sent_locally is False
+    assert connection.received == [notification]
+
+    # Fan-out relays one shared payload with a notification id per recipient
+    delivered = await worker_a.send_to_recipients(notification, [(test_user.id, 7)])
+    assert delivered == []
+    assert connection.received[-1] == {**notification, "id": 7}
+
+    await worker_a.transport.stop()
+    await worker_b.transport.stop()
+
+
+@pytest.mark.asyncio
+async def test_notification_reaches_devices_on_several_workers(test_user):
+    """Test a user's devices split across workers all get the notification"""
+    from app.features.notifications.ws.connection import ConnectionState
+    from app.features.notifications.ws_manager import (
+        ConnectionManager,
+        InMemoryTransport,
+    )
+
+    class MockConnection:
+        state = ConnectionState.CONNECTED
+
+        def __init__(self):
+            self.received = []
+
+        async def send_notification(self, notification):
+            self.received.append(notification)
+            return True
+
+    transport = InMemoryTransport()
+    worker_a = ConnectionManager(transport=transport)
+    worker_b = ConnectionManager(transport=transport.share())
+    await worker_a.transport.start(worker_a._handle_transport_message)
+    await worker_b.transport.start(worker_b._handle_transport_message)
+
+    phone, desktop = MockConnection(), MockConnection()
+    worker_a.active_connections.add(test_user.id, "phone", phone)
+    worker_b.active_connections.add(test_user.id, "desktop", desktop)
+
+    notification = {"id": 1, "message": "Split"}
+    assert await worker_a.send_notification(test_user.id, notification)
+    assert phone.received == [notification]
+    assert desktop.received == [notification]
+
+    # Fan-out relays users with a local socket too
+    assert await worker_a.send_to_recipients(notification, [(test_user.id, 2)]) == [
+        (test_user.id, 2)
+    ]
+    assert phone.received[-1]["id"] == desktop.received[-1]["id"] == 2
+
+    await worker_a.transport.stop()
+    await worker_b.transport.stop()
+
+
+@pytest.mark.asyncio
+async def test_postgres_transport_relays_by_reference_and_reconnects(
+    db_session, test_user, notification_data
+):
+    """Test oversized requests are relayed by id and a lost listener recovers"""
+    import asyncio
+
+    from app.features.notifications.ws.connection import ConnectionState
+    from app.features.notifications.ws_manager import (
+        ConnectionManager,
+        PostgresTransport,
+    )
+    from sqlalchemy import text
+    from tests.conftest import TEST_DATABASE_URL
+
+    class MockConnection:
+        state = ConnectionState.CONNECTED
+
+        def __init__(self):
+            self.received = []
+
+        async def send_notification(self, notification):
+            self.received.append(notification)
+            return True
+
+    async def wait_for(condition):
+        for _ in range(100):
+            if condition():
+                return
+            await asyncio.sleep(0.05)
+
+    notification_data["user_id"] = test_user.id
+    notification_data["message"] = "x" * PostgresTransport.MAX_PAYLOAD_BYTES
+    notification = await NotificationService.create_notification(
+        db_session, notification_data
+    )
+
+    worker_a = ConnectionManager(transport=PostgresTransport(TEST_DATABASE_URL))
+    worker_b = ConnectionManager(
+        transport=PostgresTransport(TEST_DATABASE_URL, reconnect_delay=0.05)
+    )
+    await worker_a.transport.start(worker_a._handle_transport_message)
+    await worker_b.transport.start(worker_b._handle_transport_message)
+    connection = MockConnection()
+    worker_b.active_connections.add(test_user.id, "default", connection)
+
+    try:
+        # Too large for NOTIFY, so worker B loads the row itself
+        await worker_a.send_notification(test_user.id, notification.to_dict())
+        await wait_for(lambda: connection.received)
+        assert [item["id"] for item in connection.received] == [notification.id]
+        assert connection.received[0]["message"] == notification_data["message"]
+
+        # Worker B's listener is dropped by the server and comes back
+        db_session.execute(
+            text("SELECT pg_terminate_backend(:pid)"),
+            {"pid": worker_b.transport._listen_conn.get_backend_pid()},
+        )
+        db_session.commit()
+        await wait_for(lambda: worker_b.transport._reconnect_task is not None)
+        await wait_for(lambda: worker_b.transport._reconnect_task.done())
+
+        await worker_a.send_notification(test_user.id, {"id": 0, "message": "Back"})
+        await wait_for(lambda: len(connection.received) == 2)
+        assert connection.received[-1]["message"] == "Back"
+    finally:
+        await worker_a.transport.stop()
+        await worker_b.transport.stop()
+
+
+@pytest.mark.asyncio
+async def test_connection_send_queue_overflow(test_user):
+    """Test a stalled client never blocks senders and overflows per policy"""
+    import asyncio
+
+    from app.features.notifications.ws.connection import (
+        ConnectionState,
+        OverflowPolicy,
+        WebSocketConnection,
+    )
+    from fastapi.websockets import WebSocketState
+
+    class StalledWebSocket:
+        client_state = WebSocketState.CONNECTED
+
+        def __init__(self):
+            self.release = asyncio.Event()
+            self.sent = []
+            self.close_code = None
+
+        async def send_text(self, data):
+            await self.release.wait()
+            self.sent.append(json.loads(data))
+
+        async def close(self, code=1000):
+            self.close_code = code
+
+    def connect(policy):
+        websocket = StalledWebSocket()
+        connection = WebSocketConnection(
+            websocket, test_user, send_queue_size=2, overflow_policy=policy
+        )
+        connection.state = ConnectionState.CONNECTED
+        return websocket, connection
+
+    # Drop oldest: the writer holds message 0, the queue keeps the newest two
+    websocket, connection = connect(OverflowPolicy.DROP_OLDEST)
+    delivered = []
+
+    async def on_delivered(user_id, notification_id):
+        delivered.append(notification_id)
+
+    connection.add_delivered_handler(on_delivered)
+    for i in range(5):
+        assert await connection.send_notification({"id": i})
+        await asyncio.sleep(0)
+    websocket.release.set()
+    await asyncio.sleep(0.01)
+    assert [m["payload"]["id"] for m in websocket.sent] == [0, 3, 4]
+    assert connection.dropped_messages == 2
+    # Only written messages count as delivered; dropped ones stay pending
+    assert delivered == [0, 3, 4]
+    await connection.disconnect()
+
+    # Coalesce: a newer version of a queued notification replaces it
+    websocket, connection = connect(OverflowPolicy.COALESCE)
+    for notification in [{"id": 1}, {"id": 2}, {"id": 2, "v": 2}]:
+        await connection.send_notification(notification)
+    websocket.release.set()
+    await asyncio.sleep(0.01)
+    assert [m["payload"] for m in websocket.sent] == [{"id": 1}, {"id": 2, "v": 2}]
+    await connection.disconnect()
+
+    # Disconnect: overflowing the queue drops the client
+    websocket, connection = connect(OverflowPolicy.DISCONNECT)
+    results = []
+    for i in range(4):
+        results.append(await connection.send_notification({"id": i}))
+        await asyncio.sleep(0)
+    assert results[-1] is False
+    await asyncio.sleep(0.01)
+    assert connection.state == ConnectionState.DISCONNECTED
+    assert websocket.close_code == 1008
+    # Nothing is left to write, so waiting for the queue returns at once
+    assert await connection.drain(timeout=0.1)
+
+    # Disconnecting a stalled client releases waiters as well
+    websocket, connection = connect(OverflowPolicy.DROP_OLDEST)
+    await connection.send_notification({"id": 1})
+    await connection.send_notification({"id": 2})
+    assert not await connection.drain(timeout=0.01)
+    await connection.disconnect()
+    assert await connection.drain(timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_sharded_registry_broadcast(test_user):
+    """Test the sharded registry behaves like a dict and broadcast reaches all"""
+    from app.features.notifications.ws.connection import ConnectionState
+    from app.features.notifications.ws_manager import ConnectionManager
+
+    class MockConnection:
+        state = ConnectionState.CONNECTED
+
+        def __init__(self):
+            self.received = []
+
+        async def send_encoded(self, data, key=None):
+            self.received.append(data)
+            return True
+
+    manager = ConnectionManager(shard_count=4)
+    connections = {user_id: MockConnection() for user_id in range(1, 11)}
+    for user_id, connection in connections.items():
+        manager.active_connections.add(user_id, "default", connection)
+
+    assert len(manager.active_connections) == 10
+    assert sorted(len(shard) for shard in manager.active_connections.shards) == [
+        2,
+        2,
+        3,
+        3,
+    ]
+    assert 3 in manager.active_connections
+    assert manager.active_connections.pop(3) == {"default": connections[3]}
+    assert 3 not in manager.active_connections
+
+    await manager.broadcast({"message": "Hello"}, exclude={1})
+
+    assert connections[1].received == []
+    assert connections[3].received == []
+
+    # Every recipient gets the same buffer, serialized once
+    received = [
+        connection.received
+        for user_id, connection in connections.items()
+        if user_id not in (1, 3)
+    ]
+    assert all(len(messages) == 1 for messages in received)
+    assert len({id(messages[0]) for messages in received}) == 1
+    assert json.loads(received[0][0])["payload"] == {"message": "Hello"}
+
+
+@pytest.mark.asyncio
+async def test_multi_device_connections(test_user):
+    """Test each device keeps its own socket and notifications reach all of them"""
+    import asyncio
+
+    from app.features.notifications.ws_manager import ConnectionManager
+    from fastapi.websockets import WebSocketState
+
+    class MockWebSocket:
+        client_state = WebSocketState.CONNECTED
+
+        def __init__(self):
+            self.sent = []
+            self.closed = False
+
+        async def send_text(self, data):
+            self.sent.append(json.loads(data))
+
+        async def close(self, code=1000):
+            self.closed = True
+
+    manager = ConnectionManager()
+    phone, desktop = MockWebSocket(), MockWebSocket()
+    assert await manager.connect(test_user, phone, "phone")
+    assert await manager.connect(test_user, desktop, "desktop")
+
+    # A second device no longer kicks the first one off
+    assert phone.closed is False
+    assert manager.get_active_connections_count() == 2
+    assert len(manager.active_connections) == 1
+
+    assert await manager.send_notification(test_user.id, {"id": 1})
+    await asyncio.sleep(0.01)
+    assert [m["payload"]["id"] for m in phone.sent] == [1]
+    assert [m["payload"]["id"] for m in desktop.sent] == [1]
+
+    # Reconnecting a device replaces only its own stale socket
+    new_phone = MockWebSocket()
+    assert await manager.connect(test_user, new_phone, "phone")
+    assert phone.closed is True
+    assert desktop.closed is False
+
+    # The stale socket closing must not drop the connection that replaced it
+    await manager.disconnect(test_user.id, "phone", phone)
+    assert set(manager.get_connection_status(test_user.id)) == {"phone", "desktop"}
+
+    await manager.disconnect(test_user.id, "desktop", desktop)
+    assert set(manager.get_connection_status(test_user.id)) == {"phone"}
+    await manager.disconnect(test_user.id)
+    assert test_user.id not in manager.active_connections
+
+    # Beyond the per-user cap the oldest device is closed
+    manager = ConnectionManager(max_devices_per_user=2)
+    sockets = {name: MockWebSocket() for name in ["phone", "desktop", "tablet"]}
+    for name, websocket in sockets.items():
+        assert await manager.connect(test_user, websocket, name)
+    assert sockets["phone"].closed is True
+    assert set(manager.get_connection_status(test_user.id)) == {"desktop", "tablet"}
+    await manager.disconnect(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_replay_missed_and_cumulative_ack(
+    db_session, test_user, notification_data
+):
+    """Test reconnects replay only the gap after last_seq and acks are cumulative"""
+    import asyncio
+
+    from app.features.notifications.ws_manager import ConnectionManager
+    from app.models.notification import Notification
+    from fastapi.websockets import WebSocketState
+
+    class MockWebSocket:
+        client_state = WebSocketState.CONNECTED
+
+        def __init__(self):
+            self.sent = []
+
+        async def send_text(self, data):
+            self.sent.append(json.loads(data))
+
+        async def close(self, code=1000):
+            pass
+
+    notifications = [
+        Notification(**notification_data, user_id=test_user.id) for _ in range(5)
+    ]
+    db_session.add_all(notifications)
+    db_session.commit()
+    ids = [notification.id for notification in notifications]
+
+    manager = ConnectionManager()
+    websocket = MockWebSocket()
+    await manager.connect(test_user, websocket, "phone")
+
+    replayed = await manager.replay_missed(
+        db_session, test_user.id, "phone", last_seq=ids[1], page_size=2
+    )
+    await asyncio.sleep(0.01)
+
+    assert replayed == 3
+    assert [message["seq"] for message in websocket.sent] == ids[2:]
+
+    # Replayed rows are marked sent once written to the socket
+    db_session.expire_all()
+    assert [n.status for n in notifications] == [NotificationStatus.PENDING] * 2 + [
+        NotificationStatus.SENT
+    ] * 3
+
+    # A cumulative ack only covers what this connection sent, never the
+    # older rows below the cursor it did not replay
+    connection = manager.active_connections[test_user.id]["phone"]
+    acked = []
+
+    async def on_ack(user_id, notification_ids):
+        acked.extend(notification_ids)
+
+    connection.add_ack_handler(on_ack)
+    await connection.handle_message(
+        json.dumps({"type": "notification_ack", "seq": ids[3]})
+    )
+    await connection.handle_message(
+        json.dumps({"type": "notification_ack", "seq": ids[-1]})
+    )
+    assert acked == ids[2:]
+    db_session.expire_all()
+    sent, pending = NotificationStatus.SENT, NotificationStatus.PENDING
+    assert [n.status for n in notifications] == [pending, pending, sent, sent, sent]
+
+    await manager.disconnect(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_replay_stops_when_client_stalls_or_drops(
+    db_session, test_user, notification_data
+):
+    """Test replay never waits forever on a client that stopped reading"""
+    import asyncio
+
+    from app.features.notifications.ws_manager import ConnectionManager
+    from app.models.notification import Notification
+    from fastapi.websockets import WebSocketState
+
+    class StalledWebSocket:
+        client_state = WebSocketState.CONNECTED
+
+        async def send_text(self, data):
+            await asyncio.Event().wait()
+
+        async def close(self, code=1000):
+            pass
+
+    class BrokenWebSocket(StalledWebSocket):
+        async def send_text(self, data):
+            raise RuntimeError("Connection reset")
+
+    db_session.add_all(
+        [Notification(**notification_data, user_id=test_user.id) for _ in range(5)]
+    )
+    db_session.commit()
+
+    manager = ConnectionManager()
+    await manager.connect(test_user, StalledWebSocket(), "phone")
+    replayed = await asyncio.wait_for(
+        manager.replay_missed(
+            db_session, test_user.id, "phone", page_size=2, drain_timeout=0.05
+        ),
+        timeout=1,
+    )
+    assert replayed == 2
+
+    # The writer failing disconnects the client and ends the replay
+    await manager.connect(test_user, BrokenWebSocket(), "desktop")
+    replayed = await asyncio.wait_for(
+        manager.replay_missed(db_session, test_user.id, "desktop", page_size=2),
+        timeout=1,
+    )
+    assert replayed == 2
+    connection = manager.active_connections[test_user.id]["desktop"]
+    assert connection.pending_notifications == []
+
+    await manager.disconnect(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_replayed_notifications_not_dispatched_again(
+    db_session, test_user, notification_data
+):
+    """Test rows replayed on connect are recorded before the dispatcher runs"""
+    import asyncio
+
+    from app.features.notifications.dispatcher import NotificationDispatcher
+    from app.features.notifications.ws_manager import ConnectionManager
+    from app.models.notification import Notification
+    from fastapi.websockets import WebSocketState
+
+    class MockWebSocket:
+        client_state = WebSocketState.CONNECTED
+
+        def __init__(self):
+            self.sent = []
+
+        async def send_text(self, data):
+            self.sent.append(json.loads(data))
+
+        async def close(self, code=1000):
+            pass
+
+    old = datetime.now() - timedelta(minutes=5)
+    db_session.add_all(
+        [
+            Notification(**notification_data, user_id=test_user.id, created_at=old)
+            for _ in range(3)
+        ]
+    )
+    db_session.commit()
+
+    manager = ConnectionManager()
+    websocket = MockWebSocket()
+    await manager.connect(test_user, websocket, "phone")
+    assert await manager.replay_missed(db_session, test_user.id, "phone") == 3
+    await asyncio.sleep(0.01)
+
+    dispatcher = NotificationDispatcher(manager, grace_period=30)
+    assert await dispatcher.dispatch_due(db_session) == 0
+    assert len(websocket.sent) == 3
+
+    await manager.disconnect(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_ack_aggregator_batches_updates(
+    db_session, test_user, test_employee2, notification_data
+):
+    """Test acks are buffered and written back together"""
+    from app.features.notifications.acks import AckAggregator
+    from app.models.notification import Notification
+
+    mine = [Notification(**notification_data, user_id=test_user.id) for _ in range(3)]
+    other = Notification(**notification_data, user_id=test_employee2.id)
+    db_session.add_all([*mine, other])
+    db_session.commit()
+
+    aggregator = AckAggregator(flush_interval=60, max_pending=3)
+    await aggregator.start()
+
+    # Below the batch size nothing is written yet
+    await aggregator.record([(test_user.id, mine[0].id)])
+    # An id belonging to someone else is ignored
+    await aggregator.record([(test_user.id, other.id)])
+    db_session.expire_all()
+    assert mine[0].status == NotificationStatus.PENDING
+    assert aggregator.pending == 2
+
+    await aggregator.record([(test_user.id, mine[1].id)])
+    await aggregator.stop()
+
+    db_session.expire_all()
+    assert [n.status for n in mine] == [
+        NotificationStatus.SENT,
+        NotificationStatus.SENT,
+        NotificationStatus.PENDING,
+    ]
+    assert other.status == NotificationStatus.PENDING
+    assert aggregator.pending == 0
+
+
+def test_notification_retention_archives_expired(
+    db_session, test_user, notification_data
+):
+    """Test only read notifications past their type's TTL are archived"""
+    from app.features.notifications.retention import NotificationRetention
+    from app.models.notification import Notification, NotificationArchive
+
+    old = datetime.now() - timedelta(days=100)
+    rows = {
+        "expired": (NotificationType.SCHEDULE_CHANGE, True, old),
+        "expired_2": (NotificationType.SCHEDULE_CHANGE, True, old),
+        "unread": (NotificationType.SCHEDULE_CHANGE, False, old),
+        "recent": (NotificationType.SCHEDULE_CHANGE, True, datetime.now()),
+        "longer_ttl": (NotificationType.ANNOUNCEMENT, True, old),
+    }
+    notifications = {
+        name: Notification(
+            **{**notification_data, "type": ntype},
+            user_id=test_user.id,
+            is_read=is_read,
+            created_at=created_at,
+        )
+        for name, (ntype, is_read, created_at) in rows.items()
+    }
+    db_session.add_all(notifications.values())
+    db_session.commit()
+    ids = {name: notification.id for name, notification in notifications.items()}
+
+    retention = NotificationRetention(
+        retention_days={"SCHEDULE_CHANGE": 90, "ANNOUNCEMENT": 180}, batch_size=1
+    )
+    assert retention.compact(db_session) == [test_user.id] * 2
+
+    archived = db_session.query(NotificationArchive).order_by(NotificationArchive.id)
+    assert [row.id for row in archived] == [ids["expired"], ids["expired_2"]]
+    assert all(row.archived_at is not None for row in archived)
+
+    remaining = {id for (id,) in db_session.query(Notification.id)}
+    assert remaining == {ids["unread"], ids["recent"], ids["longer_ttl"]}
+
+
+@pytest.mark.asyncio
+async def test_notification_retention_invalidates_counts_on_loop(
+    db_session, test_user, notification_data
+):
+    """Test the compaction loop drops cached counts of users it archived for"""
+    import asyncio
+
+    from app.features.notifications.counters import notification_counts
+    from app.features.notifications.retention import NotificationRetention
+    from app.models.notification import Notification
+
+    db_session.add(
+        Notification(
+            **notification_data,
+            user_id=test_user.id,
+            is_read=True,
+            created_at=datetime.now() - timedelta(days=100),
+        )
+    )
+    db_session.commit()
+    notification_counts.set(test_user.id, {"SCHEDULE_CHANGE": (1, 0)})
+
+    retention = NotificationRetention(
+        retention_days={"SCHEDULE_CHANGE": 90}, interval=60
+    )
+    await retention.start()
+    for _ in range(100):
+        if notification_counts.get(test_user.id) is None:
+            break
+        await asyncio.sleep(0.01)
+    await retention.stop()
+
+    assert notification_counts.get(test_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_schedule_changes_coalesced(db_session, test_user):
+    """Test rapid schedule changes are delivered as one digest with a combined diff"""
+    import asyncio
+
+    from app.features.notifications.coalescer import ScheduleChangeCoalescer
+    from app.models.notification import Notification
+
+    coalescer = ScheduleChangeCoalescer(window=0.05)
+    await coalescer.start()
+
+    for new_status in ["pending", "confirmed"]:
+        await coalescer.add(
+            test_user.id,
+            title="Schedule Status Updated",
+            message=f"Your schedule status has been updated to {new_status}",
+            priority=NotificationPriority.NORMAL,
+            data={"schedule_id": 1, "old_status": "draft", "new_status": new_status},
+        )
+    await coalescer.add(
+        test_user.id,
+        title="Schedule Deleted",
+        message="Schedule has been deleted",
+        priority=NotificationPriority.HIGH,
+        data={"schedule_id": 2, "deleted": True},
+    )
+    # Each change is committed right away but held back from the dispatcher
+    written = db_session.query(Notification).all()
+    assert len(written) == 3
+    assert all(n.next_retry > datetime.now(n.next_retry.tzinfo) for n in written)
+
+    await asyncio.sleep(0.1)
+    db_session.expire_all()
+    notifications = db_session.query(Notification).all()
+    assert len(notifications) == 1
+    digest = notifications[0]
+    assert digest.title == "2 schedule changes"
+    assert digest.priority == NotificationPriority.HIGH
+    assert digest.data["changes"][0] == {
+        "title": "Schedule Status Updated",
+        "schedule_id": 1,
+        "old_status": "draft",
+        "new_status": "confirmed",
+    }
+
+    # A lone change keeps its own notification, and stop flushes the buffer
+    await coalescer.add(
+        test_user.id,
+        title="Schedule Deleted",
+        message="Schedule has been deleted",
+        priority=NotificationPriority.HIGH,
+        data={"schedule_id": 3},
+    )
+    await coalescer.stop()
+    db_session.expire_all()
+    assert db_session.query(Notification).count() == 2
+    latest = db_session.query(Notification).order_by(Notification.id.desc()).first()
+    assert latest.title == "Schedule Deleted"
+    assert latest.next_retry is None
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 
 import pytest
+from app.models.schedule_intervals import ScheduleIntervalIndex
 from app.features.schedule.service import ScheduleService
 from app.models.schedule import Schedule
 from app.models.schedule_enums import ScheduleStatus, ShiftType
@@ -58,6 +59,79 @@ async def test_create_schedule_with_conflict(
     assert "conflict" in str(exc_info.value.detail).lower()
 
 
+@pytest.mark.asyncio
+async def test_update_schedule_status_into_conflict(
+    db_session, test_admin, basic_schedule_data
+):
+    """Test reactivating an overlapping schedule hits the exclusion constraint"""
+    await ScheduleService.create_schedule(
+        db_session, basic_schedule_data, test_admin.id
+    )
+
+    # Cancelled schedules do not take part in the constraint
+    cancelled = Schedule(
+        **{
+            **basic_schedule_data,
+            "start_time": basic_schedule_data["start_time"] + timedelta(hours=4),
+            "end_time": basic_schedule_data["end_time"] + timedelta(hours=4),
+        },
+        created_by=test_admin.id,
+        status=ScheduleStatus.CANCELLED,
+    )
+    db_session.add(cancelled)
+    db_session.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await ScheduleService.update_schedule_status(
+            db_session, cancelled.id, ScheduleStatus.CONFIRMED.value
+        )
+
+    assert exc_info.value.status_code == 400
+    assert "conflict" in str(exc_info.value.detail).lower()
+
+
+def test_schedule_interval_index(db_session, test_admin, basic_schedule_data):
+    """Test overlap lookups against loaded and added intervals"""
+    start = basic_schedule_data["start_time"]
+    user_id = basic_schedule_data["user_id"]
+    long_shift = Schedule(
+        **{**basic_schedule_data, "end_time": start + timedelta(days=2)},
+        created_by=test_admin.id,
+        status=ScheduleStatus.CONFIRMED,
+    )
+    cancelled = Schedule(
+        **{**basic_schedule_data, "start_time": start + timedelta(days=3)},
+        created_by=test_admin.id,
+        status=ScheduleStatus.CANCELLED,
+    )
+    db_session.add_all([long_shift, cancelled])
+    db_session.commit()
+
+    index = ScheduleIntervalIndex.load(
+        db_session, [user_id], start, start + timedelta(days=7)
+    )
+
+    # A short interval well after the long shift started still overlaps it
+    late = start + timedelta(days=1, hours=12)
+    assert index.has_overlap(user_id, late, late + timedelta(hours=1))
+    assert not index.has_overlap(
+        user_id, late, late + timedelta(hours=1), exclude_id=long_shift.id
+    )
+
+    # Cancelled schedules are ignored; added intervals are seen immediately
+    free = start + timedelta(days=3)
+    assert not index.has_overlap(user_id, free, free + timedelta(hours=8))
+    index.add(user_id, free, free + timedelta(hours=8))
+    assert index.has_overlap(
+        user_id, free + timedelta(hours=7), free + timedelta(hours=9)
+    )
+
+    # Touching intervals do not overlap
+    assert not index.has_overlap(
+        user_id, free + timedelta(hours=8), free + timedelta(hours=9)
+    )
+
+
 def test_get_schedule(db_session, test_admin, basic_schedule_data):
     """Test retrieving a specific schedule"""
     # Create schedule first
@@ -95,3 +169,128 @@ async def test_update_schedule_status(db_session, test_admin, basic_schedule_dat
     )
 
     assert updated.status == ScheduleStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_get_schedule_overview(db_session, test_admin, basic_schedule_data):
+    """Test overview counts and listing per day"""
+    start_time = basic_schedule_data["start_time"]
+    for days, shift_type in [(0, ShiftType.MORNING), (2, ShiftType.EVENING)]:
+        schedule_data = {
+            **basic_schedule_data,
+            "start_time": start_time + timedelta(days=days),
+            "end_time": start_time + timedelta(days=days, hours=8),
+            "shift_type": shift_type,
+        }
+        db_session.add(
+            Schedule(
+                **schedule_data,
+                created_by=test_admin.id,
+                status=ScheduleStatus.CONFIRMED,
+            )
+        )
+    db_session.commit()
+
+    range_start = start_time.replace(hour=0, minute=0)
+    overview = await ScheduleService.get_schedule_overview(
+        db_session, range_start, range_start + timedelta(days=6)
+    )
+
+    daily_stats = overview["daily_stats"]
+    assert len(daily_stats) == 7
+
+    first_day = daily_stats[range_start.strftime("%Y-%m-%d")]
+    assert first_day["total_count"] == 1
+    assert first_day["shift_counts"]["morning"] == 1
+    assert first_day["status_counts"]["confirmed"] == 1
+    assert first_day["schedules"][0]["user"]["id"] == basic_schedule_data["user_id"]
+
+    third_day = daily_stats[(range_start + timedelta(days=2)).strftime("%Y-%m-%d")]
+    assert third_day["shift_counts"]["evening"] == 1
+
+    empty_day = daily_stats[(range_start + timedelta(days=1)).strftime("%Y-%m-%d")]
+    assert empty_day["total_count"] == 0
+    assert empty_day["schedules"] == []
+
+
+def test_get_all_schedules_keyset_pagination(
+    db_session, test_admin, basic_schedule_data
+):
+    """Test cursor pagination walks every schedule exactly once"""
+    for days in range(5):
+        db_session.add(
+            Schedule(
+                **{
+                    **basic_schedule_data,
+                    "start_time": basic_schedule_data["start_time"]
+                    + timedelta(days=days),
+                    "end_time": basic_schedule_data["end_time"] + timedelta(days=days),
+                },
+                created_by=test_admin.id,
+            )
+        )
+    db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = ScheduleService.get_all_schedules(
+            db_session,
+            {"user_id": basic_schedule_data["user_id"]},
+            limit=2,
+            cursor=cursor,
+        )
+        seen.extend(schedule["id"] for schedule in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_get_all_schedules_invalid_cursor(db_session):
+    """Test malformed cursors are rejected"""
+    with pytest.raises(HTTPException) as exc_info:
+        ScheduleService.get_all_schedules(db_session, cursor="not-a-cursor")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_iter_schedule_export(db_session, test_admin, basic_schedule_data):
+    """Test schedule export streams NDJSON and CSV rows"""
+    import csv
+    import io
+    import json
+
+    from app.features.schedule.schemas import ScheduleExportFormat
+
+    for days in range(3):
+        db_session.add(
+            Schedule(
+                **{
+                    **basic_schedule_data,
+                    "start_time": basic_schedule_data["start_time"]
+                    + timedelta(days=days),
+                    "end_time": basic_schedule_data["end_time"] + timedelta(days=days),
+                },
+                created_by=test_admin.id,
+            )
+        )
+    db_session.commit()
+
+    ndjson = "".join(
+        ScheduleService.iter_schedule_export(
+            db_session, {"user_id": basic_schedule_data["user_id"]}
+        )
+    )
+    rows = [json.loads(line) for line in ndjson.splitlines()]
+    assert len(rows) == 3
+    assert rows[0]["start_time"] < rows[1]["start_time"] < rows[2]["start_time"]
+
+    exported_csv = "".join(
+        ScheduleService.iter_schedule_export(db_session, None, ScheduleExportFormat.CSV)
+    )
+    records = list(csv.DictReader(io.StringIO(exported_csv)))
+    assert len(records) == 3
+    assert records[0]["user_name"] == "Test User"
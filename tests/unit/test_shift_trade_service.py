@@ -4,8 +4,15 @@ import pytest
 from app.features.shift_trade.service import ShiftTradeService
 from app.models.schedule import Schedule
 from app.models.schedule_enums import ScheduleStatus, ShiftType
-from app.models.shift_trade import ResponseStatus, ShiftTrade, TradeStatus, TradeType
+from app.models.shift_trade import (
+    ResponseStatus,
+    ShiftTrade,
+    ShiftTradeResponse,
+    TradeStatus,
+    TradeType,
+)
 from fastapi import HTTPException
+from sqlalchemy import event
 
 
 @pytest.fixture
@@ -50,6 +57,62 @@ async def test_create_trade_request(db_session, test_user, basic_trade_request):
     assert trade["type"] == TradeType.TRADE.value
 
 
+def test_get_trade_requests_query_count(
+    db_session, test_user, test_employee2, test_admin
+):
+    """Test trade listings run a fixed number of queries"""
+    start_time = datetime.now().replace(hour=9, minute=0) + timedelta(days=1)
+
+    def add_shift(user, day):
+        shift = Schedule(
+            user_id=user.id,
+            start_time=start_time + timedelta(days=day),
+            end_time=start_time + timedelta(days=day, hours=8),
+            shift_type=ShiftType.MORNING,
+            created_by=test_admin.id,
+            status=ScheduleStatus.CONFIRMED,
+        )
+        db_session.add(shift)
+        return shift
+
+    for day in range(3):
+        trade = ShiftTrade(
+            author_id=test_user.id,
+            type=TradeType.TRADE,
+            original_shift=add_shift(test_user, day),
+            reason="Query count",
+        )
+        trade.responses = [
+            ShiftTradeResponse(
+                respondent_id=test_employee2.id,
+                offered_shift=add_shift(test_employee2, 10 * (day + 1) + offset),
+            )
+            for offset in range(2)
+        ]
+        db_session.add(trade)
+    db_session.commit()
+    db_session.expunge_all()
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        trades = ShiftTradeService.get_trade_requests(db_session, limit=10)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len(trades) == 3
+    assert all(len(trade["responses"]) == 2 for trade in trades)
+    assert len(statements) == 2
+
+    page = ShiftTradeService.get_trade_requests(db_session, skip=1, limit=1)
+    assert [trade["id"] for trade in page] == [trades[1]["id"]]
+
+
 @pytest.mark.asyncio
 async def test_create_trade_request_with_invalid_shift(db_session, test_user):
     """Test creating trade request with invalid shift ID"""
@@ -161,6 +224,41 @@ async def test_create_giveaway_request(db_session, test_user, basic_schedule):
     assert trade["status"] == TradeStatus.OPEN.value
 
 
+@pytest.mark.asyncio
+async def test_trade_request_check_conflict(
+    db_session, test_user, test_employee2, test_admin, basic_schedule
+):
+    """Test trade conflict checks against the author's other shifts"""
+    preferred_shift = Schedule(
+        user_id=test_employee2.id,
+        start_time=basic_schedule.start_time + timedelta(hours=4),
+        end_time=basic_schedule.end_time + timedelta(hours=4),
+        shift_type=ShiftType.AFTERNOON,
+        created_by=test_admin.id,
+        status=ScheduleStatus.CONFIRMED,
+    )
+    db_session.add(preferred_shift)
+    db_session.commit()
+
+    giveaway = ShiftTrade(
+        author_id=test_user.id,
+        type=TradeType.GIVEAWAY,
+        original_shift_id=basic_schedule.id,
+        reason="Conflict check",
+    )
+    assert await giveaway.check_conflict(db_session)
+
+    # The preferred shift overlaps the author's original shift
+    trade = ShiftTrade(
+        author_id=test_user.id,
+        type=TradeType.TRADE,
+        original_shift_id=basic_schedule.id,
+        preferred_shift_id=preferred_shift.id,
+        reason="Conflict check",
+    )
+    assert not await trade.check_conflict(db_session)
+
+
 @pytest.mark.asyncio
 async def test_accept_giveaway(db_session, test_user, test_employee2, basic_schedule):
     """Test accepting a shift giveaway"""